@@ -0,0 +1,132 @@
+"""Analytics core shared by the Dash and Streamlit dashboards.
+
+Both front ends load surveys, filter responses and count answers through
+this module, so they agree on the logic (canonical platforms, see
+canonical.py; filter specs, see filters.py) and an optimization here
+speeds up both. ``registry`` is process-wide: each dataset and its
+aggregates are built once per process and shared by every session, and by
+both apps when they are hosted in one process.
+"""
+from functools import cached_property
+
+from canonical import PLATFORM_IDS, CoUsage, encode_platform_columns, platform_counts
+from datasets import DatasetRegistry
+from filters import MAIN_DIMENSIONS, FilterIndex, RowView
+from propensity import score_responses, switching_by_segment
+from row_store import ResponseStore
+from segmentation import code_responses, segment
+
+registry = DatasetRegistry()
+
+
+def platform_masks(data):
+    """Canonical platform bitmasks of the wallet columns (see canonical.py)."""
+    return data.aggregate('platforms', encode_platform_columns)
+
+
+def coded_responses(data):
+    """Integer codes of the columns the segmentation reads (see segmentation.py)."""
+    return data.aggregate('coded', code_responses)
+
+
+def filter_index(data):
+    """Per-answer bitmaps of every filter dimension (see filters.py)."""
+    masks = platform_masks(data)
+    return data.aggregate('filters', lambda frame: FilterIndex(frame, masks))
+
+
+def switching_scores(data):
+    """Predicted PayPal switching likelihood of every respondent (see propensity.py)."""
+    coded = coded_responses(data)
+    return data.aggregate('switching', lambda frame: score_responses(frame, coded))
+
+
+def response_store(data):
+    """Row store serving drill-down pages (see row_store.py)."""
+    return data.aggregate('store', ResponseStore)
+
+
+def headline(data):
+    """Dataset-wide figures for the KPI cards."""
+    n = len(data.df)
+    daily = int((data.df['Usage_Frequency'] == 'Daily').sum())
+    return {'responses': n,
+            'platforms': len(platform_counts(platform_masks(data)['Platforms_Used'])),
+            'satisfaction_rate': segment(coded_responses(data))['satisfaction_rate'],
+            'daily_share': daily / n * 100 if n else 0}
+
+
+def pushdown_filters(spec):
+    """(platform, frequency) of a spec the SQL backends can evaluate, or None."""
+    if set(spec) - set(MAIN_DIMENSIONS) or any(len(values) != 1 for values in spec.values()):
+        return None
+    platform = spec.get('Primary_Wallet', ['ALL'])[0]
+    if platform != 'ALL' and platform not in PLATFORM_IDS:
+        return None
+    return platform, spec.get('Usage_Frequency', ['ALL'])[0]
+
+
+class Selection:
+    """The responses of one dataset matching a filter spec, as the charts read them.
+
+    Rows are read through a RowView, so the frame is never copied. On SQLite
+    sources, a spec of at most one platform and one frequency is filtered
+    and counted inside the database.
+    """
+
+    def __init__(self, spec=None, dataset=None):
+        self.spec = {dim: list(values) for dim, values in (spec or {}).items() if values}
+        self.data = data = registry.get(dataset)
+        self.df = data.df
+        self.total = len(data.df)
+        self.coded = coded_responses(data)
+        self.platforms = platform_masks(data)
+
+        self.pushdown = pushdown_filters(self.spec) if data.backend.supports_pushdown else None
+        if self.pushdown:
+            # Pushed-down queries stop at the loaded frame's last row (ids are dense from 1)
+            self.last_id = len(self.df)
+            self.view = RowView(self.df, data.backend.row_positions(self.last_id, *self.pushdown))
+        else:
+            self.view = filter_index(data).view(self.df, self.spec)
+        # Selects the matching rows of arrays aligned with the frame
+        self.positions = self.view.rows
+
+    def __len__(self):
+        return len(self.view)
+
+    def column(self, name):
+        return self.view.column(name)
+
+    def value_counts(self, column):
+        if self.pushdown:
+            return self.data.backend.grouped_counts(column, self.last_id, *self.pushdown)
+        return self.view.value_counts(column)
+
+    def item_counts(self, column):
+        """Counts of the items named in a ';'-separated multi-select column."""
+        answers = self.column(column).dropna()
+        answers = answers[answers != '']
+        return answers.str.split(';').explode().str.strip().value_counts()
+
+    def count_in(self, column, values):
+        return self.view.count_in(column, values)
+
+    def platform_counts(self, column):
+        """Responses per canonical platform named in ``column``."""
+        return platform_counts(self.platforms[column][self.positions])
+
+    def co_usage(self, column='Platforms_Used'):
+        """Which platforms the selected respondents name together (see canonical.CoUsage)."""
+        return CoUsage(self.platforms[column][self.positions])
+
+    def switching(self):
+        """Mean predicted switching likelihood per wallet and segment, or None without a model."""
+        scores = switching_scores(self.data)
+        if scores is None:
+            return None
+        return switching_by_segment(scores, self.coded, self.positions)
+
+    @cached_property
+    def seg(self):
+        return segment(self.coded, self.positions)
@@ -0,0 +1,121 @@
+"""Canonical platform IDs for the wallet answer columns.
+
+``Platforms_Used`` and ``Primary_Wallet`` hold ';'-separated multi-select
+answers. Each distinct answer is split and each distinct token is mapped
+to a platform once; every respondent then gets a bitmask (bit ``i`` set
+when they named ``PLATFORMS[i]``) by indexing a per-answer lookup array
+with the column's factorized codes. The cost is O(distinct answers), and
+every chart and filter tests membership on the same integer IDs.
+"""
+import numpy as np
+import pandas as pd
+
+PLATFORMS = ['Easypaisa', 'JazzCash', 'NayaPay', 'Other']
+PLATFORM_IDS = {name: i for i, name in enumerate(PLATFORMS)}
+OTHER = PLATFORM_IDS['Other']
+
+# Answers that name no specific platform
+NON_PLATFORM_TOKENS = {'', 'Other digital wallet', 'I use more than one equally'}
+
+PLATFORM_COLUMNS = ['Platforms_Used', 'Primary_Wallet']
+
+
+def canonical_platform(token):
+    """Platform ID for one raw token, or None when it names no platform."""
+    token = token.strip()
+    for name in PLATFORMS[:OTHER]:
+        if name in token:
+            return PLATFORM_IDS[name]
+    if token in NON_PLATFORM_TOKENS:
+        return None
+    return OTHER
+
+
+class TokenTable:
+    """Interned raw token -> platform ID lookups, shared across columns."""
+
+    def __init__(self):
+        self.ids = {}
+
+    def platform(self, token):
+        try:
+            return self.ids[token]
+        except KeyError:
+            pid = self.ids[token] = canonical_platform(token)
+            return pid
+
+    def answer_mask(self, answer):
+        mask = 0
+        for token in answer.split(';'):
+            pid = self.platform(token)
+            if pid is not None:
+                mask |= 1 << pid
+        return mask
+
+
+def encode_platforms(values, table=None):
+    """Per-respondent platform bitmasks (uint8) for one multi-select column."""
+    table = TokenTable() if table is None else table
+    codes, answers = pd.factorize(pd.Series(values, dtype=object))
+    # The trailing 0 is the lookup for missing answers (code -1)
+    lookup = np.array([table.answer_mask(str(a)) for a in answers] + [0], dtype=np.uint8)
+    return lookup[codes]
+
+
+def encode_platform_columns(df):
+    table = TokenTable()
+    return {column: encode_platforms(df[column], table) for column in PLATFORM_COLUMNS}
+
+
+def platform_bit(name):
+    return np.uint8(1 << PLATFORM_IDS[name])
+
+
+def membership(masks, names=PLATFORMS):
+    """(n, len(names)) boolean matrix of which platforms each respondent named."""
+    bits = np.array([1 << PLATFORM_IDS[name] for name in names], dtype=np.uint8)
+    return (masks[:, None] & bits) != 0
+
+
+def platform_counts(masks):
+    """Respondents per platform, most used first (ties keep PLATFORMS order)."""
+    counts = membership(masks).sum(axis=0)
+    series = pd.Series(counts, index=pd.Index(PLATFORMS, name='Platform'), name='count')
+    series = series[series > 0]
+    return series.sort_values(ascending=False, kind='stable')
+
+
+class CoUsage:
+    """Platform x platform co-occurrence counts of one multi-select column.
+
+    Respondents are tallied by their whole platform bitmask, of which there
+    are only ``2 ** len(PLATFORMS)``, so adding respondents is one bincount
+    and tallies from separate batches simply add up. Cell (i, j) of the
+    matrix sums the tallies of the masks with both bits i and j set; the
+    diagonal counts everyone who named platform i.
+    """
+
+    SIZE = 1 << len(PLATFORMS)
+
+    def __init__(self, masks=()):
+        self.tallies = np.zeros(self.SIZE, dtype=np.int64)
+        self.add(masks)
+
+    def add(self, masks):
+        """Count more respondents' bitmasks in."""
+        self.tallies += np.bincount(np.asarray(masks, dtype=np.uint8), minlength=self.SIZE)
+        return self
+
+    def __len__(self):
+        return int(self.tallies.sum())
+
+    def matrix(self, names=PLATFORMS):
+        member = membership(np.arange(self.SIZE, dtype=np.uint8), names).astype(np.int64)
+        counts = (member * self.tallies[:, None]).T @ member
+        return pd.DataFrame(counts, index=pd.Index(names, name='Platform'), columns=list(names))
+
+    def multi(self):
+        """Respondents who named more than one platform."""
+        platforms = membership(np.arange(self.SIZE, dtype=np.uint8)).sum(axis=1)
+        return int(self.tallies[platforms > 1].sum())
+
@@ -0,0 +1,283 @@
+"""Request coalescing and result caching for identical computations.
+
+When a dashboard link is shared, many clients ask for the same filter
+state at once. ``SingleFlight`` makes concurrent callers in one process
+with the same key wait for a single in-flight computation and share its
+result. ``SharedResults`` does the same across worker processes on one
+host: the first worker takes an exclusive file lock for the key,
+computes the result and writes it to a shared directory as JSON. Workers
+blocked on the lock then read that file instead of recomputing, as does
+any later request within ``ttl`` seconds. ``ResultCache`` keeps finished
+results in memory, within an optional byte budget. Keys must include
+everything the result depends on, including the data version.
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+from plotly.basedatatypes import BaseFigure
+from plotly.io.json import to_json_plotly
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """At most one running call per key; concurrent callers share its result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.shared = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+def result_nbytes(value):
+    """Approximate memory held by a callback result: figures, components, containers.
+
+    Objects reachable twice are counted once; dict keys are not counted.
+    """
+    total = 0
+    seen = set()
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is dict or kind is list or kind is tuple:
+            if id(value) in seen:
+                continue
+            seen.add(id(value))
+            total += sys.getsizeof(value)
+            stack.extend(value.values() if kind is dict else value)
+        elif kind is np.ndarray:
+            total += sys.getsizeof(value) + (0 if value.base is None else value.nbytes)
+        elif isinstance(value, BaseFigure):
+            total += sys.getsizeof(value)
+            stack.extend((value._data, value._layout))
+        elif hasattr(value, 'to_plotly_json'):
+            # Dash components
+            stack.append(value.to_plotly_json())
+        else:
+            total += sys.getsizeof(value)
+    return total
+
+
+class Compact:
+    """A result kept as zlib-compressed Plotly JSON, a small fraction of its live size.
+
+    It reads back as plain lists and dicts, like a SharedResults result.
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, value):
+        self.data = zlib.compress(to_json_plotly(value).encode('utf-8'), 1)
+
+    def decode(self):
+        return json.loads(zlib.decompress(self.data))
+
+
+class ResultCache:
+    """Thread-safe LRU of finished results.
+
+    Over ``max_bytes``, the least recently used results are first compacted
+    (see Compact), and evicted only when compacting cannot make them fit.
+    Sizes come from ``sizeof``.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=None, sizeof=result_nbytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.compactions = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def nbytes(self):
+        return self._nbytes
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                self.misses += 1
+                return None
+            self.hits += 1
+            value = self._entries[key]
+        return value.decode() if isinstance(value, Compact) else value
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._nbytes += size
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            if self.max_bytes is not None:
+                self._fit()
+
+    def _remove(self, key):
+        if key in self._entries:
+            del self._entries[key]
+            self._nbytes -= self._sizes.pop(key)
+
+    def _fit(self):
+        for key, value in list(self._entries.items()):
+            if self._nbytes <= self.max_bytes:
+                return
+            if not isinstance(value, Compact):
+                compact = self._entries[key] = Compact(value)
+                self._nbytes += len(compact.data) - self._sizes[key]
+                self._sizes[key] = len(compact.data)
+                self.compactions += 1
+        while self._nbytes > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def discard(self, predicate):
+        """Drop every entry whose key matches ``predicate``."""
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                self._remove(key)
+
+    def report(self):
+        with self._lock:
+            compact = sum(isinstance(v, Compact) for v in self._entries.values())
+            return {'entries': len(self._entries), 'compact_entries': compact, 'bytes': self._nbytes,
+                    'max_bytes': self.max_bytes, 'hits': self.hits, 'misses': self.misses,
+                    'compactions': self.compactions, 'evictions': self.evictions}
+
+
+class SharedResults:
+    """Cross-process single flight through a directory of locked result files.
+
+    Results are stored as Plotly-flavoured JSON and come back as plain
+    lists and dicts, which Dash accepts for any output.
+    """
+
+    def __init__(self, directory, ttl=60):
+        if fcntl is None:
+            raise RuntimeError("Cross-worker coalescing needs POSIX file locks (fcntl)")
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(repr(key).encode()).hexdigest())
+
+    def read(self, path):
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def write(self, path, result):
+        # Write to a temporary file and rename, so readers never see a partial result
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(to_json_plotly(result))
+        os.replace(tmp, path)
+
+    def locked(self, lock_path):
+        """Open and exclusively lock ``lock_path``, retrying if prune removed it meanwhile."""
+        while True:
+            lock = open(lock_path, 'a')
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                if os.stat(lock_path).st_ino == os.fstat(lock.fileno()).st_ino:
+                    return lock
+            except FileNotFoundError:
+                pass
+            # Locked a file prune had already unlinked: other workers would not see our lock
+            lock.close()
+
+    def do(self, key, fn):
+        path = self.path(key)
+        result = self.read(path)
+        if result is not None:
+            return result
+        with self.locked(path + '.lock') as lock:
+            try:
+                # Another worker may have finished it while we waited for the lock
+                result = self.read(path)
+                if result is None:
+                    result = fn()
+                    self.write(path, result)
+                    self.prune()
+                return result
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def prune(self):
+        """Remove results that have outlived their ttl (and their lock files) a while ago."""
+        cutoff = time.time() - 10 * self.ttl
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) >= cutoff:
+                    continue
+                if not name.endswith('.lock'):
+                    os.remove(path)
+                    continue
+                with open(path) as lock:
+                    try:
+                        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        # A worker holds it, computing that result
+                        continue
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
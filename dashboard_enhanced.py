@@ -1,83 +1,106 @@
+import copy
+import logging
+import os
+import threading
+import time
+
 import dash
-from dash import dcc, html, Input, Output, callback
-import plotly.express as px
+from dash import dcc, html, dash_table, Input, Output, State, ALL, callback
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
-import pandas as pd
 import dash_bootstrap_components as dbc
 import numpy as np
+from flask import has_request_context, request
 
-# Load and prepare data
-df = pd.read_csv('User Perception of Digital Payment Platforms .csv')
-
-# Simplify column names
-df.columns = ['Timestamp', 'Username', 'Platforms_Used', 'Primary_Wallet', 'Usage_Frequency', 
-              'Most_Reliable', 'Best_Issue_Handler', 'Satisfaction', 'Data_Protection_Confidence',
-              'Most_Trusted_Security', 'Most_Innovative', 'Ease_of_Use', 'Adapts_Quickly',
-              'Would_Recommend', 'Prefer_PayPal', 'PayPal_Reason', 'Not_Switch_Reason',
-              'PayPal_Features_to_Adopt', 'Should_Adopt_PayPal_Practices']
-
-# Data preprocessing
-def extract_platforms(text):
-    if pd.isna(text) or text == '':
-        return []
-    platforms = text.split(';')
-    cleaned = []
-    for p in platforms:
-        p = p.strip()
-        if 'Easypaisa' in p:
-            cleaned.append('Easypaisa')
-        elif 'JazzCash' in p:
-            cleaned.append('JazzCash')
-        elif 'NayaPay' in p:
-            cleaned.append('NayaPay')
-        elif p and p != 'Other digital wallet':
-            cleaned.append('Other')
-    return list(set(cleaned))
-
-# Create platform usage count
-all_platforms = []
-for platforms in df['Platforms_Used']:
-    all_platforms.extend(extract_platforms(str(platforms)))
-platform_counts = pd.Series(all_platforms).value_counts()
-
-# Primary wallet distribution
-primary_wallet = df['Primary_Wallet'].value_counts()
-
-# Satisfaction levels
-satisfaction_order = ['Very dissatisfied', 'Dissatisfied', 'Neutral', 'Satisfied', 'Very satisfied']
-satisfaction_counts = df['Satisfaction'].value_counts()
-
-# Usage frequency
-frequency_order = ['Rarely', 'Occasionally', 'Several times a week', 'Daily']
-frequency_counts = df['Usage_Frequency'].value_counts()
+try:
+    import resource
+except ImportError:
+    resource = None
 
-# Trust and security
-trust_counts = df['Most_Trusted_Security'].value_counts()
+from analytics import Selection, filter_index, headline, registry, response_store
+from coalesce import ResultCache, SharedResults, SingleFlight
+from filters import EXTRA_DIMENSIONS, dimension_label, normalize_spec
+from live import LiveFeed, watch
+from pipeline import load_artifact
+from profiling import PROFILE_HEADER, Profiler
+from row_store import DRILL_COLUMNS
+from segmentation import SCORES, SEGMENTS, WALLETS
+import serving
+from vendor_assets import HASHED_NAME, use_local_assets
 
-# Ease of use
-ease_order = ['Very difficult to use', 'Difficult to use', 'Average', 'Easy to use', 'Very easy to use']
-ease_counts = df['Ease_of_Use'].value_counts()
+logger = logging.getLogger(__name__)
 
-# PayPal preference
-paypal_pref = df['Prefer_PayPal'].value_counts()
+# Every configured survey file is served from the process-wide registry of
+# the analytics core, the first one being the default view. Nothing here
+# keeps a reference to a loaded frame, so a reloaded or evicted dataset is
+# freed.
+#
+# Artifact mode (DASHBOARD_ARTIFACT=aggregates.json.gz): the datasets are
+# served from the aggregates precomputed by pipeline.py instead, and no
+# survey row is ever read. The extra filters and the drill-down table need
+# rows, so they are off.
+artifact_path = os.environ.get('DASHBOARD_ARTIFACT')
+artifact_mode = bool(artifact_path)
+if artifact_mode:
+    registry = load_artifact(artifact_path)
 
-# Recommendation
-recommend_counts = df['Would_Recommend'].value_counts()
+# Usage frequency filter choices
+frequency_order = ['Rarely', 'Occasionally', 'Several times a week', 'Daily']
+
+# KPI card values; segmentation codes and the drill-down row store are
+# built per dataset on first use
+def kpi_values(dataset):
+    figures = dataset.headline if artifact_mode else headline(dataset)
+    return {
+        'header-responses': f"Survey Responses: {figures['responses']}",
+        'kpi-responses': str(figures['responses']),
+        'kpi-platforms': str(figures['platforms']),
+        'kpi-satisfaction': f"{round(figures['satisfaction_rate'])}%",
+        'kpi-daily': f"{round(figures['daily_share'])}%",
+    }
 
-# Data protection confidence
-protection_order = ['Strongly disagree', 'Disagree', 'Neutral', 'Agree', 'Strongly agree']
-protection_counts = df['Data_Protection_Confidence'].value_counts()
+kpis = kpi_values(registry.get())
 
-# Initialize Dash app
-external_stylesheets = [
+
+def extra_filter_options(dataset=None):
+    """Choices of each extra filter dropdown (none in artifact mode)."""
+    if artifact_mode:
+        return [[] for _ in EXTRA_DIMENSIONS]
+    index = filter_index(registry.get(dataset))
+    return [index.options[dim] for dim in EXTRA_DIMENSIONS]
+
+# Initialize Dash app. The theme, icons and font come from their CDNs unless
+# they have been bundled into assets/vendor (python vendor_assets.py);
+# DASHBOARD_ASSETS=local or DASHBOARD_ASSETS=cdn forces one or the other.
+local_assets = use_local_assets()
+external_stylesheets = [] if local_assets else [
     dbc.themes.SLATE,
     'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css',
     'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap'
 ]
-app = dash.Dash(__name__, external_stylesheets=external_stylesheets)
+# Bundled stylesheets are linked from the assets folder like any other asset
+app = dash.Dash(__name__, external_stylesheets=external_stylesheets,
+                assets_ignore='' if local_assets else HASHED_NAME)
 app.title = "Digital Payment Analytics Dashboard"
 server = app.server  # Expose the server for deployment
+# Compressed responses; callbacks revalidate against the data version (see serving.py)
+serving.install(server, registry.version,
+                assets_path=f'{app.config.routes_pathname_prefix}{app.config.assets_url_path}/')
+
+# Static snapshot mode: the default ALL/ALL figures are rendered once per data
+# version and embedded in the layout, so first paint needs no callback round
+# trip. Set DASHBOARD_SNAPSHOT=0 to let every page load run update_all instead.
+snapshot_mode = os.environ.get('DASHBOARD_SNAPSHOT', '1') != '0'
+
+# Live mode (DASHBOARD_LIVE=1): open pages are told over server-sent events
+# when a source changes (see live.py), recompute their charts through the
+# figure cache and patch them in place. Every open page holds a connection, so serve with threaded
+# or async workers (e.g. gunicorn --threads 32, or -k gevent).
+live_mode = os.environ.get('DASHBOARD_LIVE') == '1'
+if live_mode and artifact_mode:
+    raise ValueError("DASHBOARD_LIVE needs the survey rows; it cannot be combined with DASHBOARD_ARTIFACT")
+LIVE_PATH = '/_dashboard/live'
 
 # Premium Color Palette
 colors = {
@@ -123,8 +146,8 @@ filter_card_style = {
     'boxShadow': '0 8px 32px 0 rgba(0, 184, 212, 0.1)',
 }
 
-# App layout
-app.layout = dbc.Container([
+# App layout; serve_layout fills in the current data
+page = dbc.Container([
     # Header
     dbc.Row([
         dbc.Col([
@@ -170,7 +193,7 @@ app.layout = dbc.Container([
                         'fontWeight': '500'
                     }),
                     html.Span(" • ", style={'color': colors['accent1'], 'fontSize': '1.2rem', 'margin': '0 12px'}),
-                    html.Span(f"Survey Responses: {len(df)}", style={
+                    html.Span(kpis['header-responses'], id='header-responses', style={
                         'color': colors['success'],
                         'fontSize': '1rem',
                         'fontWeight': '600'
@@ -201,7 +224,7 @@ app.layout = dbc.Container([
                             'letterSpacing': '1px',
                             'marginBottom': '8px'
                         }),
-                        html.H2(str(len(df)), className='metric-number', style={
+                        html.H2(kpis['kpi-responses'], id='kpi-responses', className='metric-number', style={
                             'color': colors['text'], 
                             'fontSize': '3rem',
                             'marginBottom': '8px'
@@ -235,7 +258,7 @@ app.layout = dbc.Container([
                             'letterSpacing': '1px',
                             'marginBottom': '8px'
                         }),
-                        html.H2(str(len(platform_counts)), className='metric-number', style={
+                        html.H2(kpis['kpi-platforms'], id='kpi-platforms', className='metric-number', style={
                             'color': colors['text'], 
                             'fontSize': '3rem',
                             'marginBottom': '8px'
@@ -269,7 +292,7 @@ app.layout = dbc.Container([
                             'letterSpacing': '1px',
                             'marginBottom': '8px'
                         }),
-                        html.H2(f"{round((satisfaction_counts.get('Satisfied', 0) + satisfaction_counts.get('Very satisfied', 0)) / len(df) * 100)}%", 
+                        html.H2(kpis['kpi-satisfaction'], id='kpi-satisfaction',
                                className='metric-number',
                                style={
                                    'color': colors['text'], 
@@ -305,7 +328,7 @@ app.layout = dbc.Container([
                             'letterSpacing': '1px',
                             'marginBottom': '8px'
                         }),
-                        html.H2(f"{round(frequency_counts.get('Daily', 0) / len(df) * 100)}%", 
+                        html.H2(kpis['kpi-daily'], id='kpi-daily',
                                className='metric-number',
                                style={
                                    'color': colors['text'], 
@@ -325,6 +348,37 @@ app.layout = dbc.Container([
     
     # Filters
     dbc.Row([
+        dbc.Col([
+            dbc.Card([
+                dbc.CardBody([
+                    html.Div([
+                        html.I(className="fas fa-database", style={
+                            'color': colors['accent2'], 
+                            'marginRight': '10px',
+                            'fontSize': '1.2rem'
+                        }),
+                        html.Label("Survey Dataset", style={
+                            'color': colors['text'], 
+                            'fontWeight': '600',
+                            'fontSize': '1rem',
+                            'marginBottom': '12px',
+                            'display': 'inline-block'
+                        }),
+                    ]),
+                    dcc.Dropdown(
+                        id='dataset-filter',
+                        options=[{'label': f'🗂️ {name}', 'value': name} for name in registry.names()],
+                        value=registry.default,
+                        style={
+                            'backgroundColor': 'rgba(10, 14, 39, 0.8)',
+                            'borderRadius': '10px',
+                        },
+                        clearable=False
+                    )
+                ])
+            ], style=filter_card_style, className='chart-card')
+        ], width=3),
+        
         dbc.Col([
             dbc.Card([
                 dbc.CardBody([
@@ -345,7 +399,7 @@ app.layout = dbc.Container([
                     dcc.Dropdown(
                         id='platform-filter',
                         options=[{'label': '🌐 All Platforms', 'value': 'ALL'}] + 
-                                [{'label': f'📱 {p}', 'value': p} for p in ['Easypaisa', 'JazzCash', 'NayaPay']],
+                                [{'label': f'📱 {p}', 'value': p} for p in WALLETS],
                         value='ALL',
                         style={
                             'backgroundColor': 'rgba(10, 14, 39, 0.8)',
@@ -355,7 +409,7 @@ app.layout = dbc.Container([
                     )
                 ])
             ], style=filter_card_style, className='chart-card')
-        ], width=4),
+        ], width=3),
         
         dbc.Col([
             dbc.Card([
@@ -387,7 +441,7 @@ app.layout = dbc.Container([
                     )
                 ])
             ], style=filter_card_style, className='chart-card')
-        ], width=4),
+        ], width=3),
         
         dbc.Col([
             dbc.Card([
@@ -416,9 +470,54 @@ app.layout = dbc.Container([
                     })
                 ])
             ], style=filter_card_style, className='chart-card')
-        ], width=4),
+        ], width=3),
     ], style={'marginBottom': '40px'}),
     
+    # Extra filters: any combination of answers (any of the selected answers
+    # within a question, all of the questions)
+    dbc.Row([
+        dbc.Col([
+            dbc.Card([
+                dbc.CardBody([
+                    html.Div([
+                        html.I(className="fas fa-sliders-h", style={
+                            'color': colors['accent2'], 
+                            'marginRight': '10px',
+                            'fontSize': '1.2rem'
+                        }),
+                        html.Label("More Filters", style={
+                            'color': colors['text'], 
+                            'fontWeight': '600',
+                            'fontSize': '1rem',
+                            'marginBottom': '12px',
+                            'display': 'inline-block'
+                        }),
+                    ]),
+                    dbc.Row([
+                        dbc.Col([
+                            html.Label(dimension_label(dimension), style={
+                                'color': colors['accent4'],
+                                'fontSize': '0.85rem',
+                                'marginBottom': '6px'
+                            }),
+                            dcc.Dropdown(
+                                id={'type': 'dimension-filter', 'dimension': dimension},
+                                options=options,
+                                multi=True,
+                                placeholder='All',
+                                style={
+                                    'backgroundColor': 'rgba(10, 14, 39, 0.8)',
+                                    'borderRadius': '10px',
+                                }
+                            )
+                        ], width=3, className='mb-3')
+                        for dimension, options in zip(EXTRA_DIMENSIONS, extra_filter_options())
+                    ])
+                ])
+            ], style=filter_card_style, className='chart-card')
+        ], width=12),
+    ], style={'display': 'none'} if artifact_mode else {'marginBottom': '40px'}),
+    
     # Charts Row 1
     dbc.Row([
         dbc.Col([
@@ -514,6 +613,90 @@ app.layout = dbc.Container([
         ], width=6, className='mb-4'),
     ]),
     
+    # Charts Row 6
+    dbc.Row([
+        dbc.Col([
+            dbc.Card([
+                dbc.CardBody([
+                    dcc.Graph(id='segment-chart', config={'displayModeBar': True, 'displaylogo': False})
+                ])
+            ], style=card_style, className='chart-card')
+        ], width=7, className='mb-4'),
+        
+        dbc.Col([
+            dbc.Card([
+                dbc.CardBody([
+                    dcc.Graph(id='co-usage-chart', config={'displayModeBar': True, 'displaylogo': False})
+                ])
+            ], style=card_style, className='chart-card')
+        ], width=5, className='mb-4'),
+    ]),
+    
+    # Charts Row 7
+    dbc.Row([
+        dbc.Col([
+            dbc.Card([
+                dbc.CardBody([
+                    dcc.Graph(id='switching-chart', config={'displayModeBar': True, 'displaylogo': False})
+                ])
+            ], style=card_style, className='chart-card')
+        ], width=12, className='mb-4'),
+    ]),
+    
+    # Drill-down
+    dbc.Row([
+        dbc.Col([
+            dbc.Card([
+                dbc.CardBody([
+                    html.Div([
+                        html.I(className="fas fa-table", style={
+                            'color': colors['secondary'],
+                            'marginRight': '10px',
+                            'fontSize': '1.2rem'
+                        }),
+                        html.Span("Click a bar or heatmap cell to list the matching responses",
+                                  id='drilldown-title', style={
+                                      'color': colors['text'],
+                                      'fontWeight': '600',
+                                      'fontSize': '1rem'
+                                  }),
+                    ], style={'marginBottom': '16px'}),
+                    dcc.Store(id='drilldown-selection'),
+                    dash_table.DataTable(
+                        id='drilldown-table',
+                        columns=[{'name': c.replace('_', ' '), 'id': c} for c in DRILL_COLUMNS],
+                        data=[],
+                        page_action='custom',
+                        page_current=0,
+                        page_size=10,
+                        page_count=0,
+                        style_table={'overflowX': 'auto'},
+                        style_header={
+                            'backgroundColor': 'rgba(108, 92, 231, 0.3)',
+                            'color': colors['text'],
+                            'fontWeight': '700',
+                            'border': '1px solid rgba(108, 92, 231, 0.3)'
+                        },
+                        style_cell={
+                            'backgroundColor': 'rgba(10, 14, 39, 0.8)',
+                            'color': colors['text'],
+                            'fontFamily': 'Inter, sans-serif',
+                            'fontSize': '0.85rem',
+                            'textAlign': 'left',
+                            'padding': '8px',
+                            'border': '1px solid rgba(108, 92, 231, 0.15)'
+                        },
+                    )
+                ])
+            ], style=card_style, className='chart-card')
+        ], width=12, className='mb-4'),
+    ]),
+    
+    # Live updates: the event stream to open (None when live mode is off)
+    # and the last event received from it
+    dcc.Store(id='live-source', data=LIVE_PATH if live_mode else None),
+    dcc.Store(id='live-event'),
+    
     # Footer
     dbc.Row([
         dbc.Col([
@@ -540,364 +723,791 @@ app.layout = dbc.Container([
 })
 
 
-# Callback
-@callback(
-    [Output('platform-usage-chart', 'figure'),
-     Output('satisfaction-chart', 'figure'),
-     Output('frequency-chart', 'figure'),
-     Output('trust-chart', 'figure'),
-     Output('ease-chart', 'figure'),
-     Output('paypal-chart', 'figure'),
-     Output('heatmap-chart', 'figure'),
-     Output('gauge-chart', 'figure'),
-     Output('reasons-chart', 'figure'),
-     Output('features-chart', 'figure'),
-     Output('filter-info', 'children')],
-    [Input('platform-filter', 'value'),
-     Input('frequency-filter', 'value')]
+# Chart theme and skeletons. The dark theme is a registered Plotly template,
+# and every chart's layout and trace styling is built and validated once
+# here; update_all only fills this request's data into copies of them.
+dark_template = go.layout.Template(pio.templates['plotly'])
+dark_template.layout.update(
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    font={'color': colors['text'], 'family': 'Inter, sans-serif', 'size': 14},
+    title_font={'size': 20, 'weight': 700, 'color': colors['text']},
+    hoverlabel={
+        'bgcolor': 'rgba(108, 92, 231, 0.95)',
+        'font_size': 15,
+        'font_family': 'Inter, sans-serif',
+        'font_color': '#FFFFFF',
+        'bordercolor': colors['primary']
+    },
+    margin=dict(t=80, b=80, l=80, r=80),
 )
-def update_all(platform, freq):
-    filtered_df = df.copy()
-    
-    filter_text = []
+pio.templates['dashboard_dark'] = dark_template
+
+
+def skeleton(traces=(), **layout):
+    """Figure dict on the dark template, validated once."""
+    return go.Figure(data=list(traces), layout=dict(layout, template='dashboard_dark')).to_dict()
+
+
+def from_skeleton(skel, traces, **layout):
+    # Skeleton styles were validated when they were built, so skip Plotly's
+    # per-property validation; the figure gets its own copy of everything
+    return go.Figure({'data': traces, 'layout': dict(skel['layout'], **layout)}, _validate=False)
+
+
+def style(skel, i=0):
+    return skel['data'][i]
+
+
+def message_skeleton(text, size=16, **layout):
+    return skeleton(annotations=[dict(text=text, showarrow=False, font=dict(size=size, color=colors['text']))],
+                    **layout)
+
+
+axis_title_font = dict(size=16)
+value_grid = dict(showgrid=True, gridcolor='rgba(108, 92, 231, 0.1)')
+bottom_legend = dict(orientation="h", yanchor="bottom", xanchor="center", x=0.5, font=dict(size=14))
+
+satisfaction_colors = {
+    'Very satisfied': colors['success'],
+    'Satisfied': colors['accent4'],
+    'Neutral': colors['warning'],
+    'Dissatisfied': colors['accent2'],
+    'Very dissatisfied': colors['danger']
+}
+
+freq_colors = {
+    'Rarely': '#FF1744',
+    'Occasionally': '#FF9800',
+    'Several times a week': '#FFD600',
+    'Daily': '#00E676'
+}
+
+trust_colors = {
+    'Easypaisa': '#6C5CE7',
+    'JazzCash': '#00B8D4',
+    'NayaPay': '#00E676',
+    'Other': '#FD79A8'
+}
+
+segment_colors = {'Promoter': colors['success'], 'Passive': colors['warning'], 'Detractor': colors['danger']}
+
+skeletons = {
+    'empty': skeleton(
+        annotations=[dict(text="No data matches the selected filters", showarrow=False,
+                          font=dict(size=18, color=colors['text']))]),
+    'platforms': skeleton(
+        [go.Bar(marker=dict(coloraxis='coloraxis', line=dict(color='rgba(108, 92, 231, 0.8)', width=2)),
+                textposition='outside', textfont=dict(size=16, weight='bold', color=colors['text']),
+                hovertemplate='<b>%{x}</b><br>Users: %{y}<extra></extra>', showlegend=False)],
+        title='<b>📱 Digital Payment Platform Usage</b>',
+        coloraxis=dict(colorscale=['#6C5CE7', '#00B8D4', '#00E676'], colorbar_title_text='Count'),
+        xaxis=dict(showgrid=False, title='<b>Platform</b>', title_font=axis_title_font, tickfont=dict(size=14)),
+        yaxis=dict(value_grid, title='<b>Users</b>', title_font=axis_title_font, tickfont=dict(size=14))),
+    'platforms-none': message_skeleton("No platform data", title='<b>📱 Digital Payment Platform Usage</b>'),
+    'satisfaction': skeleton(
+        [go.Pie(hole=0.5, marker=dict(line=dict(color='#0A0E27', width=3)),
+                textfont=dict(size=15, weight='bold', color='#FFFFFF'), textposition='outside',
+                hovertemplate='<b>%{label}</b><br>Count: %{value}<br>%{percent}<extra></extra>')],
+        title='<b>😊 User Satisfaction Distribution</b>', legend=dict(bottom_legend, y=-0.2)),
+    'frequency': skeleton(
+        [go.Bar(marker=dict(line=dict(color='rgba(10, 14, 39, 0.8)', width=2)), textposition='outside',
+                textfont=dict(size=16, weight='bold', color=colors['text']),
+                hovertemplate='<b>%{x}</b><br>Users: %{y}<extra></extra>')],
+        title='<b>⏰ Transaction Frequency Patterns</b>',
+        xaxis=dict(showgrid=False, title='<b>Frequency</b>', title_font=axis_title_font, tickfont=dict(size=13)),
+        yaxis=dict(value_grid, title='<b>Users</b>', title_font=axis_title_font, tickfont=dict(size=14))),
+    'trust': skeleton(
+        [go.Scatter(mode='markers', marker=dict(line=dict(width=2, color='#0A0E27'), opacity=0.8))],
+        title='<b>🔒 Most Trusted Platforms</b>', legend=dict(bottom_legend, y=-0.3),
+        xaxis=dict(showgrid=False, title_font=axis_title_font, tickfont=dict(size=14)),
+        yaxis=dict(value_grid, title_font=axis_title_font, tickfont=dict(size=14))),
+    'trust-none': message_skeleton("No trust data", title='<b>🔒 Most Trusted Platforms</b>'),
+    'ease': skeleton(
+        [go.Scatterpolar(fill='toself', fillcolor='rgba(0, 230, 118, 0.3)',
+                         line=dict(color=colors['success'], width=3),
+                         marker=dict(size=10, color=colors['warning'], line=dict(width=2, color='#0A0E27')),
+                         hovertemplate='<b>%{theta}</b><br>Count: %{r}<extra></extra>')],
+        title='<b>✨ Ease of Use Experience</b>',
+        polar=dict(radialaxis=dict(visible=True, color=colors['text'], gridcolor='rgba(108, 92, 231, 0.2)',
+                                   tickfont=dict(size=13)),
+                   bgcolor='rgba(0,0,0,0)',
+                   angularaxis=dict(gridcolor='rgba(108, 92, 231, 0.2)', tickfont=dict(size=14)))),
+    'paypal': skeleton(
+        [go.Funnel(textposition="inside", textfont=dict(size=15, weight='bold', color='#FFFFFF'),
+                   marker=dict(color=['#4CAF50', '#8BC34A', '#FFC107', '#FF9800', '#F44336']),
+                   textinfo="value+percent initial", hovertemplate='<b>%{y}</b><br>Count: %{x}<extra></extra>')],
+        title='<b>💳 PayPal Preference Analysis</b>', yaxis=dict(tickfont=dict(size=14))),
+    'heatmap': skeleton(
+        [go.Heatmap(x=SCORES, y=WALLETS, colorscale='Turbo', texttemplate='%{text}',
+                    textfont={"size": 16, "weight": "bold", "color": "#FFFFFF"},
+                    hovertemplate='<b>%{y}</b><br>%{x}: %{z:.2f}<extra></extra>',
+                    colorbar=dict(title=dict(text="Score", font=dict(size=14)), tickfont=dict(size=13)))],
+        title='<b>📊 Platform Performance Heatmap</b>',
+        xaxis=dict(tickfont=dict(size=14)), yaxis=dict(tickfont=dict(size=14))),
+    'gauge': skeleton(
+        [go.Indicator(
+            mode="gauge+number+delta",
+            domain={'x': [0, 1], 'y': [0, 1]},
+            title={'font': {'size': 20}},
+            number={'font': {'size': 40, 'weight': 'bold'}},
+            delta={'reference': 80, 'increasing': {'color': colors['success']}, 'font': {'size': 18}},
+            gauge={
+                'axis': {'range': [None, 100], 'tickwidth': 2, 'tickcolor': colors['text'], 'tickfont': {'size': 14}},
+                'bar': {'color': colors['primary'], 'thickness': 0.8},
+                'bgcolor': "rgba(0,0,0,0)",
+                'borderwidth': 2,
+                'bordercolor': colors['text'],
+                'steps': [
+                    {'range': [0, 50], 'color': 'rgba(255, 107, 53, 0.3)'},
+                    {'range': [50, 75], 'color': 'rgba(255, 193, 7, 0.3)'},
+                    {'range': [75, 100], 'color': 'rgba(76, 175, 80, 0.3)'}
+                ],
+                'threshold': {'line': {'color': "red", 'width': 4}, 'thickness': 0.75, 'value': 90}
+            }
+        )],
+        height=400),
+    'reasons': skeleton(
+        [go.Bar(orientation='h', marker=dict(coloraxis='coloraxis'), textposition='outside',
+                textfont=dict(size=15, weight='bold', color=colors['text']),
+                hovertemplate='<b>%{y}</b><br>Count: %{x}<extra></extra>', showlegend=False)],
+        title='<b>💡 Why Users Choose PayPal</b>',
+        coloraxis=dict(colorscale='Blues', colorbar_title_text='Count'),
+        xaxis=dict(title='Count', title_font=axis_title_font, tickfont=dict(size=14)),
+        yaxis=dict(title='Reason', title_font=axis_title_font, tickfont=dict(size=13))),
+    'features': skeleton(
+        [go.Treemap(branchvalues='total', marker=dict(coloraxis='coloraxis'), textinfo='label+value',
+                    textfont=dict(size=14, weight='bold', color='#FFFFFF'),
+                    hovertemplate='<b>%{label}</b><br>Count: %{value}<extra></extra>')],
+        title='<b>🚀 Features to Adopt from PayPal</b>',
+        coloraxis=dict(colorscale='Viridis', colorbar_title_text='Count')),
+    'no-data': message_skeleton("No data available", size=20),
+    'segments': skeleton(
+        [go.Bar(y=WALLETS, name=name, orientation='h',
+                marker=dict(color=segment_colors[name], line=dict(color='#0A0E27', width=2)),
+                textposition='inside', textfont=dict(size=14, weight='bold', color='#0A0E27'),
+                hovertemplate=('<b>%{y}</b><br>' + name + 's: %{x:.1f}%<br>Respondents: %{customdata[0]}'
+                               '<br>NPS: %{customdata[1]:+.0f}<br>Satisfaction: %{customdata[2]:.2f}'
+                               '<br>Security Trust: %{customdata[3]:.2f}<extra></extra>'))
+         for name in SEGMENTS],
+        title='<b>🎯 Promoters vs Detractors by Wallet</b>', barmode='stack', legend=dict(bottom_legend, y=-0.3),
+        xaxis=dict(value_grid, title='<b>Share of Respondents (%)</b>', range=[0, 100],
+                   title_font=axis_title_font, tickfont=dict(size=14)),
+        yaxis=dict(showgrid=False, tickfont=dict(size=14))),
+    'co-usage': skeleton(
+        [go.Heatmap(colorscale=[[0, 'rgba(108, 92, 231, 0.15)'], [0.5, colors['primary']], [1, colors['secondary']]],
+                    texttemplate='%{z}', textfont={"size": 16, "weight": "bold", "color": "#FFFFFF"},
+                    hovertemplate=('<b>%{y} & %{x}</b><br>Respondents: %{z}'
+                                   '<br>%{customdata:.0f}% of %{y} users<extra></extra>'),
+                    colorbar=dict(title=dict(text="Users", font=dict(size=14)), tickfont=dict(size=13)))],
+        title='<b>🔗 Multi-Wallet Co-usage</b>',
+        xaxis=dict(side='bottom', title_font=dict(size=14), tickfont=dict(size=14)),
+        yaxis=dict(autorange='reversed', tickfont=dict(size=14))),
+    'co-usage-none': message_skeleton("No platform data", title='<b>🔗 Multi-Wallet Co-usage</b>'),
+    'switching': skeleton(
+        [go.Bar(x=WALLETS, name=name, marker=dict(color=segment_colors[name], line=dict(color='#0A0E27', width=2)),
+                textposition='outside', textfont=dict(size=14, weight='bold', color=colors['text']),
+                hovertemplate=('<b>%{x}</b> ' + name.lower() + 's<br>Predicted switching: %{y:.1f}%'
+                               '<br>Respondents: %{customdata}<extra></extra>'))
+         for name in SEGMENTS],
+        title='<b>🔀 Predicted PayPal Switching by Wallet Segment</b>', barmode='group',
+        legend=dict(bottom_legend, y=-0.3),
+        xaxis=dict(showgrid=False, title_font=dict(size=14), tickfont=dict(size=14)),
+        yaxis=dict(value_grid, title='<b>Switching Likelihood (%)</b>', range=[0, 110],
+                   title_font=axis_title_font, tickfont=dict(size=14))),
+    'switching-none': message_skeleton("No PayPal preference answers",
+                                       title='<b>🔀 Predicted PayPal Switching by Wallet Segment</b>'),
+}
+
+
+def filter_spec(platform, freq, filters=None):
+    """The filter engine spec of the main dropdowns plus any extra filters."""
+    spec = {dim: values for dim, values in (filters or {}).items() if values}
     if platform != 'ALL':
-        filtered_df = filtered_df[filtered_df['Primary_Wallet'].str.contains(platform, na=False)]
-        filter_text.append(f"Platform: {platform}")
-    else:
-        filter_text.append("Platform: All")
-    
+        spec['Primary_Wallet'] = [platform]
     if freq != 'ALL':
-        filtered_df = filtered_df[filtered_df['Usage_Frequency'] == freq]
-        filter_text.append(f"Frequency: {freq}")
-    else:
-        filter_text.append("Frequency: All")
-    
+        spec['Usage_Frequency'] = [freq]
+    return spec
+
+
+class FilterView(Selection):
+    """The responses matching one state of the dashboard's filters."""
+
+    def __init__(self, platform, freq, dataset=None, filters=None):
+        self.platform = platform
+        self.freq = freq
+        self.filters = {dim: values for dim, values in (filters or {}).items() if values}
+        super().__init__(filter_spec(platform, freq, self.filters), dataset)
+
+
+def open_view(platform, freq, dataset=None, filters=None):
+    """FilterView of one filter state, or its precomputed aggregates in artifact mode."""
+    if artifact_mode:
+        return registry.get(dataset).view(platform, freq)
+    return FilterView(platform, freq, dataset, filters)
+
+
+def filter_summary(view):
     # Handle empty filtered data
-    if len(filtered_df) == 0:
-        empty_fig = go.Figure()
-        empty_fig.add_annotation(
-            text="No data matches the selected filters",
-            showarrow=False,
-            font=dict(size=18, color=colors['text'])
-        )
-        empty_fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-        )
-        filter_info = html.Div([
+    if len(view) == 0:
+        return html.Div([
             html.P("⚠️ No data available for selected filters", 
                    style={'color': colors['warning'], 'fontWeight': '600'})
         ])
-        return empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, empty_fig, filter_info
     
-    filter_info = html.Div([
+    filter_text = [f"Platform: {view.platform}" if view.platform != 'ALL' else "Platform: All",
+                   f"Frequency: {view.freq}" if view.freq != 'ALL' else "Frequency: All"]
+    filter_text += [f"{dimension_label(dim)}: {', '.join(values)}" for dim, values in view.filters.items()]
+    return html.Div([
         html.P([html.I(className="fas fa-check-circle", style={'marginRight': '8px', 'color': colors['success']}), 
                 text], style={'margin': '4px 0'}) 
         for text in filter_text
-    ] + [html.P(f"📊 Showing {len(filtered_df)} of {len(df)} responses", 
+    ] + [html.P(f"📊 Showing {len(view)} of {view.total} responses", 
                 style={'margin': '8px 0', 'fontWeight': '600', 'color': colors['warning']})])
+
+
+# Chart 1: Platform Usage
+def platform_usage_figure(view):
+    plat_counts = view.platform_counts('Platforms_Used')
+    if len(plat_counts) == 0:
+        return from_skeleton(skeletons['platforms-none'], [])
     
-    base_layout = {
-        'plot_bgcolor': 'rgba(0,0,0,0)',
-        'paper_bgcolor': 'rgba(0,0,0,0)',
-        'font': {'color': colors['text'], 'family': 'Inter, sans-serif', 'size': 14},
-        'title_font_size': 20,
-        'title_font_weight': 700,
-        'title_font_color': colors['text'],
-        'hoverlabel': {
-            'bgcolor': 'rgba(108, 92, 231, 0.95)',
-            'font_size': 15,
-            'font_family': 'Inter, sans-serif',
-            'font_color': '#FFFFFF',
-            'bordercolor': colors['primary']
-        },
-        'margin': dict(t=80, b=80, l=80, r=80),
-    }
-    
-    # Chart 1: Platform Usage
-    all_plat = []
-    for p in filtered_df['Platforms_Used']:
-        all_plat.extend(extract_platforms(str(p)))
-    
-    if len(all_plat) > 0:
-        plat_df = pd.Series(all_plat).value_counts().reset_index()
-        plat_df.columns = ['Platform', 'Count']
-        
-        fig1 = px.bar(plat_df, x='Platform', y='Count',
-                      title='<b>📱 Digital Payment Platform Usage</b>',
-                      color='Count',
-                      color_continuous_scale=['#6C5CE7', '#00B8D4', '#00E676'],
-                      text='Count')
-        fig1.update_layout(**base_layout)
-        fig1.update_traces(textposition='outside', textfont=dict(size=16, weight='bold', color=colors['text']),
-                          marker_line_color='rgba(108, 92, 231, 0.8)', marker_line_width=2,
-                          hovertemplate='<b>%{x}</b><br>Users: %{y}<extra></extra>')
-        fig1.update_xaxes(showgrid=False, title='<b>Platform</b>', title_font=dict(size=16), tickfont=dict(size=14))
-        fig1.update_yaxes(showgrid=True, gridcolor='rgba(108, 92, 231, 0.1)', title='<b>Users</b>', title_font=dict(size=16), tickfont=dict(size=14))
-    else:
-        fig1 = go.Figure()
-        fig1.add_annotation(text="No platform data", showarrow=False, font=dict(size=16, color=colors['text']))
-        fig1.update_layout(**base_layout, title='<b>📱 Digital Payment Platform Usage</b>')
-    
-    # Chart 2: Satisfaction
-    sat_df = filtered_df['Satisfaction'].value_counts().reset_index()
-    sat_df.columns = ['Level', 'Count']
-    
-    color_map = {
-        'Very satisfied': colors['success'],
-        'Satisfied': colors['accent4'],
-        'Neutral': colors['warning'],
-        'Dissatisfied': colors['accent2'],
-        'Very dissatisfied': colors['danger']
-    }
-    
-    fig2 = go.Figure(data=[go.Pie(
-        labels=sat_df['Level'],
-        values=sat_df['Count'],
-        hole=0.5,
-        marker=dict(
-            colors=[color_map.get(l, colors['primary']) for l in sat_df['Level']],
-            line=dict(color='#0A0E27', width=3)
-        ),
-        textfont=dict(size=15, weight='bold', color='#FFFFFF'),
-        textposition='outside',
-        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>%{percent}<extra></extra>'
-    )])
-    fig2.update_layout(**base_layout, title='<b>😊 User Satisfaction Distribution</b>',
-                      legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5, font=dict(size=14)))
-    fig2.add_annotation(text=f'<b>{len(filtered_df)}</b><br>Total',
-                       x=0.5, y=0.5, font_size=20, font=dict(weight='bold'), showarrow=False, font_color=colors['primary'])
-    
-    # Chart 3: Frequency
-    freq_df = filtered_df['Usage_Frequency'].value_counts().reset_index()
-    freq_df.columns = ['Frequency', 'Count']
-    
-    freq_colors = {
-        'Rarely': '#FF1744',
-        'Occasionally': '#FF9800',
-        'Several times a week': '#FFD600',
-        'Daily': '#00E676'
-    }
+    skel = skeletons['platforms']
+    counts = plat_counts.to_numpy()
+    return from_skeleton(skel, [dict(style(skel), x=plat_counts.index.tolist(), y=counts, text=counts,
+                                     marker=dict(style(skel)['marker'], color=counts))])
+
+
+# Chart 2: Satisfaction
+def satisfaction_figure(view):
+    sat_counts = view.value_counts('Satisfaction')
     
-    fig3 = go.Figure(data=[go.Bar(
-        x=freq_df['Frequency'], 
-        y=freq_df['Count'],
-        marker=dict(
-            color=[freq_colors.get(f, colors['primary']) for f in freq_df['Frequency']],
-            line=dict(color='rgba(10, 14, 39, 0.8)', width=2)
-        ),
-        text=freq_df['Count'],
-        textposition='outside',
-        textfont=dict(size=16, weight='bold', color=colors['text']),
-        hovertemplate='<b>%{x}</b><br>Users: %{y}<extra></extra>'
-    )])
-    fig3.update_layout(**base_layout, title='<b>⏰ Transaction Frequency Patterns</b>')
-    fig3.update_xaxes(showgrid=False, title='<b>Frequency</b>', title_font=dict(size=16), tickfont=dict(size=13))
-    fig3.update_yaxes(showgrid=True, gridcolor='rgba(108, 92, 231, 0.1)', title='<b>Users</b>', title_font=dict(size=16), tickfont=dict(size=14))
+    skel = skeletons['satisfaction']
+    return from_skeleton(skel, [dict(style(skel), labels=sat_counts.index.tolist(), values=sat_counts.to_numpy(),
+                                     marker=dict(style(skel)['marker'],
+                                                 colors=[satisfaction_colors.get(l, colors['primary'])
+                                                         for l in sat_counts.index]))],
+                         annotations=[dict(text=f'<b>{len(view)}</b><br>Total', x=0.5, y=0.5, showarrow=False,
+                                           font=dict(size=20, weight='bold', color=colors['primary']))])
+
+
+# Chart 3: Frequency
+def frequency_figure(view):
+    freq_counts = view.value_counts('Usage_Frequency')
     
-    # Chart 4: Trust
-    trust_df = filtered_df['Most_Trusted_Security'].value_counts().reset_index()
-    trust_df.columns = ['Platform', 'Count']
-    trust_df = trust_df[trust_df['Platform'] != 'None']
+    skel = skeletons['frequency']
+    return from_skeleton(skel, [dict(style(skel), x=freq_counts.index.tolist(), y=freq_counts.to_numpy(),
+                                     text=freq_counts.to_numpy(),
+                                     marker=dict(style(skel)['marker'],
+                                                 color=[freq_colors.get(f, colors['primary'])
+                                                        for f in freq_counts.index]))])
+
+
+# Chart 4: Trust
+def trust_figure(view):
+    trust = view.value_counts('Most_Trusted_Security')
+    trust = trust[trust.index != 'None']
+    if len(trust) == 0:
+        return from_skeleton(skeletons['trust-none'], [])
     
-    if len(trust_df) > 0:
-        platform_colors = {
-            'Easypaisa': '#6C5CE7',
-            'JazzCash': '#00B8D4',
-            'NayaPay': '#00E676',
-            'Other': '#FD79A8'
-        }
-        
-        fig4 = go.Figure()
-        for _, row in trust_df.iterrows():
-            fig4.add_trace(go.Scatter(
-                x=[row['Platform']],
-                y=[row['Count']],
-                mode='markers',
-                name=row['Platform'],
-                marker=dict(
-                    size=row['Count'] * 15,
-                    color=platform_colors.get(row['Platform'], colors['accent1']),
-                    line=dict(width=2, color='#0A0E27'),
-                    opacity=0.8
-                ),
-                hovertemplate=f'<b>{row["Platform"]}</b><br>Trust: {row["Count"]}<extra></extra>',
-            ))
-        
-        fig4.update_layout(**base_layout, title='<b>🔒 Most Trusted Platforms</b>',
-                          legend=dict(orientation="h", yanchor="bottom", y=-0.3, xanchor="center", x=0.5, font=dict(size=14)))
-        fig4.update_xaxes(showgrid=False, title_font=dict(size=16), tickfont=dict(size=14))
-        fig4.update_yaxes(showgrid=True, gridcolor='rgba(108, 92, 231, 0.1)', title_font=dict(size=16), tickfont=dict(size=14))
-    else:
-        fig4 = go.Figure()
-        fig4.add_annotation(text="No trust data", showarrow=False, font=dict(size=16, color=colors['text']))
-        fig4.update_layout(**base_layout, title='<b>🔒 Most Trusted Platforms</b>')
+    skel = skeletons['trust']
+    return from_skeleton(skel, [
+        dict(style(skel), x=[name], y=[count], name=name,
+             marker=dict(style(skel)['marker'], size=count * 15, color=trust_colors.get(name, colors['accent1'])),
+             hovertemplate=f'<b>{name}</b><br>Trust: {count}<extra></extra>')
+        for name, count in trust.items()
+    ])
+
+
+# Chart 5: Ease of Use
+def ease_figure(view):
+    ease_counts = view.value_counts('Ease_of_Use')
     
-    # Chart 5: Ease of Use
-    ease_df = filtered_df['Ease_of_Use'].value_counts().reset_index()
-    ease_df.columns = ['Level', 'Count']
+    skel = skeletons['ease']
+    return from_skeleton(skel, [dict(style(skel), r=ease_counts.to_numpy(), theta=ease_counts.index.tolist())])
+
+
+# Chart 6: PayPal Preference
+def paypal_figure(view):
+    pp_counts = view.value_counts('Prefer_PayPal')
+    pp_counts = pp_counts[pp_counts.index != '']
     
-    fig5 = go.Figure()
-    fig5.add_trace(go.Scatterpolar(
-        r=ease_df['Count'],
-        theta=ease_df['Level'],
-        fill='toself',
-        fillcolor='rgba(0, 230, 118, 0.3)',
-        line=dict(color=colors['success'], width=3),
-        marker=dict(size=10, color=colors['warning'], line=dict(width=2, color='#0A0E27')),
-        hovertemplate='<b>%{theta}</b><br>Count: %{r}<extra></extra>',
-    ))
+    skel = skeletons['paypal']
+    return from_skeleton(skel, [dict(style(skel), y=pp_counts.index.tolist(), x=pp_counts.to_numpy())])
+
+
+# Chart 7: Heatmap
+def heatmap_figure(view):
+    hm_data = view.seg['wallets'][SCORES].values.tolist()
     
-    fig5.update_layout(**base_layout, title='<b>✨ Ease of Use Experience</b>',
-                      polar=dict(
-                          radialaxis=dict(visible=True, color=colors['text'],
-                                        gridcolor='rgba(108, 92, 231, 0.2)',
-                                        tickfont=dict(size=13)),
-                          bgcolor='rgba(0,0,0,0)',
-                          angularaxis=dict(gridcolor='rgba(108, 92, 231, 0.2)',
-                                         tickfont=dict(size=14))
-                      ))
+    skel = skeletons['heatmap']
+    return from_skeleton(skel, [dict(style(skel), z=hm_data,
+                                     text=[[f'{val:.2f}' for val in row] for row in hm_data])])
+
+
+# Chart 8: Recommendation Gauge
+def gauge_figure(view):
+    seg = view.seg
     
-    # Chart 6: PayPal Preference
-    pp_df = filtered_df['Prefer_PayPal'].value_counts().reset_index()
-    pp_df.columns = ['Preference', 'Count']
-    pp_df = pp_df[pp_df['Preference'] != '']
+    skel = skeletons['gauge']
+    return from_skeleton(skel, [dict(style(skel), value=seg['recommend_rate'],
+                                     title=dict(style(skel)['title'],
+                                                text=f"<b>Would Recommend</b><br><span style='font-size:15px'>"
+                                                     f"NPS {seg['nps']:+.0f}</span>"))])
+
+
+# Chart 9: PayPal Reasons
+def reasons_figure(view):
+    reas_counts = view.value_counts('PayPal_Reason')
+    reas_counts = reas_counts[reas_counts.index != '']
+    if len(reas_counts) == 0:
+        return from_skeleton(skeletons['no-data'], [])
     
-    fig6 = go.Figure(go.Funnel(
-        y=pp_df['Preference'],
-        x=pp_df['Count'],
-        textposition="inside",
-        textfont=dict(size=15, weight='bold', color='#FFFFFF'),
-        marker=dict(color=['#4CAF50', '#8BC34A', '#FFC107', '#FF9800', '#F44336']),
-        textinfo="value+percent initial",
-        hovertemplate='<b>%{y}</b><br>Count: %{x}<extra></extra>'
-    ))
-    fig6.update_layout(**base_layout, title='<b>💳 PayPal Preference Analysis</b>')
-    fig6.update_yaxes(tickfont=dict(size=14))
+    skel = skeletons['reasons']
+    counts = reas_counts.to_numpy()
+    return from_skeleton(skel, [dict(style(skel), y=reas_counts.index.tolist(), x=counts, text=counts,
+                                     marker=dict(style(skel)['marker'], color=counts))])
+
+
+# Chart 10: Features to Adopt
+def features_figure(view):
+    feat_counts = view.item_counts('PayPal_Features_to_Adopt').sort_index()
+    feat_counts = feat_counts[feat_counts > 0]
+    if len(feat_counts) == 0:
+        return from_skeleton(skeletons['no-data'], [])
     
-    # Chart 7: Heatmap
-    sat_map = {'Very dissatisfied': 1, 'Dissatisfied': 2, 'Neutral': 3, 'Satisfied': 4, 'Very satisfied': 5}
-    prot_map = {'Strongly disagree': 1, 'Disagree': 2, 'Neutral': 3, 'Agree': 4, 'Strongly agree': 5}
-    ease_map = {'Very difficult to use': 1, 'Difficult to use': 2, 'Average': 3, 'Easy to use': 4, 'Very easy to use': 5}
+    skel = skeletons['features']
+    labels = feat_counts.index.tolist()
+    counts = feat_counts.to_numpy()
+    return from_skeleton(skel, [dict(style(skel), ids=labels, labels=labels, parents=[''] * len(labels),
+                                     values=counts, marker=dict(style(skel)['marker'], colors=counts))])
+
+
+# Chart 11: Promoter / passive / detractor split per wallet
+def segment_figure(view):
+    seg_wallets = view.seg['wallets']
+    hover_scores = np.column_stack([seg_wallets['Respondents'], seg_wallets['NPS'],
+                                    seg_wallets['Satisfaction'], seg_wallets['Security Trust']])
     
-    hm_df = filtered_df.copy()
-    hm_df['Sat_Score'] = hm_df['Satisfaction'].map(sat_map)
-    hm_df['Prot_Score'] = hm_df['Data_Protection_Confidence'].map(prot_map)
-    hm_df['Ease_Score'] = hm_df['Ease_of_Use'].map(ease_map)
+    skel = skeletons['segments']
+    return from_skeleton(skel, [
+        dict(style(skel, i), x=seg_wallets[name].to_numpy(), text=[f'{v:.0f}%' for v in seg_wallets[name]],
+             customdata=hover_scores)
+        for i, name in enumerate(SEGMENTS)
+    ])
+
+
+# Chart 12: Which wallets are used together
+def co_usage_figure(view):
+    co_usage = view.co_usage()
+    matrix = co_usage.matrix()
+    users = np.diag(matrix.to_numpy())
+    matrix = matrix.loc[users > 0, users > 0]
+    if matrix.empty:
+        return from_skeleton(skeletons['co-usage-none'], [])
     
-    platforms = ['Easypaisa', 'JazzCash', 'NayaPay']
-    metrics = ['Satisfaction', 'Security Trust', 'Ease of Use']
+    counts = matrix.to_numpy()
+    skel = skeletons['co-usage']
+    multi = co_usage.multi()
+    return from_skeleton(skel, [dict(style(skel), z=counts, x=matrix.columns.tolist(), y=matrix.index.tolist(),
+                                     customdata=counts / np.diag(counts)[:, None] * 100)],
+                         xaxis=dict(skel['layout']['xaxis'],
+                                    title=f'<b>{multi} of {len(view)} respondents '
+                                          f'({multi / len(view) * 100:.0f}%) use more than one wallet</b>'))
+
+
+# Chart 13: Model-predicted likelihood of switching to PayPal
+def switching_figure(view):
+    switching = view.switching()
+    if switching is None:
+        return from_skeleton(skeletons['switching-none'], [])
     
-    hm_data = []
-    for plat in platforms:
-        plat_data = hm_df[hm_df['Primary_Wallet'].str.contains(plat, na=False)]
-        if len(plat_data) > 0:
-            hm_data.append([
-                plat_data['Sat_Score'].mean(),
-                plat_data['Prot_Score'].mean(),
-                plat_data['Ease_Score'].mean()
-            ])
+    likelihood = switching['likelihood']
+    respondents = switching['respondents']
+    skel = skeletons['switching']
+    return from_skeleton(skel, [
+        dict(style(skel, i), y=likelihood[name].to_numpy(), customdata=respondents[name].to_numpy(),
+             text=[f'{v:.0f}%' if n else '' for v, n in zip(likelihood[name], respondents[name])])
+        for i, name in enumerate(SEGMENTS)
+    ], xaxis=dict(skel['layout']['xaxis'],
+                  title=f"<b>Average predicted switching: {switching['overall']:.0f}%</b>"))
+
+
+# Graph ids and their builders, in the order update_all returns their figures
+chart_builders = {
+    'platform-usage-chart': platform_usage_figure,
+    'satisfaction-chart': satisfaction_figure,
+    'frequency-chart': frequency_figure,
+    'trust-chart': trust_figure,
+    'ease-chart': ease_figure,
+    'paypal-chart': paypal_figure,
+    'heatmap-chart': heatmap_figure,
+    'gauge-chart': gauge_figure,
+    'reasons-chart': reasons_figure,
+    'features-chart': features_figure,
+    'segment-chart': segment_figure,
+    'co-usage-chart': co_usage_figure,
+    'switching-chart': switching_figure,
+}
+chart_ids = list(chart_builders)
+
+
+def chart_figures(view, ids):
+    if len(view) == 0:
+        empty_fig = from_skeleton(skeletons['empty'], [])
+        return [empty_fig] * len(ids)
+    return [chart_builders[chart_id](view) for chart_id in ids]
+
+
+# Opt-in profiling of chart computations (DASHBOARD_PROFILE, see profiling.py)
+profiler = Profiler.from_env()
+
+
+def profile_requested():
+    return has_request_context() and profiler.requested(request.headers.get(PROFILE_HEADER))
+
+
+def update_all(platform, freq, dataset=None, filters=None):
+    """Every chart's figure for one filter state, then the filter summary.
+
+    ``filters`` maps extra dimensions (see filters.py) to the answers to keep.
+    """
+    def compute():
+        view = open_view(platform, freq, dataset, filters)
+        return (*chart_figures(view, chart_ids), filter_summary(view))
+    return profiler.call('update_all', compute, profile_requested())
+
+
+# Charts named in DASHBOARD_BACKGROUND_CHARTS (comma-separated graph ids, e.g.
+# heatmap-chart,features-chart) run as Dash background callbacks on a local
+# diskcache job queue instead of holding a request thread. Dash cancels a
+# running job when its filters change again, so stale work is dropped.
+background_charts = [c.strip() for c in os.environ.get('DASHBOARD_BACKGROUND_CHARTS', '').split(',') if c.strip()]
+unknown_charts = set(background_charts) - set(chart_ids)
+if unknown_charts:
+    raise ValueError(f"Unknown DASHBOARD_BACKGROUND_CHARTS: {', '.join(sorted(unknown_charts))}")
+foreground_charts = [c for c in chart_ids if c not in background_charts]
+
+# Identical concurrent filter requests share one computation: always within
+# a worker, and across the workers on a host when DASHBOARD_COALESCE_DIR
+# names a shared directory (see coalesce.py)
+flights = SingleFlight()
+coalesce_dir = os.environ.get('DASHBOARD_COALESCE_DIR')
+shared_results = (SharedResults(coalesce_dir, float(os.environ.get('DASHBOARD_COALESCE_TTL', '60')))
+                  if coalesce_dir else None)
+# Finished callback results, keyed like the computations. Past
+# DASHBOARD_FIGURE_CACHE_MB, the least recently used results are kept
+# compressed, then evicted (see coalesce.py).
+figure_cache = ResultCache(int(os.environ.get('DASHBOARD_FIGURE_CACHE', '256')),
+                           max_bytes=int(float(os.environ.get('DASHBOARD_FIGURE_CACHE_MB', '64')) * 2 ** 20))
+
+
+def memory_report():
+    """Bytes held by this worker's datasets (per column and aggregate) and figure cache."""
+    report = {'datasets': registry.memory_report(), 'figure_cache': figure_cache.report()}
+    if resource is not None:
+        # Peak resident set size, in kilobytes on Linux
+        report['peak_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return report
+
+
+# DASHBOARD_MEMORY_REPORT=1 serves memory_report() as JSON
+if os.environ.get('DASHBOARD_MEMORY_REPORT') == '1':
+    server.add_url_rule('/_dashboard/memory', 'memory_report', memory_report)
+
+
+def coalesced(label, outputs, platform, freq, dataset, filters, compute):
+    data = registry.get(dataset)
+    key = (tuple(outputs), platform, freq, data.name, data.version, normalize_spec(filters))
+    if profile_requested():
+        # Recompute, so that the profile shows the actual work
+        result = profiler.call(label, compute, forced=True)
+        figure_cache.put(key, result)
+        return result
+    result = figure_cache.get(key)
+    if result is None:
+        def profiled():
+            return profiler.call(label, compute)
+        if shared_results is not None:
+            result = flights.do(key, lambda: shared_results.do(key, profiled))
         else:
-            hm_data.append([0, 0, 0])
-    
-    fig7 = go.Figure(data=go.Heatmap(
-        z=hm_data,
-        x=metrics,
-        y=platforms,
-        colorscale='Turbo',
-        text=[[f'{val:.2f}' for val in row] for row in hm_data],
-        texttemplate='%{text}',
-        textfont={"size": 16, "weight": "bold", "color": "#FFFFFF"},
-        hovertemplate='<b>%{y}</b><br>%{x}: %{z:.2f}<extra></extra>',
-        colorbar=dict(
-            title=dict(text="Score", font=dict(size=14)),
-            tickfont=dict(size=13)
-        )
-    ))
-    fig7.update_layout(**base_layout, title='<b>📊 Platform Performance Heatmap</b>')
-    fig7.update_xaxes(tickfont=dict(size=14))
-    fig7.update_yaxes(tickfont=dict(size=14))
-    
-    # Chart 8: Recommendation Gauge
-    rec = filtered_df['Would_Recommend'].value_counts()
-    yes = rec.get('Yes', 0)
-    total = rec.sum()
-    rate = (yes / total * 100) if total > 0 else 0
-    
-    fig8 = go.Figure(go.Indicator(
-        mode="gauge+number+delta",
-        value=rate,
-        domain={'x': [0, 1], 'y': [0, 1]},
-        title={'text': "<b>Would Recommend</b>", 'font': {'size': 20}},
-        number={'font': {'size': 40, 'weight': 'bold'}},
-        delta={'reference': 80, 'increasing': {'color': colors['success']}, 'font': {'size': 18}},
-        gauge={
-            'axis': {'range': [None, 100], 'tickwidth': 2, 'tickcolor': colors['text'], 'tickfont': {'size': 14}},
-            'bar': {'color': colors['primary'], 'thickness': 0.8},
-            'bgcolor': "rgba(0,0,0,0)",
-            'borderwidth': 2,
-            'bordercolor': colors['text'],
-            'steps': [
-                {'range': [0, 50], 'color': 'rgba(255, 107, 53, 0.3)'},
-                {'range': [50, 75], 'color': 'rgba(255, 193, 7, 0.3)'},
-                {'range': [75, 100], 'color': 'rgba(76, 175, 80, 0.3)'}
-            ],
-            'threshold': {'line': {'color': "red", 'width': 4}, 'thickness': 0.75, 'value': 90}
-        }
-    ))
-    fig8.update_layout(**base_layout, height=400)
-    
-    # Chart 9: PayPal Reasons
-    reasons = []
-    for r in filtered_df['PayPal_Reason'].dropna():
-        if r and r != '':
-            reasons.append(r)
-    
-    if reasons:
-        reas_df = pd.Series(reasons).value_counts().reset_index()
-        reas_df.columns = ['Reason', 'Count']
-        
-        fig9 = px.bar(reas_df, y='Reason', x='Count',
-                      title='<b>💡 Why Users Choose PayPal</b>',
-                      orientation='h',
-                      color='Count',
-                      color_continuous_scale='Blues',
-                      text='Count')
-        fig9.update_layout(**base_layout)
-        fig9.update_traces(textposition='outside', textfont=dict(size=15, weight='bold', color=colors['text']),
-                          hovertemplate='<b>%{y}</b><br>Count: %{x}<extra></extra>')
-        fig9.update_xaxes(title_font=dict(size=16), tickfont=dict(size=14))
-        fig9.update_yaxes(title_font=dict(size=16), tickfont=dict(size=13))
-    else:
-        fig9 = go.Figure()
-        fig9.add_annotation(text="No data available", showarrow=False, font=dict(size=20, color=colors['text']))
-        fig9.update_layout(**base_layout)
-    
-    # Chart 10: Features to Adopt
-    features = []
-    for f in filtered_df['PayPal_Features_to_Adopt'].dropna():
-        if f and f != '':
-            features.extend([x.strip() for x in str(f).split(';')])
+            result = flights.do(key, profiled)
+        figure_cache.put(key, result)
+    return result
+
+
+filter_inputs = [Input('platform-filter', 'value'),
+                 Input('frequency-filter', 'value'),
+                 Input('dataset-filter', 'value'),
+                 Input({'type': 'dimension-filter', 'dimension': ALL}, 'value')]
+
+
+def extra_filters(values):
+    """Extra filter spec from the dimension dropdown values, which arrive in layout order."""
+    return dict(zip(EXTRA_DIMENSIONS, values or ()))
+
+
+# Callback
+@callback(
+    [Output(chart_id, 'figure') for chart_id in foreground_charts] +
+    [Output('filter-info', 'children')],
+    filter_inputs,
+    prevent_initial_call=snapshot_mode
+)
+def update_charts(platform, freq, dataset, dimension_values=None):
+    filters = extra_filters(dimension_values)
     
-    if features:
-        feat_df = pd.Series(features).value_counts().reset_index()
-        feat_df.columns = ['Feature', 'Count']
-        feat_df = feat_df[feat_df['Count'] > 0]
-        
-        fig10 = px.treemap(feat_df, path=['Feature'], values='Count',
-                           title='<b>🚀 Features to Adopt from PayPal</b>',
-                           color='Count',
-                           color_continuous_scale='Viridis')
-        fig10.update_layout(**base_layout)
-        fig10.update_traces(textinfo='label+value', 
-                           textfont=dict(size=14, weight='bold', color='#FFFFFF'),
-                           hovertemplate='<b>%{label}</b><br>Count: %{value}<extra></extra>')
+    def compute():
+        view = open_view(platform, freq, dataset, filters)
+        return [*chart_figures(view, foreground_charts), filter_summary(view)]
+    return coalesced('update_charts', foreground_charts + ['filter-info'], platform, freq, dataset, filters, compute)
+
+
+def background_callback_manager():
+    try:
+        import diskcache
+    except ImportError:
+        raise RuntimeError("DASHBOARD_BACKGROUND_CHARTS requires diskcache "
+                           "(pip install \"dash[diskcache]\")") from None
+    return dash.DiskcacheManager(diskcache.Cache(os.environ.get('DASHBOARD_JOB_CACHE', '.dash-jobs')))
+
+
+if background_charts:
+    @callback(
+        [Output(chart_id, 'figure') for chart_id in background_charts],
+        filter_inputs,
+        background=True,
+        manager=background_callback_manager(),
+        prevent_initial_call=snapshot_mode
+    )
+    def update_background_charts(platform, freq, dataset, dimension_values=None):
+        filters = extra_filters(dimension_values)
+        return coalesced('update_background_charts', background_charts, platform, freq, dataset, filters,
+                         lambda: chart_figures(open_view(platform, freq, dataset, filters), background_charts))
+
+
+def filter_combinations():
+    """Every (platform-filter, frequency-filter) value pair the dropdowns offer."""
+    return [(p, f) for p in ['ALL'] + WALLETS for f in ['ALL'] + frequency_order]
+
+
+def warm_cache(dataset=None):
+    """Run every filter combination through the chart callbacks, filling the figure cache.
+
+    Returns the seconds taken.
+    """
+    name = registry.get(dataset).name
+    start = time.perf_counter()
+    for platform, freq in filter_combinations():
+        update_charts(platform, freq, name)
+        if background_charts:
+            update_background_charts(platform, freq, name)
+    elapsed = time.perf_counter() - start
+    logger.info("Warmed %d filter combinations for %s in %.2fs", len(filter_combinations()), name, elapsed)
+    return elapsed
+
+
+def start_warming(dataset):
+    # Results for the replaced version of this dataset can never be hit again
+    figure_cache.discard(lambda key: key[3] == dataset.name and key[4] != dataset.version)
+    threading.Thread(target=warm_cache, args=(dataset.name,), name=f'warm-{dataset.name}', daemon=True).start()
+
+
+# After a deploy or a data refresh, every filter combination is computed in
+# the background so the first users of each one hit a warm cache. Set
+# DASHBOARD_WARM=0 to turn this off (e.g. in processes that fork workers
+# after import, which should not inherit a half-finished warm-up).
+if os.environ.get('DASHBOARD_WARM', '1') != '0':
+    registry.listeners.append(start_warming)
+    start_warming(registry.get())
+
+
+# Extra filter choices follow the selected dataset
+@callback(
+    Output({'type': 'dimension-filter', 'dimension': ALL}, 'options'),
+    Input('dataset-filter', 'value'),
+    prevent_initial_call=True
+)
+def update_filter_options(dataset):
+    return extra_filter_options(dataset)
+
+
+# KPI cards follow the selected dataset
+@callback(
+    [Output(kpi_id, 'children') for kpi_id in kpis],
+    Input('dataset-filter', 'value'),
+    prevent_initial_call=True
+)
+def update_kpis(dataset):
+    return list(kpi_values(registry.get(dataset)).values())
+
+
+# Drill-down: remember the last clicked chart element...
+@callback(
+    [Output('drilldown-selection', 'data'),
+     Output('drilldown-table', 'page_current')],
+    [Input('platform-usage-chart', 'clickData'),
+     Input('frequency-chart', 'clickData'),
+     Input('heatmap-chart', 'clickData')],
+    prevent_initial_call=True
+)
+def select_drilldown(platform_click, freq_click, heatmap_click):
+    trigger = dash.ctx.triggered_id
+    if trigger == 'platform-usage-chart' and platform_click:
+        value = platform_click['points'][0]['x']
+        selection = {'column': 'Platforms_Used', 'value': value, 'label': f"Uses {value}"}
+    elif trigger == 'frequency-chart' and freq_click:
+        value = freq_click['points'][0]['x']
+        selection = {'column': 'Usage_Frequency', 'value': value, 'label': f"Frequency: {value}"}
+    elif trigger == 'heatmap-chart' and heatmap_click:
+        point = heatmap_click['points'][0]
+        selection = {'column': 'Primary_Wallet', 'value': point['y'],
+                     'label': f"{point['y']} · {point['x']}"}
     else:
-        fig10 = go.Figure()
-        fig10.add_annotation(text="No data available", showarrow=False, font=dict(size=20, color=colors['text']))
-        fig10.update_layout(**base_layout)
-    
-    return fig1, fig2, fig3, fig4, fig5, fig6, fig7, fig8, fig9, fig10, filter_info
+        return dash.no_update, dash.no_update
+    return selection, 0
+
+
+def drilldown_mask(index, spec, selection):
+    # The clicked element narrows the filters, even on a dimension they already constrain
+    return index.mask(spec) & index.mask({selection['column']: [selection['value']]})
+
+
+# ...and serve one page of it under the active filters
+@callback(
+    [Output('drilldown-table', 'data'),
+     Output('drilldown-table', 'page_count'),
+     Output('drilldown-title', 'children')],
+    [Input('drilldown-selection', 'data'),
+     Input('platform-filter', 'value'),
+     Input('frequency-filter', 'value'),
+     Input('dataset-filter', 'value'),
+     Input({'type': 'dimension-filter', 'dimension': ALL}, 'value'),
+     Input('drilldown-table', 'page_current'),
+     State('drilldown-table', 'page_size')],
+    prevent_initial_call=True
+)
+def update_drilldown(selection, platform, freq, dataset, dimension_values, page_current, page_size):
+    if not selection:
+        return dash.no_update, dash.no_update, dash.no_update
+    if artifact_mode:
+        return [], 1, f"{selection['label']} — responses are not available in artifact mode"
+    data = registry.get(dataset)
+    store = response_store(data)
+    mask = drilldown_mask(filter_index(data), filter_spec(platform, freq, extra_filters(dimension_values)), selection)
+    matches = store.count(mask)
+    page_count = max(1, -(-matches // page_size))
+    page = min(page_current or 0, page_count - 1)
+    rows = [record.as_dict() for record in store.page(mask, page, page_size)]
+    return rows, page_count, f"{selection['label']} — {matches} matching responses"
+
+
+# Live mode: one process-wide watcher publishes update events; each page
+# opens a single event stream and hands the events to apply_live_update
+if live_mode:
+    live_feed = LiveFeed()
+    watch(registry, live_feed, float(os.environ.get('DASHBOARD_LIVE_INTERVAL', '1')))
+
+    def live_updates():
+        return server.response_class(live_feed.stream(request.headers.get('Last-Event-ID')),
+                                     mimetype='text/event-stream',
+                                     headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+    server.add_url_rule(LIVE_PATH, 'live_updates', live_updates)
+
+app.clientside_callback(
+    """
+    function(url) {
+        if (url && !window.dashboardLive) {
+            window.dashboardLive = new EventSource(url);
+            window.dashboardLive.addEventListener('update', function(e) {
+                dash_clientside.set_props('live-event', {data: JSON.parse(e.data)});
+            });
+        }
+        return dash_clientside.no_update;
+    }
+    """,
+    Output('live-event', 'data'),
+    Input('live-source', 'data')
+)
+
+
+def figure_patch(figure):
+    """Patch replacing a figure's traces and layout, except the template the page already has."""
+    if not isinstance(figure, dict):
+        figure = figure.to_plotly_json()
+    patch = dash.Patch()
+    patch['data'] = figure['data']
+    layout = figure.get('layout', {})
+    for key, value in layout.items():
+        if key != 'template':
+            patch['layout'][key] = value
+    # Message figures (e.g. "No data available") carry annotations that must not linger
+    patch['layout']['annotations'] = layout.get('annotations', [])
+    return patch
+
+
+@callback(
+    [Output(chart_id, 'figure', allow_duplicate=True) for chart_id in foreground_charts] +
+    [Output('filter-info', 'children', allow_duplicate=True)] +
+    [Output(kpi_id, 'children', allow_duplicate=True) for kpi_id in kpis],
+    Input('live-event', 'data'),
+    [State('platform-filter', 'value'),
+     State('frequency-filter', 'value'),
+     State('dataset-filter', 'value'),
+     State({'type': 'dimension-filter', 'dimension': ALL}, 'value')],
+    prevent_initial_call=True
+)
+def apply_live_update(event, platform, freq, dataset, dimension_values=None):
+    """Bring the page up to date after an update event; background charts catch up on the next filter change."""
+    data = registry.get(dataset)
+    if not event or event.get('dataset') != data.name:
+        return [dash.no_update] * (len(foreground_charts) + 1 + len(kpis))
+    kpi_children = list(kpi_values(data).values())
+    rows = event.get('rows')
+    patch = rows is not None
+    if rows is not None:
+        mask = filter_index(data).mask(filter_spec(platform, freq, extra_filters(dimension_values)))
+        start, stop = rows
+        if not mask[start:stop].any():
+            # None of the new responses pass this page's filters
+            return [dash.no_update] * (len(foreground_charts) + 1) + kpi_children
+        # Pages that showed no responses before have placeholder figures: replace them whole
+        patch = bool(mask[:start].any())
+    # Shares the figure cache with update_charts, which the warm-up fills for the new version
+    *figures, info = update_charts(platform, freq, dataset, dimension_values)
+    if patch:
+        figures = [figure_patch(figure) for figure in figures]
+    return [*figures, info, *kpi_children]
+
+
+# The page is rebuilt when the default dataset's version changes, so new
+# visitors never get the KPIs (or snapshot figures) of a replaced version
+current_layout = [None, None]
+layout_lock = threading.Lock()
+
+
+def serve_layout():
+    """The page for the current version of the default dataset, built once per version."""
+    data = registry.get()
+    with layout_lock:
+        version, layout = current_layout
+        if version != data.version:
+            layout = copy.deepcopy(page)
+            for kpi_id, value in kpi_values(data).items():
+                layout[kpi_id].children = value
+            if snapshot_mode:
+                *figures, filter_info = update_all('ALL', 'ALL', data.name)
+                for chart_id, fig in zip(chart_ids, figures):
+                    # Plain dicts serialize faster than Figure objects on every layout request
+                    layout[chart_id].figure = fig.to_dict()
+                layout['filter-info'].children = filter_info
+            current_layout[:] = data.version, layout
+        return layout
+
+
+serve_layout()
+app.layout = serve_layout
 
 
 if __name__ == '__main__':
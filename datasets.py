@@ -0,0 +1,176 @@
+"""Survey dataset registry shared by the dashboards.
+
+Several survey files (waves, regions) can be configured at once through
+``DASHBOARD_DATASETS``, a list of paths separated by ``os.pathsep``,
+optionally written as ``name=path``; CSV exports, directories of CSV
+shards and SQLite response stores (see storage.py) can be mixed. Each source is loaded the first time
+it is requested and its aggregates are built lazily on first use; warm
+datasets are kept until the registry's memory budget
+(``DASHBOARD_DATASET_BUDGET_MB``) forces the least recently used ones out,
+or until their source changes.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from storage import open_backend
+
+DEFAULT_PATH = 'User Perception of Digital Payment Platforms .csv'
+
+
+def dataset_name(path):
+    return os.path.splitext(os.path.basename(os.path.normpath(path)))[0].strip()
+
+
+def configured_sources(spec=None):
+    """Map of dataset name -> source path, in configuration order."""
+    spec = os.environ.get('DASHBOARD_DATASETS', '') if spec is None else spec
+    sources = OrderedDict()
+    for entry in filter(None, (e.strip() for e in spec.split(os.pathsep))):
+        name, sep, path = entry.partition('=')
+        if not sep:
+            name, path = dataset_name(entry), entry
+        sources[name.strip()] = path.strip()
+    if not sources:
+        sources[dataset_name(DEFAULT_PATH)] = DEFAULT_PATH
+    return sources
+
+
+def nbytes(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(nbytes(v) for v in value)
+    if hasattr(value, 'nbytes'):
+        return value.nbytes() if callable(value.nbytes) else int(value.nbytes)
+    return 0
+
+
+class Dataset:
+    """One loaded survey source plus the aggregates built from it."""
+
+    def __init__(self, name, backend):
+        self.name = name
+        self.backend = backend
+        self.path = backend.path
+        # Read the version first so a write racing the load forces a reload
+        self.version = backend.version()
+        self.df = backend.load()
+        self.aggregates = {}
+        # Sizes are measured once when a value is stored; the frame and
+        # aggregates are never mutated afterwards
+        self.column_nbytes = self.df.memory_usage(index=True, deep=True)
+        self.aggregate_nbytes = {}
+        self._nbytes = int(self.column_nbytes.sum())
+        self._lock = threading.Lock()
+
+    def aggregate(self, key, builder):
+        """Return aggregate ``key``, building it from the dataframe on first use."""
+        try:
+            return self.aggregates[key]
+        except KeyError:
+            pass
+        with self._lock:
+            if key not in self.aggregates:
+                value = builder(self.df)
+                self.aggregate_nbytes[key] = nbytes(value)
+                self._nbytes += self.aggregate_nbytes[key]
+                self.aggregates[key] = value
+            return self.aggregates[key]
+
+    def nbytes(self):
+        return self._nbytes
+
+    def memory_report(self):
+        """Bytes held per dataframe column (plus its index) and per aggregate."""
+        return {'rows': len(self.df), 'bytes': self._nbytes,
+                'columns': {str(column): int(size) for column, size in self.column_nbytes.items()},
+                'aggregates': dict(self.aggregate_nbytes)}
+
+
+class DatasetRegistry:
+    def __init__(self, sources=None, memory_budget=None):
+        self.sources = OrderedDict(configured_sources() if sources is None else sources)
+        if memory_budget is None:
+            memory_budget = int(float(os.environ.get('DASHBOARD_DATASET_BUDGET_MB', '512')) * 2 ** 20)
+        self.memory_budget = memory_budget
+        self._warm = OrderedDict()
+        self._backends = {}
+        self._lock = threading.RLock()
+        # Called with each Dataset after it is (re)loaded from its source
+        self.listeners = []
+
+    @property
+    def default(self):
+        return next(iter(self.sources))
+
+    def names(self):
+        return list(self.sources)
+
+    def register(self, name, path):
+        with self._lock:
+            self.sources[name] = path
+            self._warm.pop(name, None)
+            self._backends.pop(name, None)
+
+    def backend(self, name):
+        with self._lock:
+            if name not in self._backends:
+                self._backends[name] = open_backend(self.sources[name])
+            return self._backends[name]
+
+    def is_warm(self, name):
+        return name in self._warm
+
+    def get(self, name=None):
+        name = self.default if name is None else name
+        with self._lock:
+            dataset = self._warm.get(name)
+            if dataset is not None and dataset.version != dataset.backend.version():
+                # The source changed underneath us: reload it
+                del self._warm[name]
+                dataset = None
+            if dataset is not None:
+                self._warm.move_to_end(name)
+                # Aggregates built since the last lookup may have grown the warm set
+                self.evict(keep=name)
+                return dataset
+            if name not in self.sources:
+                raise KeyError(f"Unknown dataset: {name}")
+            dataset = Dataset(name, self.backend(name))
+            self._warm[name] = dataset
+            self.evict(keep=name)
+            for listener in self.listeners:
+                listener(dataset)
+            return dataset
+
+    def version(self):
+        """Combined version of every configured source; changes when any of them does."""
+        return '|'.join(f'{name}={self.backend(name).version()}' for name in self.names())
+
+    def nbytes(self):
+        return sum(d.nbytes() for d in self._warm.values())
+
+    def memory_report(self):
+        """Bytes held by the warm datasets, against the memory budget."""
+        with self._lock:
+            return {'budget': self.memory_budget, 'bytes': self.nbytes(),
+                    'datasets': {name: d.memory_report() for name, d in self._warm.items()}}
+
+    def evict(self, keep=None):
+        """Drop least recently used datasets until the warm set fits the budget."""
+        with self._lock:
+            while self.nbytes() > self.memory_budget:
+                cold = next((n for n in self._warm if n != keep), None)
+                if cold is None:
+                    break
+                del self._warm[cold]
@@ -0,0 +1,173 @@
+"""Duplicate-submission index for survey responses.
+
+A response is a repeat when an earlier one has the same Username and
+Timestamp, or the same answer vector (every column except the
+Timestamp, so two named respondents never collapse into one). Both keys
+are reduced to 64-bit fingerprints and kept in open-addressing tables of
+uint64 slots: about 16 bytes per response, O(1) per incremental append,
+and vectorized for whole exports.
+"""
+import numpy as np
+import pandas as pd
+
+from schema import COLUMNS
+
+IDENTITY_COLUMNS = ['Username', 'Timestamp']
+ANSWER_COLUMNS = [c for c in COLUMNS if c != 'Timestamp']
+
+EMPTY = np.uint64(0)
+MAX_LOAD = 0.5
+
+
+def hash_rows(df, columns):
+    # Hash every column as object dtype, so a record hashes the same whether
+    # it came from a CSV parse, SQLite or a single-row frame (where an empty
+    # answer would otherwise make a float column); NaN and None hash alike
+    parts = {column: df[column].to_numpy(dtype=object) for column in columns}
+    return pd.util.hash_pandas_object(pd.DataFrame(parts, copy=False), index=False).to_numpy()
+
+
+def fingerprints(df):
+    """(identity, answers) uint64 fingerprints per row; identity is 0 for anonymous rows."""
+    # Fingerprint 0 marks an empty slot, so real fingerprints are made odd
+    identity = np.where(df['Username'].notna().to_numpy(), hash_rows(df, IDENTITY_COLUMNS) | np.uint64(1), EMPTY)
+    answers = hash_rows(df, ANSWER_COLUMNS) | np.uint64(1)
+    return identity, answers
+
+
+class FingerprintSet:
+    """Open-addressing hash set of non-zero uint64 fingerprints."""
+
+    def __init__(self, capacity=1024):
+        size = 1
+        while size < capacity / MAX_LOAD:
+            size *= 2
+        self.slots = np.zeros(size, dtype=np.uint64)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self):
+        return self.slots.nbytes
+
+    def _home(self, fps):
+        # Mix the high bits in: the low bit of every fingerprint is forced to 1
+        return ((fps >> np.uint64(17)) ^ fps) & np.uint64(len(self.slots) - 1)
+
+    def __contains__(self, fp):
+        fp = np.uint64(fp)
+        mask = len(self.slots) - 1
+        slot = int(self._home(fp))
+        while True:
+            value = self.slots[slot]
+            if value == fp:
+                return True
+            if value == EMPTY:
+                return False
+            slot = (slot + 1) & mask
+
+    def add(self, fp):
+        """Insert one fingerprint; returns False if it was already present."""
+        fp = np.uint64(fp)
+        if (self.size + 1) > MAX_LOAD * len(self.slots):
+            self._grow()
+        mask = len(self.slots) - 1
+        slot = int(self._home(fp))
+        while True:
+            value = self.slots[slot]
+            if value == fp:
+                return False
+            if value == EMPTY:
+                self.slots[slot] = fp
+                self.size += 1
+                return True
+            slot = (slot + 1) & mask
+
+    def contains_many(self, fps):
+        fps = np.asarray(fps, dtype=np.uint64)
+        found = np.zeros(len(fps), dtype=bool)
+        pending = np.arange(len(fps))
+        slot = self._home(fps)
+        mask = np.uint64(len(self.slots) - 1)
+        # Probe all keys in lockstep until each hits itself or an empty slot
+        while len(pending):
+            values = self.slots[slot]
+            found[pending[values == fps[pending]]] = True
+            keep = (values != fps[pending]) & (values != EMPTY)
+            pending, slot = pending[keep], (slot[keep] + np.uint64(1)) & mask
+        return found
+
+    def add_many(self, fps):
+        """Insert fingerprints in bulk; returns a mask of those that were new.
+
+        Repeats within ``fps`` count as new only at their first occurrence.
+        """
+        fps = np.asarray(fps, dtype=np.uint64)
+        first = ~pd.Series(fps).duplicated().to_numpy()
+        new = first & ~self.contains_many(fps)
+        keys = fps[new]
+        while (self.size + len(keys)) > MAX_LOAD * len(self.slots):
+            self._grow()
+        self._insert_unique(keys)
+        return new
+
+    def _insert_unique(self, keys):
+        mask = np.uint64(len(self.slots) - 1)
+        slot = self._home(keys)
+        while len(keys):
+            free = self.slots[slot] == EMPTY
+            # Several keys may race for one free slot: the first one wins
+            _, winners = np.unique(slot[free], return_index=True)
+            won = np.flatnonzero(free)[winners]
+            self.slots[slot[won]] = keys[won]
+            self.size += len(won)
+            lost = np.ones(len(keys), dtype=bool)
+            lost[won] = False
+            keys, slot = keys[lost], slot[lost]
+            slot = np.where(self.slots[slot] == EMPTY, slot, (slot + np.uint64(1)) & mask)
+
+    def _grow(self):
+        keys = self.slots[self.slots != EMPTY]
+        self.slots = np.zeros(len(self.slots) * 2, dtype=np.uint64)
+        self.size = 0
+        self._insert_unique(keys)
+
+
+class DedupIndex:
+    def __init__(self, capacity=1024):
+        self.identity = FingerprintSet(capacity)
+        self.answers = FingerprintSet(capacity)
+
+    @property
+    def nbytes(self):
+        return self.identity.nbytes + self.answers.nbytes
+
+    def admit_frame(self, df):
+        """Register a batch of responses; returns the mask of rows that are not repeats."""
+        return self.admit_fingerprints(*fingerprints(df))
+
+    def admit_fingerprints(self, identity, answers):
+        """``admit_frame`` for rows already reduced to their ``fingerprints``."""
+        named = identity != EMPTY
+        new_identity = np.ones(len(identity), dtype=bool)
+        new_identity[named] = self.identity.add_many(identity[named])
+        return new_identity & self.answers.add_many(answers)
+
+    def admit(self, record):
+        """Register one response (column -> answer mapping); False if it repeats an earlier one."""
+        identity, answers = fingerprints(pd.DataFrame([record], columns=COLUMNS))
+        new_identity = identity[0] == EMPTY or self.identity.add(identity[0])
+        # Always register the answers, even for an identity repeat
+        new_answers = self.answers.add(answers[0])
+        return bool(new_identity and new_answers)
+
+
+def dedupe(df, index=None):
+    """Drop repeated submissions from ``df``; returns (unique rows, number dropped)."""
+    index = DedupIndex(len(df)) if index is None else index
+    keep = index.admit_frame(df)
+    if keep.all():
+        return df, 0
+    return df[keep].reset_index(drop=True), int((~keep).sum())
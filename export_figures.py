@@ -0,0 +1,85 @@
+"""Offline batch export of the dashboard figures.
+
+Renders every (platform, frequency) filter combination through
+``update_all`` and writes each chart to an image file, without a browser
+or a running Dash server:
+
+    python export_figures.py --out reports/nightly --format png --workers 8
+
+The survey and its aggregates are loaded once in the parent process; the
+worker pool is forked from it so every worker reuses them instead of
+re-reading the CSV. Static formats need ``kaleido``.
+"""
+import argparse
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# The pool forks from this process; it must not be warming caches when it does
+os.environ.setdefault('DASHBOARD_WARM', '0')
+
+import dashboard_enhanced as dashboard  # noqa: E402
+
+IMAGE_FORMATS = ['png', 'pdf', 'svg', 'jpeg', 'webp']
+
+
+def combination_dir(out_dir, platform, freq):
+    return os.path.join(out_dir, platform, freq.replace(' ', '_'))
+
+
+def render_combination(platform, freq, out_dir, fmt, width, height, scale, dataset=None):
+    target = combination_dir(out_dir, platform, freq)
+    os.makedirs(target, exist_ok=True)
+
+    figures = dashboard.update_all(platform, freq, dataset)[:len(dashboard.chart_ids)]
+    paths = []
+    for chart_id, fig in zip(dashboard.chart_ids, figures):
+        path = os.path.join(target, f'{chart_id}.{fmt}')
+        if fmt == 'html':
+            fig.write_html(path, include_plotlyjs='cdn')
+        else:
+            # The live app draws on a transparent card; give files a solid background
+            fig.update_layout(paper_bgcolor=dashboard.colors['background'])
+            fig.write_image(path, format=fmt, width=width, height=height, scale=scale)
+        paths.append(path)
+    return paths
+
+
+def export_all(out_dir, fmt='png', workers=None, width=1200, height=700, scale=1, dataset=None):
+    """Render all filter combinations to ``out_dir`` and return the written paths."""
+    if fmt in IMAGE_FORMATS:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            raise RuntimeError(f"Exporting {fmt} requires kaleido (pip install kaleido)") from None
+
+    combos = dashboard.filter_combinations()
+    # Warm the dataset, then fork so workers inherit the parsed dataframe and aggregates
+    dashboard.registry.get(dataset)
+    ctx = mp.get_context('fork') if 'fork' in mp.get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        futures = [pool.submit(render_combination, p, f, out_dir, fmt, width, height, scale, dataset)
+                   for p, f in combos]
+        return [path for future in futures for path in future.result()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export every dashboard chart for every filter combination.")
+    parser.add_argument('--out', default='exports', help="output directory (default: exports)")
+    parser.add_argument('--format', default='png', choices=IMAGE_FORMATS + ['html'])
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--width', type=int, default=1200)
+    parser.add_argument('--height', type=int, default=700)
+    parser.add_argument('--scale', type=float, default=1)
+    parser.add_argument('--dataset', default=None, help="dataset name from DASHBOARD_DATASETS (default: first)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    paths = export_all(args.out, args.format, args.workers, args.width, args.height, args.scale, args.dataset)
+    print(f"Wrote {len(paths)} files for {len(dashboard.filter_combinations())} filter combinations "
+          f"to {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
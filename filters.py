@@ -0,0 +1,159 @@
+"""Multi-select filter engine over per-value bitmaps.
+
+A filter spec maps survey dimensions (columns) to the answers to keep,
+e.g. ``{'Primary_Wallet': ['JazzCash'], 'Satisfaction': ['Satisfied',
+'Very satisfied']}``: a respondent matches when, for every dimension in
+the spec, they gave one of its listed answers (OR within a dimension, AND
+across dimensions).
+
+``FilterIndex`` precomputes, for every answer of every dimension, a
+bitmap of the respondents who gave it, packed 64 rows to a word. A spec
+then costs one OR per listed answer and one AND per dimension over
+n / 64 words, with no pass over the raw columns. The platform columns
+filter on canonical platform names (see canonical.py), and the
+multi-select questions (``PayPal_Features_to_Adopt``, ``Not_Switch_Reason``)
+on the individual items named in each answer.
+
+``RowView`` is what the charts read the matching rows through, without
+copying the frame.
+"""
+import numpy as np
+import pandas as pd
+
+from canonical import PLATFORM_COLUMNS, PLATFORMS, encode_platform_columns, membership
+
+# Single-choice dimensions: a respondent matches on their exact answer
+CHOICE_DIMENSIONS = ['Usage_Frequency', 'Most_Reliable', 'Best_Issue_Handler', 'Satisfaction',
+                     'Data_Protection_Confidence', 'Most_Trusted_Security', 'Most_Innovative', 'Ease_of_Use',
+                     'Adapts_Quickly', 'Would_Recommend', 'Prefer_PayPal', 'PayPal_Reason',
+                     'Should_Adopt_PayPal_Practices']
+# Multi-select dimensions: a respondent matches on any of the ';'-separated items they named
+MULTI_DIMENSIONS = ['PayPal_Features_to_Adopt', 'Not_Switch_Reason']
+
+DIMENSIONS = PLATFORM_COLUMNS + CHOICE_DIMENSIONS + MULTI_DIMENSIONS
+# The dashboards' main platform and frequency filters; the rest are offered as extra filters
+MAIN_DIMENSIONS = ['Primary_Wallet', 'Usage_Frequency']
+EXTRA_DIMENSIONS = [dim for dim in DIMENSIONS if dim not in MAIN_DIMENSIONS]
+
+
+def pack(mask):
+    """Pack a boolean row mask into little-endian uint64 words."""
+    bits = np.packbits(mask, bitorder='little')
+    words = np.zeros(-(-len(bits) // 8) * 8, dtype=np.uint8)
+    words[:len(bits)] = bits
+    return words.view(np.uint64)
+
+
+def normalize_spec(spec):
+    """Hashable, order-independent form of a spec; dimensions with no answers are dropped."""
+    return tuple(sorted((dim, tuple(sorted(map(str, values)))) for dim, values in (spec or {}).items() if values))
+
+
+def dimension_label(dimension):
+    return dimension.replace('_', ' ')
+
+
+class FilterIndex:
+    """Per-answer bitmaps of every filter dimension of one dataset."""
+
+    def __init__(self, df, platform_masks=None):
+        self.n = len(df)
+        if platform_masks is None:
+            platform_masks = encode_platform_columns(df)
+        # Answers per dimension, most common first
+        self.options = {}
+        self.bitmaps = {}
+        for dim in PLATFORM_COLUMNS:
+            member = membership(platform_masks[dim])
+            order = np.argsort(-member.sum(axis=0), kind='stable')
+            self.add(dim, {PLATFORMS[i]: member[:, i] for i in order if member[:, i].any()})
+        for dim in CHOICE_DIMENSIONS:
+            codes, answers = pd.factorize(df[dim])
+            counts = np.bincount(codes[codes >= 0], minlength=len(answers))
+            order = np.argsort(-counts, kind='stable')
+            self.add(dim, {str(answers[i]): codes == i for i in order})
+        for dim in MULTI_DIMENSIONS:
+            codes, answers = pd.factorize(df[dim])
+            items = {}
+            for i, answer in enumerate(answers):
+                for item in filter(None, (part.strip() for part in str(answer).split(';'))):
+                    items.setdefault(item, []).append(i)
+            masks = {item: np.isin(codes, ids) for item, ids in items.items()}
+            self.add(dim, dict(sorted(masks.items(), key=lambda kv: -kv[1].sum())))
+        self.all_rows = pack(np.ones(self.n, dtype=bool))
+        self.no_rows = np.zeros_like(self.all_rows)
+
+    def add(self, dim, masks):
+        self.options[dim] = list(masks)
+        self.bitmaps[dim] = {value: pack(mask) for value, mask in masks.items()}
+
+    @property
+    def nbytes(self):
+        return sum(words.nbytes for bitmaps in self.bitmaps.values() for words in bitmaps.values())
+
+    def words(self, spec):
+        """Packed match bitmap of a spec (a mapping or its ``normalize_spec`` form)."""
+        result = self.all_rows
+        for dim, values in (spec.items() if isinstance(spec, dict) else spec):
+            if not values:
+                continue
+            try:
+                bitmaps = self.bitmaps[dim]
+            except KeyError:
+                raise ValueError(f"Unknown filter dimension: {dim}") from None
+            # Answers that never occur in this dataset match nobody
+            any_of = self.no_rows
+            for value in values:
+                any_of = any_of | bitmaps.get(str(value), self.no_rows)
+            result = result & any_of
+        return result
+
+    def mask(self, spec):
+        return np.unpackbits(self.words(spec).view(np.uint8), count=self.n, bitorder='little').view(bool)
+
+    def positions(self, spec):
+        return np.flatnonzero(self.mask(spec))
+
+    def view(self, df, spec):
+        """RowView of the rows of ``df`` (the indexed frame) matching ``spec``."""
+        return RowView(df, self.positions(spec) if normalize_spec(spec) else None)
+
+
+class RowView:
+    """Read-only view of the rows of a frame at ``positions`` (None: every row).
+
+    Nothing is copied up front: a column is sliced to the matching rows the
+    first time it is read, and an unfiltered view hands out the frame's own
+    columns. Callers must not modify what they get.
+    """
+
+    def __init__(self, df, positions=None):
+        self.df = df
+        self.positions = positions
+        self._columns = {}
+
+    def __len__(self):
+        return len(self.df) if self.positions is None else len(self.positions)
+
+    @property
+    def rows(self):
+        """Indexer selecting the view's rows from arrays aligned with the frame."""
+        return slice(None) if self.positions is None else self.positions
+
+    def column(self, name):
+        try:
+            return self._columns[name]
+        except KeyError:
+            pass
+        series = self.df[name]
+        if self.positions is not None:
+            series = series.iloc[self.positions]
+        self._columns[name] = series
+        return series
+
+    def value_counts(self, name):
+        return self.column(name).value_counts()
+
+    def count_in(self, name, values):
+        """Number of rows whose ``name`` answer is one of ``values``."""
+        return int(self.column(name).isin(values).sum())
@@ -0,0 +1,138 @@
+"""Push updates to connected dashboards when new responses arrive.
+
+One ``watch`` thread per process polls the versions of the warm datasets
+(one small query on SQLite stores, see storage.py) and, when one changes,
+reloads it and publishes a small event to a ``LiveFeed`` naming the new
+version and the range of rows that were appended, e.g.
+
+    {"dataset": "responses", "version": "sqlite-70", "responses": 70, "rows": [68, 70]}
+
+Sources that are not append-only (CSV exports, which may be rewritten)
+publish ``"rows": null`` instead: everything may have changed. Browsers
+receive the events over server-sent events, replaying what they missed
+after a reconnect (``Last-Event-ID``), so nothing is polled per client.
+The event only tells a page that it is stale and which rows are new; the
+page then recomputes its charts through the shared figure cache.
+"""
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT = 15
+
+
+def appended_rows(old, new):
+    """(start, stop) of the rows ``new`` appended to ``old``, or None when it is not a pure append."""
+    if not getattr(new.backend, 'append_only', False) or len(new.df) < len(old.df):
+        return None
+    return len(old.df), len(new.df)
+
+
+def update_event(old, new):
+    """The event announcing that ``old`` was replaced by ``new``."""
+    rows = appended_rows(old, new)
+    return {'dataset': new.name, 'version': new.version, 'responses': len(new.df),
+            'rows': None if rows is None else list(rows)}
+
+
+class LiveFeed:
+    """Fan-out of events to subscribed streams, keeping the last ``history`` for replay."""
+
+    def __init__(self, history=256, backlog=64):
+        self.backlog = backlog
+        self.history = deque(maxlen=history)
+        self.last_id = 0
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def publish(self, event):
+        data = json.dumps(event, separators=(',', ':'))
+        with self._lock:
+            self.last_id += 1
+            self.history.append((self.last_id, data))
+            for q in list(self._subscribers):
+                try:
+                    q.put_nowait((self.last_id, data))
+                except queue.Full:
+                    # A stalled client is dropped; it replays what it missed when it reconnects
+                    self._subscribers.discard(q)
+                    with q.mutex:
+                        q.queue.clear()
+                    q.put_nowait((None, None))
+        return self.last_id
+
+    def subscribe(self, last_id=None):
+        q = queue.Queue(self.backlog + len(self.history))
+        with self._lock:
+            if last_id is not None:
+                for event_id, data in self.history:
+                    if event_id > last_id:
+                        q.put_nowait((event_id, data))
+            self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def stream(self, last_event_id=None, heartbeat=HEARTBEAT):
+        """Server-sent events text for one client, until it disconnects."""
+        try:
+            last_id = int(last_event_id) if last_event_id else None
+        except ValueError:
+            last_id = None
+        q = self.subscribe(last_id)
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    event_id, data = q.get(timeout=heartbeat)
+                except queue.Empty:
+                    # Comments keep proxies from closing an idle connection
+                    yield ': keep-alive\n\n'
+                    continue
+                if event_id is None:
+                    return
+                yield f'id: {event_id}\nevent: update\ndata: {data}\n\n'
+        finally:
+            self.unsubscribe(q)
+
+
+def watch(registry, feed, interval=1.0):
+    """Start a daemon thread publishing an update event whenever a warm dataset's source changes."""
+    seen = {}
+
+    def check():
+        for name in registry.names():
+            if not registry.is_warm(name):
+                # Evicted: let its frame go
+                seen.pop(name, None)
+                continue
+            old = seen.get(name)
+            if old is not None and old.version == old.backend.version():
+                continue
+            # Reloads the dataset, unless a request already has
+            new = registry.get(name)
+            seen[name] = new
+            if old is not None and old.version != new.version:
+                feed.publish(update_event(old, new))
+
+    def run():
+        while True:
+            try:
+                check()
+            except Exception:
+                logger.exception("Live update check failed")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name='live-watch', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,253 @@
+"""Offline aggregates pipeline: precompute what the Dash app shows, then serve only that.
+
+A nightly job reads the configured survey sources (``DASHBOARD_DATASETS``:
+CSV exports, shard directories or SQLite stores, see datasets.py) and
+writes one gzipped JSON artifact:
+
+    DASHBOARD_DATASETS=exports/ python pipeline.py aggregates.json.gz
+
+For every dataset and every cell of the main filters (platform x usage
+frequency) the artifact holds the answer count tables the charts draw
+(truncated to the ``TOP_K`` most common answers), the segmentation shares
+and score means, the co-usage tallies and the switching model's
+per-segment means, plus the KPI figures. Its ``version`` changes with the
+sources' versions and ``FORMAT`` with its layout.
+
+``DASHBOARD_ARTIFACT=aggregates.json.gz`` then starts dashboard_enhanced
+from the artifact alone (``load_artifact``): no survey row is read, and
+the charts are built from the stored aggregates exactly as from the rows.
+The extra filters and the drill-down table need the rows, so they are
+off in that mode.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from analytics import Selection, headline, registry
+from canonical import CoUsage
+from segmentation import WALLETS
+from validation import ANSWER_SETS
+
+FORMAT = 1
+TOP_K = 25
+
+PLATFORM_CHOICES = ['ALL'] + WALLETS
+FREQUENCY_CHOICES = ['ALL'] + ANSWER_SETS['Usage_Frequency']
+
+# Answer count tables, multi-select item tables and platform tables per cell
+COUNT_COLUMNS = ['Satisfaction', 'Usage_Frequency', 'Most_Trusted_Security', 'Ease_of_Use', 'Prefer_PayPal',
+                 'PayPal_Reason']
+ITEM_COLUMNS = ['PayPal_Features_to_Adopt']
+PLATFORM_COUNT_COLUMNS = ['Platforms_Used']
+
+
+def cell_key(platform, freq):
+    return f'{platform}|{freq}'
+
+
+def count_table(series):
+    return [[str(answer), int(n)] for answer, n in series.head(TOP_K).items()]
+
+
+def count_series(table, name):
+    return pd.Series([n for _, n in table], index=pd.Index([answer for answer, _ in table], name=name, dtype=object),
+                     name='count', dtype='int64')
+
+
+def encode_frame(df):
+    return df.to_dict(orient='split')
+
+
+def decode_frame(split):
+    return pd.DataFrame(split['data'], index=split['index'], columns=split['columns'])
+
+
+def to_builtin(value):
+    # json.dump fallback for NumPy scalars and arrays
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Cannot store {type(value).__name__} in an artifact")
+
+
+def build_cell(selection):
+    if len(selection) == 0:
+        return {'responses': 0}
+    seg = selection.seg
+    switching = selection.switching()
+    return {
+        'responses': len(selection),
+        'counts': {column: count_table(selection.value_counts(column)) for column in COUNT_COLUMNS},
+        'items': {column: count_table(selection.item_counts(column)) for column in ITEM_COLUMNS},
+        'platforms': {column: count_table(selection.platform_counts(column)) for column in PLATFORM_COUNT_COLUMNS},
+        'segments': dict(seg, wallets=encode_frame(seg['wallets'])),
+        'co_usage': selection.co_usage().tallies,
+        'switching': None if switching is None else {
+            'likelihood': encode_frame(switching['likelihood']),
+            'respondents': encode_frame(switching['respondents']),
+            'overall': switching['overall'],
+        },
+    }
+
+
+def build_artifact(names=None):
+    """Aggregates of the named datasets of the analytics registry (default: all of them)."""
+    datasets = OrderedDict()
+    for name in names or registry.names():
+        data = registry.get(name)
+        cells = {}
+        for platform in PLATFORM_CHOICES:
+            for freq in FREQUENCY_CHOICES:
+                spec = {dim: [value] for dim, value in (('Primary_Wallet', platform), ('Usage_Frequency', freq))
+                        if value != 'ALL'}
+                cells[cell_key(platform, freq)] = build_cell(Selection(spec, name))
+        datasets[name] = {'version': data.version, 'headline': headline(data), 'cells': cells}
+    sources = '|'.join(f"{name}={entry['version']}" for name, entry in datasets.items())
+    return {
+        'format': FORMAT,
+        'version': hashlib.sha1(f'{FORMAT}|{sources}'.encode()).hexdigest()[:16],
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'datasets': datasets,
+    }
+
+
+def write_artifact(artifact, path):
+    # Write to a temporary file and rename, so the web tier never reads a partial artifact
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f, gzip.open(f, 'wt', encoding='utf-8') as out:
+        json.dump(artifact, out, default=to_builtin, separators=(',', ':'))
+    os.replace(tmp, path)
+
+
+class ArtifactView:
+    """One filter cell's aggregates, read by the chart builders like an analytics.Selection."""
+
+    def __init__(self, cell, total, platform='ALL', freq='ALL'):
+        self.cell = cell
+        self.total = total
+        self.platform = platform
+        self.freq = freq
+        self.filters = {}
+
+    def __len__(self):
+        return self.cell['responses']
+
+    def table(self, kind, column):
+        try:
+            return count_series(self.cell[kind][column], column)
+        except KeyError:
+            raise KeyError(f"The artifact has no {column} counts") from None
+
+    def value_counts(self, column):
+        return self.table('counts', column)
+
+    def item_counts(self, column):
+        return self.table('items', column)
+
+    def platform_counts(self, column):
+        return self.table('platforms', column)
+
+    @cached_property
+    def seg(self):
+        segments = self.cell['segments']
+        return dict(segments, wallets=decode_frame(segments['wallets']))
+
+    def co_usage(self):
+        co_usage = CoUsage()
+        co_usage.tallies[:] = self.cell['co_usage']
+        return co_usage
+
+    def switching(self):
+        switching = self.cell['switching']
+        if switching is None:
+            return None
+        return {'likelihood': decode_frame(switching['likelihood']),
+                'respondents': decode_frame(switching['respondents']),
+                'overall': switching['overall']}
+
+
+class ArtifactDataset:
+    def __init__(self, name, entry):
+        self.name = name
+        self.version = entry['version']
+        self.headline = entry['headline']
+        self.cells = entry['cells']
+
+    def view(self, platform='ALL', freq='ALL'):
+        cell = self.cells.get(cell_key(platform, freq), {'responses': 0})
+        return ArtifactView(cell, self.headline['responses'], platform, freq)
+
+
+class ArtifactRegistry:
+    """Read-only stand-in for datasets.DatasetRegistry over the datasets of an artifact."""
+
+    def __init__(self, artifact, path=None):
+        if artifact.get('format') != FORMAT:
+            raise ValueError(f"Unsupported aggregates artifact format {artifact.get('format')} "
+                             f"(expected {FORMAT}); rebuild it with python pipeline.py")
+        self.path = path
+        self.artifact_version = artifact['version']
+        self.created = artifact['created']
+        self.datasets = OrderedDict((name, ArtifactDataset(name, entry))
+                                    for name, entry in artifact['datasets'].items())
+        self.listeners = []
+
+    @property
+    def default(self):
+        return next(iter(self.datasets))
+
+    def names(self):
+        return list(self.datasets)
+
+    def is_warm(self, name):
+        return name in self.datasets
+
+    def get(self, name=None):
+        name = self.default if name is None else name
+        try:
+            return self.datasets[name]
+        except KeyError:
+            raise KeyError(f"Unknown dataset: {name}") from None
+
+    def version(self):
+        return self.artifact_version
+
+    def memory_report(self):
+        size = os.path.getsize(self.path) if self.path else None
+        return {'artifact': self.path, 'version': self.artifact_version, 'created': self.created,
+                'bytes_on_disk': size, 'datasets': {name: len(d.cells) for name, d in self.datasets.items()}}
+
+
+def load_artifact(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return ArtifactRegistry(json.load(f), path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the dashboard aggregates of the configured survey "
+                                                 "sources (DASHBOARD_DATASETS) into an artifact.")
+    parser.add_argument('output', nargs='?', default='aggregates.json.gz')
+    parser.add_argument('--dataset', action='append', dest='datasets',
+                        help="only this dataset (repeatable; default: every configured one)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    artifact = build_artifact(args.datasets)
+    write_artifact(artifact, args.output)
+    print(f"Wrote {len(artifact['datasets'])} dataset(s), version {artifact['version']}, to {args.output} "
+          f"({os.path.getsize(args.output)} bytes) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""Opt-in profiling of the dashboards' chart computations on a live worker.
+
+Off unless configured:
+
+* ``DASHBOARD_PROFILE`` -- fraction of computations to profile, e.g.
+  ``0.01`` for one in a hundred (default 0).
+* ``DASHBOARD_PROFILE_TOKEN`` -- when set, a request sending the header
+  ``X-Dashboard-Profile: <token>`` is always profiled (and computed
+  afresh rather than served from the figure cache).
+* ``DASHBOARD_PROFILER`` -- ``sample`` (default) or ``cprofile``.
+* ``DASHBOARD_PROFILE_INTERVAL`` -- sampling interval in milliseconds
+  (default 5).
+* ``DASHBOARD_PROFILE_DIR`` -- output directory (default ``profiles``).
+
+The ``sample`` profiler looks at the profiled thread's stack from a
+background thread every interval, which costs the request almost
+nothing. Samples are aggregated per label and process into
+``<label>.<pid>.folded``: one ``frame;frame;... count`` line per stack, the
+input format of flamegraph.pl and speedscope. The ``cprofile`` profiler
+traces every call instead (slower, exact counts) and writes one
+``<label>.<time>.<pid>.<n>.prof`` per run, for pstats or snakeviz.
+"""
+import cProfile
+import hmac
+import itertools
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-Dashboard-Profile'
+# A sampler gives up on runs that never stop (e.g. a script that raised)
+MAX_SECONDS = 300
+
+
+def frame_name(code):
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+def folded_stack(frame):
+    names = []
+    while frame is not None:
+        names.append(frame_name(frame.f_code))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class Sampler(threading.Thread):
+    """Counts the stacks of one thread, sampled every ``interval`` seconds."""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name='profile-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+
+    def run(self):
+        deadline = time.monotonic() + MAX_SECONDS
+        while not self.stopped.wait(self.interval) and time.monotonic() < deadline:
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            self.stacks[folded_stack(frame)] += 1
+
+
+class Run:
+    """One profiled run; ``stop`` writes its results. Unsampled runs do nothing."""
+
+    def __init__(self, profiler=None, label=None):
+        self.profiler = profiler
+        self.label = label
+        self.start = time.perf_counter()
+        self.collector = None
+        if profiler is None:
+            return
+        if profiler.mode == 'cprofile':
+            self.collector = cProfile.Profile()
+            self.collector.enable()
+        else:
+            self.collector = Sampler(threading.get_ident(), profiler.interval)
+            self.collector.start()
+
+    def stop(self):
+        collector, self.collector = self.collector, None
+        if collector is None:
+            return
+        elapsed = time.perf_counter() - self.start
+        if isinstance(collector, cProfile.Profile):
+            collector.disable()
+            path = self.profiler.write_profile(self.label, collector)
+        else:
+            collector.stopped.set()
+            collector.join()
+            path = self.profiler.add_samples(self.label, collector.stacks)
+        logger.info("Profiled %s in %.1f ms -> %s", self.label, elapsed * 1000, path)
+
+
+class Profiler:
+    def __init__(self, rate=0.0, token=None, mode='sample', interval=0.005, directory='profiles'):
+        if mode not in ('sample', 'cprofile'):
+            raise ValueError(f"Unknown profiler: {mode} (expected sample or cprofile)")
+        self.rate = rate
+        self.token = token
+        self.mode = mode
+        self.interval = interval
+        self.directory = directory
+        self.stacks = {}
+        self.runs = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(rate=float(os.environ.get('DASHBOARD_PROFILE', '0')),
+                   token=os.environ.get('DASHBOARD_PROFILE_TOKEN') or None,
+                   mode=os.environ.get('DASHBOARD_PROFILER', 'sample'),
+                   interval=float(os.environ.get('DASHBOARD_PROFILE_INTERVAL', '5')) / 1000,
+                   directory=os.environ.get('DASHBOARD_PROFILE_DIR', 'profiles'))
+
+    def requested(self, header_value):
+        """Whether a request's ``X-Dashboard-Profile`` header carries the profiling token."""
+        return bool(self.token and header_value and hmac.compare_digest(header_value, self.token))
+
+    def start(self, label, forced=False):
+        """Start profiling the calling thread if this run is forced or sampled."""
+        if forced or (self.rate > 0 and random.random() < self.rate):
+            return Run(self, label)
+        return Run()
+
+    def call(self, label, fn, forced=False):
+        run = self.start(label, forced)
+        try:
+            return fn()
+        finally:
+            run.stop()
+
+    def write_profile(self, label, profile):
+        os.makedirs(self.directory, exist_ok=True)
+        name = f'{label}.{time.strftime("%Y%m%d-%H%M%S")}.{os.getpid()}.{next(self.runs)}.prof'
+        path = os.path.join(self.directory, name)
+        profile.dump_stats(path)
+        return path
+
+    def add_samples(self, label, stacks):
+        with self._lock:
+            totals = self.stacks.setdefault(label, Counter())
+            totals.update(stacks)
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f'{label}.{os.getpid()}.folded')
+            # Rewrite the whole file and rename, so readers never see a partial one
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.writelines(f'{stack} {count}\n' for stack, count in totals.most_common())
+            os.replace(tmp, path)
+        return path
@@ -0,0 +1,133 @@
+"""Predicted likelihood of respondents switching to PayPal.
+
+A logistic regression is fitted to the respondents who answered
+``Prefer_PayPal`` (yes = would switch), on one-hot indicators of their
+integer-coded answers (see segmentation.py) and of the reasons they gave
+for not switching. With a few dozen features, Newton's method converges
+in a handful of small solves. Respondents are collapsed to their distinct
+answer patterns first, so the model trains in milliseconds whatever the
+number of rows, and every pattern is scored at once by a single matrix
+product. Per filter state, ``switching_by_segment``
+averages the stored scores per wallet and NPS segment with one more
+product, like ``segment`` does.
+"""
+import numpy as np
+import pandas as pd
+
+from segmentation import SEGMENTS, WALLETS, code_answers, prot_map, segment_codes
+
+# 1 = would switch, 0 = would not; unanswered rows are not trained on
+switch_map = {'Yes, definitely': 1, 'Yes, probably': 1, 'Not sure': 0, 'Probably not': 0, 'Definitely not': 0}
+frequency_map = {'Rarely': 1, 'Occasionally': 2, 'Several times a week': 3, 'Daily': 4}
+
+LIKERT = [1, 2, 3, 4, 5]
+
+
+def indicators(codes, levels, prefix, names):
+    names.extend(f'{prefix}={level}' for level in levels)
+    # Missing answers (-1) match no level
+    return codes[:, None] == np.asarray(levels)
+
+
+def response_features(df, coded):
+    """Design matrix of one-hot answer indicators (first column: intercept) and its column names."""
+    names = ['intercept']
+    blocks = [np.ones((len(df), 1), dtype=bool),
+              indicators(coded['satisfaction'], LIKERT, 'Satisfaction', names),
+              indicators(coded['protection'], LIKERT, 'Data_Protection_Confidence', names),
+              indicators(coded['ease'], LIKERT, 'Ease_of_Use', names),
+              indicators(coded['recommend'], [0, 1, 2], 'Would_Recommend', names),
+              indicators(code_answers(df['Usage_Frequency'], frequency_map), [1, 2, 3, 4], 'Usage_Frequency', names),
+              indicators(code_answers(df['Should_Adopt_PayPal_Practices'], prot_map), LIKERT,
+                         'Should_Adopt_PayPal_Practices', names)]
+    # Not_Switch_Reason is multi-select: one indicator per reason named
+    codes, answers = pd.factorize(df['Not_Switch_Reason'])
+    items = {}
+    for i, answer in enumerate(answers):
+        for item in filter(None, (part.strip() for part in str(answer).split(';'))):
+            items.setdefault(item, []).append(i)
+    for item, ids in items.items():
+        names.append(f'Not_Switch_Reason={item}')
+        blocks.append(np.isin(codes, ids)[:, None])
+    return np.hstack(blocks), names
+
+
+def distinct_rows(X):
+    """Distinct rows of a boolean matrix, and the index of each row among them."""
+    keys = np.ascontiguousarray(np.packbits(X, axis=1))
+    keys = keys.view(np.dtype((np.void, keys.shape[1]))).ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    return X[first], inverse.ravel()
+
+
+def sigmoid(z):
+    return 1 / (1 + np.exp(-np.clip(z, -30, 30)))
+
+
+class SwitchingModel:
+    """L2-regularized logistic regression fitted by Newton's method.
+
+    ``fit`` takes one row per answer pattern: ``y`` is the fraction of its
+    respondents who would switch and ``weights`` how many there are.
+    """
+
+    def __init__(self, l2=1.0, iterations=25, tol=1e-6):
+        self.l2 = l2
+        self.iterations = iterations
+        self.tol = tol
+        self.weights = None
+
+    def fit(self, X, y, weights=None):
+        X = np.asarray(X, dtype=np.float64)
+        if weights is None:
+            weights = np.ones(len(X))
+        # The intercept is barely penalized, which keeps every solve well posed
+        penalty = np.full(X.shape[1], self.l2)
+        penalty[0] = 1e-6
+        w = np.zeros(X.shape[1])
+        for _ in range(self.iterations):
+            p = sigmoid(X @ w)
+            gradient = X.T @ (weights * (p - y)) + penalty * w
+            hessian = (X * (weights * p * (1 - p))[:, None]).T @ X + np.diag(penalty)
+            step = np.linalg.solve(hessian, gradient)
+            w -= step
+            if np.abs(step).max() < self.tol:
+                break
+        self.weights = w
+        return self
+
+    def predict(self, X):
+        return sigmoid(np.asarray(X, dtype=np.float64) @ self.weights)
+
+
+def score_responses(df, coded):
+    """Switching likelihood (0-1) of every respondent, or None when nobody answered Prefer_PayPal."""
+    labels = code_answers(df['Prefer_PayPal'], switch_map)
+    labeled = labels >= 0
+    if not labeled.any():
+        return None
+    patterns, inverse = distinct_rows(response_features(df, coded)[0])
+    counts = np.bincount(inverse[labeled], minlength=len(patterns))
+    switchers = np.bincount(inverse[labeled], weights=labels[labeled], minlength=len(patterns))
+    trained = counts > 0
+    model = SwitchingModel().fit(patterns[trained], switchers[trained] / counts[trained], counts[trained])
+    return model.predict(patterns)[inverse]
+
+
+def switching_by_segment(scores, coded, rows=None):
+    """Mean predicted switching likelihood (%) per wallet and NPS segment of the selected rows."""
+    if rows is None:
+        rows = slice(None)
+    p = scores[rows]
+    wallets = coded['wallets'][rows].astype(np.float64)
+    segments = (segment_codes(coded['recommend'][rows], coded['satisfaction'][rows])[:, None]
+                == np.arange(len(SEGMENTS))).astype(np.float64)
+    sizes = wallets.T @ segments
+    sums = wallets.T @ (segments * p[:, None])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        likelihood = np.where(sizes > 0, sums / sizes * 100, 0.0)
+    return {
+        'likelihood': pd.DataFrame(likelihood, index=WALLETS, columns=SEGMENTS),
+        'respondents': pd.DataFrame(sizes.astype(int), index=WALLETS, columns=SEGMENTS),
+        'overall': p.mean() * 100 if len(p) else 0,
+    }
@@ -0,0 +1,82 @@
+"""Compact struct-of-arrays store for row-level drill-down.
+
+Each column is dictionary-encoded once into a small integer code array
+plus its list of distinct labels. Rows are selected by a boolean mask (see
+filters.FilterIndex) and a page of results is decoded row by row from the
+codes, so serving a drill-down never materializes a DataFrame slice.
+"""
+import numpy as np
+import pandas as pd
+
+DRILL_COLUMNS = ['Timestamp', 'Platforms_Used', 'Primary_Wallet', 'Usage_Frequency', 'Satisfaction',
+                 'Data_Protection_Confidence', 'Ease_of_Use', 'Would_Recommend']
+
+# Rows of the mask scanned per step while seeking to a page
+SCAN_CHUNK = 8192
+
+
+class ResponseRecord:
+    __slots__ = ('row',) + tuple(DRILL_COLUMNS)
+
+    def __init__(self, row, values):
+        self.row = row
+        for name, value in zip(DRILL_COLUMNS, values):
+            setattr(self, name, value)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in DRILL_COLUMNS}
+
+
+def encode_column(values):
+    codes, labels = pd.factorize(values, use_na_sentinel=True)
+    dtype = np.int8 if len(labels) < 127 else np.int16 if len(labels) < 32767 else np.int32
+    return codes.astype(dtype), [str(label) for label in labels]
+
+
+class ResponseStore:
+    __slots__ = ('n', 'codes', 'labels')
+
+    def __init__(self, df):
+        self.n = len(df)
+        self.codes = {}
+        self.labels = {}
+        for name in DRILL_COLUMNS:
+            self.codes[name], self.labels[name] = encode_column(df[name])
+
+    def nbytes(self):
+        return (sum(codes.nbytes for codes in self.codes.values()) +
+                sum(len(label) for labels in self.labels.values() for label in labels))
+
+    def count(self, mask):
+        return int(np.count_nonzero(mask))
+
+    def page_rows(self, mask, page, page_size):
+        """Row indices of page ``page`` of the rows selected by ``mask``.
+
+        The mask is scanned in fixed-size chunks, so only the current chunk
+        and the requested page are ever held as index arrays.
+        """
+        skip = page * page_size
+        rows = []
+        for start in range(0, self.n, SCAN_CHUNK):
+            chunk = mask[start:start + SCAN_CHUNK]
+            hits = int(np.count_nonzero(chunk))
+            if skip >= hits:
+                skip -= hits
+                continue
+            idx = np.flatnonzero(chunk)[skip:skip + page_size - len(rows)] + start
+            rows.extend(idx.tolist())
+            skip = 0
+            if len(rows) == page_size:
+                break
+        return rows
+
+    def record(self, row):
+        values = []
+        for name, codes in self.codes.items():
+            code = codes[row]
+            values.append(self.labels[name][code] if code >= 0 else '')
+        return ResponseRecord(row, values)
+
+    def page(self, mask, page=0, page_size=20):
+        return [self.record(row) for row in self.page_rows(mask, page, page_size)]
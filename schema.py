@@ -0,0 +1,55 @@
+"""Survey export schema: column names and timestamp parsing."""
+import re
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['Timestamp', 'Username', 'Platforms_Used', 'Primary_Wallet', 'Usage_Frequency',
+           'Most_Reliable', 'Best_Issue_Handler', 'Satisfaction', 'Data_Protection_Confidence',
+           'Most_Trusted_Security', 'Most_Innovative', 'Ease_of_Use', 'Adapts_Quickly',
+           'Would_Recommend', 'Prefer_PayPal', 'PayPal_Reason', 'Not_Switch_Reason',
+           'PayPal_Features_to_Adopt', 'Should_Adopt_PayPal_Practices']
+
+# Form exports stamp responses like "2025/12/16 12:21:39 PM GMT+5"
+TIMESTAMP_FORMAT = '%Y/%m/%d %I:%M:%S %p'
+TIMESTAMP_ZONE = re.compile(r'\s*GMT([+-]\d{1,2})(?::?(\d{2}))?$')
+
+
+def zone_offset(hours, minutes):
+    hours = int(hours)
+    minutes = int(minutes or 0)
+    return pd.Timedelta(minutes=hours * 60 + (-minutes if hours < 0 else minutes))
+
+
+def parse_timestamps(values):
+    """Parse form timestamps to UTC; unparseable values become NaT.
+
+    Exports stamp nearly every row with the same zone, so the first row's
+    zone is parsed in one ``to_datetime`` call with the zone as a literal.
+    The rows it does not parse are grouped by their own zone suffix and
+    parsed one group at a time. Unzoned timestamps are taken as UTC.
+    """
+    text = pd.Series(values, dtype=object)
+    present = np.flatnonzero(text.notna().to_numpy())
+    strings = text.iloc[present].astype(str)
+    utc = np.full(len(text), np.datetime64('NaT'), dtype='datetime64[ns]')
+
+    def parse(rows, zone):
+        # Returns which of ``rows`` parsed in ``zone`` ('' for unzoned)
+        if zone:
+            fmt = TIMESTAMP_FORMAT + zone.replace('%', '%%')
+            offset = zone_offset(*TIMESTAMP_ZONE.search(zone).groups())
+        else:
+            fmt, offset = TIMESTAMP_FORMAT, pd.Timedelta(0)
+        local = pd.to_datetime(strings.iloc[rows], format=fmt, errors='coerce')
+        utc[present[rows]] = (local - offset).to_numpy()
+        return local.notna().to_numpy()
+
+    rows = np.arange(len(strings))
+    if len(rows):
+        first = TIMESTAMP_ZONE.search(strings.iloc[0])
+        rows = rows[~parse(rows, first.group(0) if first else '')]
+    zones = strings.iloc[rows].str.extract(f'({TIMESTAMP_ZONE.pattern})')[0].fillna('')
+    for zone, group in zones.groupby(zones, sort=False).indices.items():
+        parse(rows[group], zone)
+    return pd.Series(utc, index=text.index).dt.tz_localize('UTC')
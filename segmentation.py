@@ -0,0 +1,109 @@
+"""NPS-style segmentation of survey respondents.
+
+Answers are coded to small integers once (``code_responses``) and every
+segment share and per-wallet score is then produced by ``segment`` in a
+single matrix product over those arrays, so the charts never rescan the
+raw text columns.
+"""
+import numpy as np
+import pandas as pd
+
+from canonical import encode_platforms, membership
+
+WALLETS = ['Easypaisa', 'JazzCash', 'NayaPay']
+SEGMENTS = ['Promoter', 'Passive', 'Detractor']
+
+sat_map = {'Very dissatisfied': 1, 'Dissatisfied': 2, 'Neutral': 3, 'Satisfied': 4, 'Very satisfied': 5}
+prot_map = {'Strongly disagree': 1, 'Disagree': 2, 'Neutral': 3, 'Agree': 4, 'Strongly agree': 5}
+ease_map = {'Very difficult to use': 1, 'Difficult to use': 2, 'Average': 3, 'Easy to use': 4, 'Very easy to use': 5}
+
+# 2 = would recommend, 1 = undecided, 0 = would not recommend
+recommend_map = {'Definitely': 2, 'Yes': 2, 'Probably': 1, 'Maybe': 1, 'Not sure': 1,
+                 'Probably not': 0, 'No': 0, 'Definitely not': 0}
+
+SCORES = ['Satisfaction', 'Security Trust', 'Ease of Use']
+
+
+def code_answers(values, mapping):
+    # Missing or unknown answers are coded as -1
+    return pd.Series(values).map(mapping).fillna(-1).to_numpy(np.int8)
+
+
+def code_responses(df):
+    """Integer-code the columns the segmentation reads.
+
+    ``wallets`` is an (n, len(WALLETS)) membership matrix over the canonical
+    platform IDs; a respondent whose primary wallet lists several platforms
+    belongs to each of them, like the dashboard's platform filter.
+    """
+    return {
+        'recommend': code_answers(df['Would_Recommend'], recommend_map),
+        'satisfaction': code_answers(df['Satisfaction'], sat_map),
+        'protection': code_answers(df['Data_Protection_Confidence'], prot_map),
+        'ease': code_answers(df['Ease_of_Use'], ease_map),
+        'wallets': membership(encode_platforms(df['Primary_Wallet']), WALLETS),
+    }
+
+
+def segment_codes(recommend, satisfaction):
+    # Promoters recommend and are satisfied; detractors either would not
+    # recommend or are dissatisfied; everyone else is passive.
+    seg = np.ones(len(recommend), dtype=np.int8)
+    seg[(recommend == 2) & (satisfaction >= 4)] = 0
+    seg[(recommend == 0) | ((satisfaction >= 0) & (satisfaction <= 2))] = 2
+    return seg
+
+
+def segment(coded, rows=None):
+    """Segment shares and mean scores, overall and per wallet.
+
+    ``rows`` selects respondents (positional indices or a boolean mask);
+    None means everyone. All groups are aggregated by one matrix product
+    of the group membership matrix against the stacked indicator/score
+    columns.
+    """
+    if rows is None:
+        rows = slice(None)
+    recommend = coded['recommend'][rows]
+    satisfaction = coded['satisfaction'][rows]
+    scores = np.column_stack([satisfaction, coded['protection'][rows], coded['ease'][rows]])
+    n = len(recommend)
+
+    seg = segment_codes(recommend, satisfaction)
+    present = scores > 0
+    columns = np.hstack([
+        seg[:, None] == np.arange(len(SEGMENTS)),
+        (recommend == 2)[:, None],
+        (satisfaction >= 4)[:, None],
+        np.where(present, scores, 0),
+        present,
+    ]).astype(np.float64)
+    # Column 0 of the group matrix is "everyone", the rest are wallets
+    groups = np.column_stack([np.ones(n, dtype=bool), coded['wallets'][rows]]).astype(np.float64)
+    sums = groups.T @ columns
+
+    sizes = groups.sum(axis=0)
+    k = len(SEGMENTS)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shares = np.where(sizes[:, None] > 0, sums[:, :k] / sizes[:, None] * 100, 0.0)
+        means = sums[:, k + 2:k + 2 + len(SCORES)] / sums[:, k + 2 + len(SCORES):]
+    means = np.nan_to_num(means)
+    nps = shares[:, 0] - shares[:, 2]
+
+    wallets = pd.DataFrame(shares[1:], index=WALLETS, columns=SEGMENTS)
+    wallets.insert(0, 'Respondents', sizes[1:].astype(int))
+    wallets['NPS'] = nps[1:]
+    for i, name in enumerate(SCORES):
+        wallets[name] = means[1:, i]
+
+    total = int(sizes[0])
+    return {
+        'total': total,
+        'counts': dict(zip(SEGMENTS, sums[0, :k].astype(int))),
+        'shares': dict(zip(SEGMENTS, shares[0])),
+        'nps': nps[0],
+        'recommend_rate': sums[0, k] / total * 100 if total else 0,
+        'satisfaction_rate': sums[0, k + 1] / total * 100 if total else 0,
+        'scores': dict(zip(SCORES, means[0])),
+        'wallets': wallets,
+    }
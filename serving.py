@@ -0,0 +1,142 @@
+"""HTTP compression and revalidation for the Dash server.
+
+``install`` adds two hooks to the Flask app behind Dash:
+
+* Responses worth compressing (JSON callback payloads, the layout, JS and
+  CSS bundles) are sent brotli- or gzip-encoded, whichever the client
+  accepts; brotli needs the optional ``brotli`` package. Set
+  ``DASHBOARD_COMPRESS=0`` when a proxy in front already compresses.
+* Every callback is a pure function of its inputs and the survey data, so
+  a callback response gets an ETag derived from the data version and the
+  request body. A request that presents that ETag in ``If-None-Match`` is
+  answered ``304 Not Modified`` before the callback runs. GET responses
+  such as ``/_dash-layout`` get a content ETag and the usual conditional
+  handling. Both are sent with ``Cache-Control: no-cache``, so clients
+  and proxies revalidate instead of serving stale figures after a reload.
+  Background-callback polls (``cacheKey``/``job`` in the query string)
+  repeat the same body while the job progresses, so they are never
+  revalidated.
+* Assets whose URL changes with their content (Dash's ``?m=`` stamp, or a
+  content hash in the file name, see vendor_assets.py) are cached for a
+  year.
+"""
+import gzip
+import hashlib
+import os
+import re
+
+from flask import request
+
+from vendor_assets import HASHED_NAME
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = {'application/json', 'application/javascript', 'text/javascript', 'text/css',
+                      'text/html', 'text/plain', 'image/svg+xml'}
+MIN_COMPRESS_SIZE = 500
+
+CALLBACK_PATH = '/_dash-update-component'
+# Query parameters Dash adds when polling a background callback
+POLL_ARGS = ('cacheKey', 'job')
+
+ONE_YEAR = 365 * 24 * 3600
+hashed_name = re.compile(HASHED_NAME)
+
+
+def accepted_encoding(header):
+    accepted = {part.split(';')[0].strip().lower() for part in header.split(',')}
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def encode(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6)
+
+
+def compress_response(response):
+    if response.status_code != 200 or 'Content-Encoding' in response.headers:
+        return response
+    if response.mimetype not in COMPRESSIBLE_TYPES:
+        return response
+    encoding = accepted_encoding(request.headers.get('Accept-Encoding', ''))
+    if encoding is None:
+        return response
+    # Files are passed through by default; they are small enough to read
+    response.direct_passthrough = False
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return response
+    response.set_data(encode(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def callback_etag(data_version):
+    digest = hashlib.sha1(data_version.encode())
+    digest.update(request.get_data())
+    return digest.hexdigest()
+
+
+def immutable_asset(path, assets_path):
+    return path.startswith(assets_path) and ('m' in request.args or bool(hashed_name.search(path)))
+
+
+def install(server, data_version, compress=None, assets_path='/assets/'):
+    """Add compression, revalidation and asset caching to ``server``.
+
+    ``data_version`` is a callable returning a string that changes
+    whenever the data behind the callbacks does.
+    """
+    if compress is None:
+        compress = os.environ.get('DASHBOARD_COMPRESS', '1') != '0'
+
+    @server.before_request
+    def revalidate_callback():
+        if request.method != 'POST' or request.path != CALLBACK_PATH:
+            return None
+        if any(arg in request.args for arg in POLL_ARGS):
+            # The answer depends on the job's progress, not just the body
+            return None
+        request.environ['dashboard.etag'] = tag = callback_etag(data_version())
+        if request.if_none_match.contains_weak(tag):
+            response = server.response_class(status=304)
+            response.set_etag(tag, weak=True)
+            response.cache_control.no_cache = True
+            return response
+        return None
+
+    @server.after_request
+    def add_validators(response):
+        tag = request.environ.get('dashboard.etag')
+        if immutable_asset(request.path, assets_path):
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = ONE_YEAR
+            response.cache_control.immutable = True
+        elif tag is not None:
+            if response.status_code == 200:
+                response.set_etag(tag, weak=True)
+                response.cache_control.no_cache = True
+        elif response.is_streamed:
+            # Event streams and other generators must not be buffered
+            pass
+        elif request.method in ('GET', 'HEAD') and response.status_code == 200 and not response.cache_control.max_age:
+            if not response.headers.get('ETag'):
+                response.direct_passthrough = False
+                response.add_etag(weak=True)
+                response.cache_control.no_cache = True
+            response.make_conditional(request)
+        if compress:
+            response = compress_response(response)
+        return response
+
+    return server
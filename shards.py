@@ -0,0 +1,100 @@
+"""Parallel loading of survey exports split into many CSV shards.
+
+A sharded source is a directory of ``.csv`` files or a glob pattern
+(e.g. ``exports/2025-12-*.csv``); shards are read in sorted path order.
+Each shard is parsed, validated and quarantined (see validation.py) in a
+worker process, which also hashes its rows' duplicate-submission
+fingerprints (see dedup.py) and sends back every column encoded as
+integer codes plus its distinct answers rather than as millions of
+Python strings, so little more than the codes crosses the process
+boundary. The parent dedupes across shards on the fingerprints alone,
+remaps each shard's codes onto the union of answers and decodes the
+merged columns with one ``take`` each. Refresh time then scales down
+with the number of cores (``DASHBOARD_LOAD_WORKERS``, default: all of
+them).
+"""
+import glob
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from dedup import DedupIndex, fingerprints
+from schema import COLUMNS
+from validation import ValidationReport, check_export, log_report
+
+
+def is_sharded(path):
+    return os.path.isdir(path) or any(c in path for c in '*?[')
+
+
+def shard_paths(path):
+    """The CSV shards of a directory or glob pattern, in sorted order."""
+    pattern = os.path.join(path, '*.csv') if os.path.isdir(path) else path
+    # Skip the quarantine side files validation writes next to each shard
+    return sorted(p for p in glob.glob(pattern) if not p.endswith('.rejected.csv'))
+
+
+def shards_version(paths):
+    st = [os.stat(p) for p in paths]
+    key = '|'.join(f'{p}:{s.st_mtime_ns}-{s.st_size}' for p, s in zip(paths, st))
+    return f'shards-{len(paths)}-{hashlib.sha1(key.encode()).hexdigest()[:16]}'
+
+
+def encode_columns(df):
+    """Column -> (codes, distinct values); missing answers are coded -1."""
+    encoded = {}
+    for column in df.columns:
+        codes, uniques = pd.factorize(df[column])
+        encoded[column] = (codes.astype(np.int32), np.asarray(uniques, dtype=object))
+    return encoded
+
+
+def parse_shard(path):
+    """Worker: validated, encoded columns of one shard, their fingerprints and the validation report."""
+    df, report = check_export(path)
+    return encode_columns(df), fingerprints(df), report
+
+
+def merge_column(parts, keep):
+    """Decode the ``keep`` rows of one column from its per-shard (codes, distinct values)."""
+    uniques = pd.Index(pd.unique(np.concatenate([values for _, values in parts])), dtype=object)
+    codes = []
+    for shard_codes, values in parts:
+        # The appended -1 maps missing answers (code -1) to themselves
+        remap = np.append(uniques.get_indexer(values), -1).astype(np.int32)
+        codes.append(remap[shard_codes])
+    lookup = np.append(uniques.to_numpy(), np.nan)
+    return pd.Series(lookup[np.concatenate(codes)[keep]]).infer_objects()
+
+
+def load_shards(path, workers=None):
+    """Parse, validate and merge the shards of ``path``; returns (frame, report)."""
+    paths = shard_paths(path)
+    if not paths:
+        raise FileNotFoundError(f"No CSV shards found at {path}")
+    if workers is None:
+        workers = int(os.environ.get('DASHBOARD_LOAD_WORKERS', '0')) or os.cpu_count() or 1
+    workers = min(workers, len(paths))
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(parse_shard, paths))
+    else:
+        results = [parse_shard(p) for p in paths]
+
+    report = ValidationReport(path, 0)
+    for _, _, shard_report in results:
+        report.total += shard_report.total
+        report.reasons.update(shard_report.reasons)
+        report.quarantine_paths.extend(shard_report.quarantine_paths)
+    identity = np.concatenate([fps[0] for _, fps, _ in results])
+    answers = np.concatenate([fps[1] for _, fps, _ in results])
+    keep = DedupIndex(len(answers)).admit_fingerprints(identity, answers)
+    if not keep.all():
+        report.reasons['duplicate submission'] = int((~keep).sum())
+    log_report(report)
+    df = pd.DataFrame({column: merge_column([encoded[column] for encoded, _, _ in results], keep)
+                       for column in COLUMNS})
+    return df, report
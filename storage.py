@@ -0,0 +1,262 @@
+"""Storage backends for survey responses.
+
+``CsvBackend`` reads a form export as-is, ``ShardedCsvBackend`` a
+directory or glob of export shards in parallel (see shards.py).
+``SQLiteBackend`` keeps the
+responses in a local SQLite file with indexes on ``Primary_Wallet``,
+``Usage_Frequency`` and the submission time, so the dashboard can push its
+filters and grouped counts down into SQL and a new response is a single
+indexed INSERT, after an O(1) check against the duplicate-submission
+index. Import an export once with:
+
+    python storage.py survey.csv responses.db
+
+(or ``python storage.py exports/ responses.db`` for a directory of shards).
+"""
+import argparse
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from canonical import PLATFORM_IDS, TokenTable
+from dedup import DedupIndex
+from schema import COLUMNS, parse_timestamps
+from shards import is_sharded, load_shards, shard_paths, shards_version
+from validation import load_validated, rejection_reasons
+
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+
+
+def load_survey(path):
+    if is_sharded(path):
+        return load_shards(path)[0]
+    return load_validated(path)[0]
+
+
+def file_version(path):
+    st = os.stat(path)
+    return f'{st.st_mtime_ns}-{st.st_size}'
+
+
+class CsvBackend:
+    supports_pushdown = False
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        return load_survey(self.path)
+
+    def version(self):
+        return file_version(self.path)
+
+
+class ShardedCsvBackend(CsvBackend):
+    def load(self):
+        return load_shards(self.path)[0]
+
+    def version(self):
+        # Adding, removing or rewriting a shard changes the version
+        return shards_version(shard_paths(self.path))
+
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SQLiteBackend:
+    supports_pushdown = True
+    # Rows are only ever appended, in id order (see live.py)
+    append_only = True
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._dedup = None
+        # Responses up to this id are in the dedup index
+        self._dedup_last_id = 0
+        self._dedup_lock = threading.Lock()
+        # (last id, platform -> stored Primary_Wallet answers naming it)
+        self._wallets = (None, {})
+        self.create_schema()
+
+    def connect(self):
+        # sqlite3 connections may not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path)
+        return conn
+
+    def create_schema(self):
+        conn = self.connect()
+        columns = ', '.join(f'{quote(c)} TEXT' for c in COLUMNS)
+        with conn:
+            conn.execute(f'CREATE TABLE IF NOT EXISTS responses '
+                         f'(id INTEGER PRIMARY KEY, Submitted_At TEXT, {columns})')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_wallet ON responses (Primary_Wallet)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_frequency ON responses (Usage_Frequency)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_submitted_at ON responses (Submitted_At)')
+
+    def rows_for_insert(self, df):
+        submitted = parse_timestamps(df['Timestamp']).dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+        values = df[COLUMNS].astype(object).where(df[COLUMNS].notna(), None)
+        values.insert(0, 'Submitted_At', submitted.where(submitted.notna(), None).to_numpy())
+        return values.itertuples(index=False, name=None)
+
+    def insert_sql(self):
+        names = ', '.join(quote(c) for c in ['Submitted_At'] + COLUMNS)
+        marks = ', '.join('?' * (len(COLUMNS) + 1))
+        return f'INSERT INTO responses ({names}) VALUES ({marks})'
+
+    def dedup_index(self, conn):
+        """Fingerprints of the stored responses, built by one scan on first use.
+
+        Responses other processes stored since the last call (e.g. the
+        importer next to an ingest process) are admitted first. Call it
+        holding the write lock (see ``inserting``), so nothing can be stored
+        between this catch-up and the caller's insert.
+        """
+        last, = conn.execute('SELECT max(id) FROM responses').fetchone()
+        last = last or 0
+        if self._dedup is None or last > self._dedup_last_id:
+            names = ', '.join(quote(c) for c in COLUMNS)
+            stored = pd.read_sql_query(f'SELECT {names} FROM responses WHERE id > ? AND id <= ? ORDER BY id',
+                                       conn, params=(self._dedup_last_id, last))
+            if self._dedup is None:
+                self._dedup = DedupIndex(max(len(stored), 1024))
+            self._dedup.admit_frame(stored)
+            self._dedup_last_id = last
+        return self._dedup
+
+    @contextmanager
+    def inserting(self):
+        """Write transaction yielding (connection, up-to-date dedup index); hold ``_dedup_lock``.
+
+        The caller admits its rows to the index, then inserts them. If the
+        insert or the commit fails, the rows are rolled back but their
+        fingerprints stay admitted, so the index is dropped and rebuilt
+        from the table on the next call.
+        """
+        conn = self.connect()
+        admitting = False
+        try:
+            with conn:
+                conn.execute('BEGIN IMMEDIATE')
+                index = self.dedup_index(conn)
+                admitting = True
+                yield conn, index
+                last, = conn.execute('SELECT max(id) FROM responses').fetchone()
+        except BaseException:
+            if admitting:
+                self._dedup, self._dedup_last_id = None, 0
+            raise
+        # Our own rows were admitted before they were inserted
+        self._dedup_last_id = last or 0
+
+    def import_frame(self, df):
+        """Store a batch of responses, skipping repeats; returns how many were stored."""
+        with self._dedup_lock, self.inserting() as (conn, index):
+            df = df[index.admit_frame(df)]
+            conn.executemany(self.insert_sql(), self.rows_for_insert(df))
+        return len(df)
+
+    def append(self, record):
+        """Store one response (a mapping of column -> answer).
+
+        Returns False, without writing, when it repeats a stored response.
+        """
+        frame = pd.DataFrame([record], columns=COLUMNS)
+        reasons = rejection_reasons(frame)
+        if reasons[0] is not None:
+            raise ValueError(f"Rejected response: {reasons[0]}")
+        row = next(self.rows_for_insert(frame))
+        with self._dedup_lock, self.inserting() as (conn, index):
+            if not index.admit(record):
+                return False
+            conn.execute(self.insert_sql(), row)
+        return True
+
+    def load(self):
+        names = ', '.join(quote(c) for c in COLUMNS)
+        df = pd.read_sql_query(f'SELECT {names} FROM responses ORDER BY id', self.connect())
+        # NULLs arrive as None; make them NaN like the CSV loader (fillna would downcast)
+        return df.where(df.notna(), np.nan)
+
+    def version(self):
+        # Responses are append-only, so the newest id identifies the contents
+        # (max(id) is read off the primary key; count(*) would scan the table)
+        last, = self.connect().execute('SELECT max(id) FROM responses').fetchone()
+        return f'sqlite-{last or 0}'
+
+    def wallets(self, platform, last_id):
+        """Distinct Primary_Wallet answers naming ``platform`` among the responses up to ``last_id``."""
+        upto, cached = self._wallets
+        if upto != last_id:
+            upto, cached = last_id, {}
+            self._wallets = (upto, cached)
+        if platform not in cached:
+            table, bit = TokenTable(), 1 << PLATFORM_IDS[platform]
+            answers = self.connect().execute('SELECT DISTINCT Primary_Wallet FROM responses '
+                                             'WHERE Primary_Wallet IS NOT NULL AND id <= ?', (last_id,))
+            cached[platform] = [w for (w,) in answers if table.answer_mask(w) & bit]
+        return cached[platform]
+
+    def where(self, last_id, platform='ALL', freq='ALL'):
+        # Responses appended after the frame was loaded are not in it
+        clauses, params = ['id <= ?'], [last_id]
+        if platform != 'ALL':
+            # Canonicalize the handful of distinct answers once per version,
+            # then filter through the index with IN (...)
+            wallets = self.wallets(platform, last_id)
+            clauses.append(f"Primary_Wallet IN ({', '.join('?' * len(wallets))})" if wallets else '0')
+            params.extend(wallets)
+        if freq != 'ALL':
+            clauses.append('Usage_Frequency = ?')
+            params.append(freq)
+        return ' WHERE ' + ' AND '.join(clauses), params
+
+    def row_positions(self, last_id, platform='ALL', freq='ALL'):
+        """Positions (in ``load`` order) of the responses up to ``last_id`` matching the filters.
+
+        ids are dense from 1 because the table is append-only, so a loaded
+        frame of n rows holds ids 1..n.
+        """
+        clause, params = self.where(last_id, platform, freq)
+        ids = self.connect().execute(f'SELECT id FROM responses{clause} ORDER BY id', params).fetchall()
+        return np.fromiter((i for (i,) in ids), dtype=np.int64, count=len(ids)) - 1
+
+    def grouped_counts(self, column, last_id, platform='ALL', freq='ALL'):
+        """``value_counts`` of ``column`` over the filtered responses up to ``last_id``, computed in SQL."""
+        clause, params = self.where(last_id, platform, freq)
+        col = quote(column)
+        rows = self.connect().execute(f'SELECT {col}, count(*) AS n FROM responses{clause} AND {col} IS NOT NULL '
+                                      f'GROUP BY {col} ORDER BY n DESC, min(id)', params).fetchall()
+        return pd.Series([n for _, n in rows], index=pd.Index([v for v, _ in rows], name=column),
+                         name='count', dtype='int64')
+
+
+def open_backend(path):
+    if path.lower().endswith(SQLITE_SUFFIXES):
+        return SQLiteBackend(path)
+    if is_sharded(path):
+        return ShardedCsvBackend(path)
+    return CsvBackend(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a survey CSV export into a SQLite response store.")
+    parser.add_argument('csv')
+    parser.add_argument('database')
+    args = parser.parse_args()
+
+    df = load_survey(args.csv)
+    stored = SQLiteBackend(args.database).import_frame(df)
+    print(f"Imported {stored} of {len(df)} responses into {args.database}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,38 @@
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
-import pandas as pd
+
+from analytics import Selection, filter_index, headline, registry
+from filters import EXTRA_DIMENSIONS, dimension_label
+from profiling import PROFILE_HEADER, Profiler
+from vendor_assets import inline_font_css, use_local_assets, vendored
 
 # Page config
 st.set_page_config(page_title="Digital Payment Analytics", layout="wide", page_icon="💳")
 
+# Opt-in profiling of script runs (DASHBOARD_PROFILE, see profiling.py); the
+# profiler outlives reruns so its flamegraph data keeps accumulating
+@st.cache_resource
+def profiler():
+    return Profiler.from_env()
+
+# Request headers are only exposed by newer Streamlit releases
+headers = getattr(getattr(st, 'context', None), 'headers', {})
+profile_run = profiler().start('streamlit', profiler().requested(headers.get(PROFILE_HEADER)))
+
+# Inter comes from Google Fonts, or is inlined from assets/vendor once it has
+# been bundled (python vendor_assets.py, DASHBOARD_ASSETS)
+@st.cache_resource
+def font_css():
+    if use_local_assets():
+        return inline_font_css(vendored()['inter'])
+    return "@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');"
+
+st.markdown(f"<style>{font_css()}</style>", unsafe_allow_html=True)
+
 # Premium Dark Theme with Glassmorphism
 st.markdown("""
 <style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
-    
     .stApp {
         background: linear-gradient(135deg, #0A0E27 0%, #1a1f3a 100%);
         font-family: 'Inter', sans-serif;
@@ -87,18 +109,16 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Load data
-@st.cache_data
-def load_data():
-    df = pd.read_csv('User Perception of Digital Payment Platforms .csv')
-    df.columns = ['Timestamp', 'Username', 'Platforms_Used', 'Primary_Wallet', 'Usage_Frequency', 
-                  'Most_Reliable', 'Best_Issue_Handler', 'Satisfaction', 'Data_Protection_Confidence',
-                  'Most_Trusted_Security', 'Most_Innovative', 'Ease_of_Use', 'Adapts_Quickly',
-                  'Would_Recommend', 'Prefer_PayPal', 'PayPal_Reason', 'Not_Switch_Reason',
-                  'PayPal_Features_to_Adopt', 'Should_Adopt_PayPal_Practices']
-    return df
-
-df = load_data()
+# Data comes from the analytics core shared with the Dash app: each configured
+# survey file is loaded once per process, reloaded when it changes, and
+# shared by every session, so the frame must never be modified.
+if len(registry.names()) > 1:
+    selected_dataset = st.selectbox("Survey Dataset", registry.names())
+else:
+    selected_dataset = registry.default
+data = registry.get(selected_dataset)
+df = data.df
+index = filter_index(data)
 
 # Title
 st.markdown("<h1>💳 Digital Payment Platforms Dashboard</h1>", unsafe_allow_html=True)
@@ -133,233 +153,263 @@ st.markdown("""
 
 st.markdown("<br>", unsafe_allow_html=True)
 
-# Filters
+# Filters: any of the selected answers within a question, all of the questions
 col1, col2 = st.columns(2)
 with col1:
-    platforms = ['All'] + list(df['Primary_Wallet'].unique())
-    selected_platform = st.selectbox("Filter by Platform", platforms)
+    selected_platforms = st.multiselect("Filter by Platform", index.options['Primary_Wallet'],
+                                        placeholder="All platforms")
 with col2:
-    frequencies = ['All'] + list(df['Usage_Frequency'].unique())
-    selected_frequency = st.selectbox("Filter by Usage Frequency", frequencies)
+    selected_frequencies = st.multiselect("Filter by Usage Frequency", index.options['Usage_Frequency'],
+                                          placeholder="All frequencies")
+with st.expander("More filters"):
+    filter_cols = st.columns(3)
+    spec = {dim: filter_cols[i % 3].multiselect(dimension_label(dim), index.options[dim], placeholder="All")
+            for i, dim in enumerate(EXTRA_DIMENSIONS)}
+spec.update(Primary_Wallet=selected_platforms, Usage_Frequency=selected_frequencies)
 
 # Apply filters
-filtered_df = df.copy()
-if selected_platform != 'All':
-    filtered_df = filtered_df[filtered_df['Primary_Wallet'] == selected_platform]
-if selected_frequency != 'All':
-    filtered_df = filtered_df[filtered_df['Usage_Frequency'] == selected_frequency]
+selection = Selection(spec, selected_dataset)
+if len(selection) == 0:
+    st.warning("⚠️ No responses match the selected filters")
+    profile_run.stop()
+    st.stop()
 
 # KPIs
 col1, col2, col3, col4 = st.columns(4)
 with col1:
-    st.metric("Total Responses", len(filtered_df))
+    st.metric("Total Responses", len(selection))
 with col2:
-    st.metric("Platforms", df['Primary_Wallet'].nunique())
+    st.metric("Platforms", headline(data)['platforms'])
 with col3:
-    satisfied = len(filtered_df[filtered_df['Satisfaction'].isin(['Satisfied', 'Very satisfied'])])
-    st.metric("Satisfaction Rate", f"{satisfied/len(filtered_df)*100:.1f}%")
+    satisfied = selection.count_in('Satisfaction', ['Satisfied', 'Very satisfied'])
+    st.metric("Satisfaction Rate", f"{satisfied/len(selection)*100:.1f}%")
 with col4:
-    daily = len(filtered_df[filtered_df['Usage_Frequency'] == 'Daily'])
+    daily = selection.count_in('Usage_Frequency', ['Daily'])
     st.metric("Daily Users", daily)
 
 st.markdown("<br>", unsafe_allow_html=True)
 
 # Charts
+# Shown instead of a chart when no selected respondent answered its question
+NO_ANSWERS = "No answers to this question among the selected responses"
 col1, col2 = st.columns(2)
 
 with col1:
     # Primary Wallet Distribution
     st.markdown("### 📊 Primary Wallet Distribution")
-    wallet_counts = filtered_df['Primary_Wallet'].value_counts()
-    fig1 = px.bar(x=wallet_counts.index, y=wallet_counts.values, 
-                  color=wallet_counts.values,
-                  color_continuous_scale=[[0, '#6C5CE7'], [0.5, '#A29BFE'], [1, '#00B8D4']])
-    fig1.update_layout(
-        showlegend=False, 
-        height=400,
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#E8E9ED', size=14),
-        xaxis=dict(showgrid=False),
-        yaxis=dict(showgrid=True, gridcolor='rgba(108, 92, 231, 0.1)')
-    )
-    st.plotly_chart(fig1, use_container_width=True)
-    st.markdown(f"""
-    <div style='background: rgba(108, 92, 231, 0.1); border-left: 3px solid #6C5CE7; 
-                padding: 0.8rem; border-radius: 8px; margin-top: -1rem;'>
-        <p style='color: #E8E9ED; font-size: 0.9rem; margin: 0;'>
-            <b>Insight:</b> {wallet_counts.index[0]} dominates with {wallet_counts.values[0]} users 
-            ({wallet_counts.values[0]/wallet_counts.sum()*100:.1f}%), indicating strong market leadership. 
-            This suggests high brand trust and user retention in the primary platform.
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    wallet_counts = selection.platform_counts('Primary_Wallet')
+    if len(wallet_counts) == 0:
+        st.info(NO_ANSWERS)
+    else:
+        fig1 = px.bar(x=wallet_counts.index, y=wallet_counts.values, 
+                      color=wallet_counts.values,
+                      color_continuous_scale=[[0, '#6C5CE7'], [0.5, '#A29BFE'], [1, '#00B8D4']])
+        fig1.update_layout(
+            showlegend=False, 
+            height=400,
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='#E8E9ED', size=14),
+            xaxis=dict(showgrid=False),
+            yaxis=dict(showgrid=True, gridcolor='rgba(108, 92, 231, 0.1)')
+        )
+        st.plotly_chart(fig1, use_container_width=True)
+        st.markdown(f"""
+        <div style='background: rgba(108, 92, 231, 0.1); border-left: 3px solid #6C5CE7; 
+                    padding: 0.8rem; border-radius: 8px; margin-top: -1rem;'>
+            <p style='color: #E8E9ED; font-size: 0.9rem; margin: 0;'>
+                <b>Insight:</b> {wallet_counts.index[0]} dominates with {wallet_counts.values[0]} users 
+                ({wallet_counts.values[0]/len(selection)*100:.1f}%), indicating strong market leadership. 
+                This suggests high brand trust and user retention in the primary platform.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
 
 with col2:
     # Satisfaction Levels
     st.markdown("### 😊 Satisfaction Levels")
-    sat_counts = filtered_df['Satisfaction'].value_counts()
-    fig2 = px.pie(values=sat_counts.values, names=sat_counts.index, 
-                  hole=0.4, 
-                  color_discrete_sequence=['#6C5CE7', '#A29BFE', '#00B8D4', '#00E676', '#FD79A8'])
-    fig2.update_layout(
-        height=400,
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#E8E9ED', size=14)
-    )
-    st.plotly_chart(fig2, use_container_width=True)
-    satisfied_pct = (len(filtered_df[filtered_df['Satisfaction'].isin(['Satisfied', 'Very satisfied'])])/len(filtered_df)*100)
-    st.markdown(f"""
-    <div style='background: rgba(108, 92, 231, 0.1); border-left: 3px solid #6C5CE7; 
-                padding: 0.8rem; border-radius: 8px; margin-top: -1rem;'>
-        <p style='color: #E8E9ED; font-size: 0.9rem; margin: 0;'>
-            <b>Insight:</b> {satisfied_pct:.1f}% users report positive satisfaction (Satisfied/Very satisfied), 
-            reflecting good platform performance. However, addressing the {100-satisfied_pct:.1f}% neutral/dissatisfied 
-            segment presents growth opportunities.
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    sat_counts = selection.value_counts('Satisfaction')
+    if len(sat_counts) == 0:
+        st.info(NO_ANSWERS)
+    else:
+        fig2 = px.pie(values=sat_counts.values, names=sat_counts.index, 
+                      hole=0.4, 
+                      color_discrete_sequence=['#6C5CE7', '#A29BFE', '#00B8D4', '#00E676', '#FD79A8'])
+        fig2.update_layout(
+            height=400,
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='#E8E9ED', size=14)
+        )
+        st.plotly_chart(fig2, use_container_width=True)
+        satisfied_pct = selection.count_in('Satisfaction', ['Satisfied', 'Very satisfied'])/len(selection)*100
+        st.markdown(f"""
+        <div style='background: rgba(108, 92, 231, 0.1); border-left: 3px solid #6C5CE7; 
+                    padding: 0.8rem; border-radius: 8px; margin-top: -1rem;'>
+            <p style='color: #E8E9ED; font-size: 0.9rem; margin: 0;'>
+                <b>Insight:</b> {satisfied_pct:.1f}% users report positive satisfaction (Satisfied/Very satisfied), 
+                reflecting good platform performance. However, addressing the {100-satisfied_pct:.1f}% neutral/dissatisfied 
+                segment presents growth opportunities.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
 
 col1, col2 = st.columns(2)
 
 with col1:
     # Usage Frequency
     st.markdown("### 📈 Usage Frequency")
-    freq_counts = filtered_df['Usage_Frequency'].value_counts()
-    fig3 = px.bar(x=freq_counts.index, y=freq_counts.values,
-                  color=freq_counts.values, 
-                  color_continuous_scale=[[0, '#00E676'], [0.5, '#00B8D4'], [1, '#6C5CE7']])
-    fig3.update_layout(
-        showlegend=False, 
-        height=400,
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#E8E9ED', size=14),
-        xaxis=dict(showgrid=False),
-        yaxis=dict(showgrid=True, gridcolor='rgba(108, 92, 231, 0.1)')
-    )
-    st.plotly_chart(fig3, use_container_width=True)
-    daily_pct = (len(filtered_df[filtered_df['Usage_Frequency'] == 'Daily'])/len(filtered_df)*100)
-    st.markdown(f"""
-    <div style='background: rgba(0, 184, 212, 0.1); border-left: 3px solid #00B8D4; 
-                padding: 0.8rem; border-radius: 8px; margin-top: -1rem;'>
-        <p style='color: #E8E9ED; font-size: 0.9rem; margin: 0;'>
-            <b>Insight:</b> {daily_pct:.1f}% users engage daily, demonstrating strong platform stickiness 
-            and integration into daily financial activities. Higher frequency correlates with increased 
-            platform dependency and loyalty.
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    freq_counts = selection.value_counts('Usage_Frequency')
+    if len(freq_counts) == 0:
+        st.info(NO_ANSWERS)
+    else:
+        fig3 = px.bar(x=freq_counts.index, y=freq_counts.values,
+                      color=freq_counts.values, 
+                      color_continuous_scale=[[0, '#00E676'], [0.5, '#00B8D4'], [1, '#6C5CE7']])
+        fig3.update_layout(
+            showlegend=False, 
+            height=400,
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='#E8E9ED', size=14),
+            xaxis=dict(showgrid=False),
+            yaxis=dict(showgrid=True, gridcolor='rgba(108, 92, 231, 0.1)')
+        )
+        st.plotly_chart(fig3, use_container_width=True)
+        daily_pct = selection.count_in('Usage_Frequency', ['Daily'])/len(selection)*100
+        st.markdown(f"""
+        <div style='background: rgba(0, 184, 212, 0.1); border-left: 3px solid #00B8D4; 
+                    padding: 0.8rem; border-radius: 8px; margin-top: -1rem;'>
+            <p style='color: #E8E9ED; font-size: 0.9rem; margin: 0;'>
+                <b>Insight:</b> {daily_pct:.1f}% users engage daily, demonstrating strong platform stickiness 
+                and integration into daily financial activities. Higher frequency correlates with increased 
+                platform dependency and loyalty.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
 
 with col2:
     # Most Trusted Security
     st.markdown("### 🔒 Most Trusted Security")
-    trust_counts = filtered_df['Most_Trusted_Security'].value_counts().head(5)
-    fig4 = px.bar(x=trust_counts.values, y=trust_counts.index, 
-                  orientation='h', color=trust_counts.values,
-                  color_continuous_scale=[[0, '#6C5CE7'], [1, '#00B8D4']])
-    fig4.update_layout(
-        showlegend=False, 
+    trust_counts = selection.value_counts('Most_Trusted_Security').head(5)
+    if len(trust_counts) == 0:
+        st.info(NO_ANSWERS)
+    else:
+        fig4 = px.bar(x=trust_counts.values, y=trust_counts.index, 
+                      orientation='h', color=trust_counts.values,
+                      color_continuous_scale=[[0, '#6C5CE7'], [1, '#00B8D4']])
+        fig4.update_layout(
+            showlegend=False, 
+            height=400,
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='#E8E9ED', size=14),
+            xaxis=dict(showgrid=True, gridcolor='rgba(108, 92, 231, 0.1)'),
+            yaxis=dict(showgrid=False)
+        )
+        st.plotly_chart(fig4, use_container_width=True)
+        st.markdown(f"""
+        <div style='background: rgba(0, 184, 212, 0.1); border-left: 3px solid #00B8D4; 
+                    padding: 0.8rem; border-radius: 8px; margin-top: -1rem;'>
+            <p style='color: #E8E9ED; font-size: 0.9rem; margin: 0;'>
+                <b>Insight:</b> {trust_counts.index[0]} leads in security trust with {trust_counts.values[0]} votes. 
+                Security perception is critical for user retention—platforms must continuously strengthen 
+                encryption, fraud detection, and transparency.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+
+# Ease of Use
+st.markdown("### ⚡ Ease of Use by Platform")
+ease_by_platform = (selection.column('Ease_of_Use').groupby([selection.column('Primary_Wallet'), selection.column('Ease_of_Use')])
+                    .size().reset_index(name='count'))
+if len(ease_by_platform) == 0:
+    st.info(NO_ANSWERS)
+else:
+    fig5 = px.bar(ease_by_platform, x='Primary_Wallet', y='count', color='Ease_of_Use',
+                  barmode='group', 
+                  color_discrete_sequence=['#6C5CE7', '#A29BFE', '#00B8D4', '#00E676', '#FFD600'])
+    fig5.update_layout(
         height=400,
         plot_bgcolor='rgba(0,0,0,0)',
         paper_bgcolor='rgba(0,0,0,0)',
         font=dict(color='#E8E9ED', size=14),
-        xaxis=dict(showgrid=True, gridcolor='rgba(108, 92, 231, 0.1)'),
-        yaxis=dict(showgrid=False)
+        xaxis=dict(showgrid=False),
+        yaxis=dict(showgrid=True, gridcolor='rgba(108, 92, 231, 0.1)'),
+        legend=dict(bgcolor='rgba(30, 30, 47, 0.7)')
     )
-    st.plotly_chart(fig4, use_container_width=True)
+    st.plotly_chart(fig5, use_container_width=True)
+    easy_users = selection.count_in('Ease_of_Use', ['Easy to use', 'Very easy to use'])
     st.markdown(f"""
-    <div style='background: rgba(0, 184, 212, 0.1); border-left: 3px solid #00B8D4; 
+    <div style='background: rgba(0, 230, 118, 0.1); border-left: 3px solid #00E676; 
                 padding: 0.8rem; border-radius: 8px; margin-top: -1rem;'>
         <p style='color: #E8E9ED; font-size: 0.9rem; margin: 0;'>
-            <b>Insight:</b> {trust_counts.index[0]} leads in security trust with {trust_counts.values[0]} votes. 
-            Security perception is critical for user retention—platforms must continuously strengthen 
-            encryption, fraud detection, and transparency.
+            <b>Insight:</b> {easy_users/len(selection)*100:.1f}% users find their platform easy to use. 
+            User-friendly interfaces directly impact adoption rates—platforms with intuitive design see 
+            higher engagement and lower churn rates across demographics.
         </p>
     </div>
     """, unsafe_allow_html=True)
 
-# Ease of Use
-st.markdown("### ⚡ Ease of Use by Platform")
-ease_by_platform = filtered_df.groupby(['Primary_Wallet', 'Ease_of_Use']).size().reset_index(name='count')
-fig5 = px.bar(ease_by_platform, x='Primary_Wallet', y='count', color='Ease_of_Use',
-              barmode='group', 
-              color_discrete_sequence=['#6C5CE7', '#A29BFE', '#00B8D4', '#00E676', '#FFD600'])
-fig5.update_layout(
-    height=400,
-    plot_bgcolor='rgba(0,0,0,0)',
-    paper_bgcolor='rgba(0,0,0,0)',
-    font=dict(color='#E8E9ED', size=14),
-    xaxis=dict(showgrid=False),
-    yaxis=dict(showgrid=True, gridcolor='rgba(108, 92, 231, 0.1)'),
-    legend=dict(bgcolor='rgba(30, 30, 47, 0.7)')
-)
-st.plotly_chart(fig5, use_container_width=True)
-easy_users = len(filtered_df[filtered_df['Ease_of_Use'].isin(['Easy to use', 'Very easy to use'])])
-st.markdown(f"""
-<div style='background: rgba(0, 230, 118, 0.1); border-left: 3px solid #00E676; 
-            padding: 0.8rem; border-radius: 8px; margin-top: -1rem;'>
-    <p style='color: #E8E9ED; font-size: 0.9rem; margin: 0;'>
-        <b>Insight:</b> {easy_users/len(filtered_df)*100:.1f}% users find their platform easy to use. 
-        User-friendly interfaces directly impact adoption rates—platforms with intuitive design see 
-        higher engagement and lower churn rates across demographics.
-    </p>
-</div>
-""", unsafe_allow_html=True)
-
 # PayPal Preference
 col1, col2 = st.columns(2)
 with col1:
     st.markdown("### 💰 Would Prefer PayPal?")
-    paypal_counts = filtered_df['Prefer_PayPal'].value_counts()
-    fig6 = px.pie(values=paypal_counts.values, names=paypal_counts.index,
-                  hole=0.4,
-                  color_discrete_sequence=['#00B8D4', '#6C5CE7', '#FD79A8'])
-    fig6.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#E8E9ED', size=14)
-    )
-    st.plotly_chart(fig6, use_container_width=True)
-    if 'Yes' in paypal_counts.index:
-        paypal_yes_pct = (paypal_counts['Yes']/paypal_counts.sum()*100)
+    paypal_counts = selection.value_counts('Prefer_PayPal')
+    if len(paypal_counts) == 0:
+        st.info(NO_ANSWERS)
     else:
-        paypal_yes_pct = 0
-    st.markdown(f"""
-    <div style='background: rgba(253, 121, 168, 0.1); border-left: 3px solid #FD79A8; 
-                padding: 0.8rem; border-radius: 8px; margin-top: -1rem;'>
-        <p style='color: #E8E9ED; font-size: 0.9rem; margin: 0;'>
-            <b>Insight:</b> {paypal_yes_pct:.1f}% express interest in PayPal, signaling demand for 
-            international payment solutions. Local platforms should consider cross-border features 
-            and global integration to capture this market segment.
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+        fig6 = px.pie(values=paypal_counts.values, names=paypal_counts.index,
+                      hole=0.4,
+                      color_discrete_sequence=['#00B8D4', '#6C5CE7', '#FD79A8'])
+        fig6.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='#E8E9ED', size=14)
+        )
+        st.plotly_chart(fig6, use_container_width=True)
+        if 'Yes' in paypal_counts.index:
+            paypal_yes_pct = (paypal_counts['Yes']/paypal_counts.sum()*100)
+        else:
+            paypal_yes_pct = 0
+        st.markdown(f"""
+        <div style='background: rgba(253, 121, 168, 0.1); border-left: 3px solid #FD79A8; 
+                    padding: 0.8rem; border-radius: 8px; margin-top: -1rem;'>
+            <p style='color: #E8E9ED; font-size: 0.9rem; margin: 0;'>
+                <b>Insight:</b> {paypal_yes_pct:.1f}% express interest in PayPal, signaling demand for 
+                international payment solutions. Local platforms should consider cross-border features 
+                and global integration to capture this market segment.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
 
 with col2:
     st.markdown("### 👍 Would Recommend?")
-    rec_counts = filtered_df['Would_Recommend'].value_counts()
-    fig7 = px.pie(values=rec_counts.values, names=rec_counts.index,
-                  hole=0.4,
-                  color_discrete_sequence=['#00E676', '#FFD600', '#FF1744', '#6C5CE7'])
-    fig7.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#E8E9ED', size=14)
-    )
-    st.plotly_chart(fig7, use_container_width=True)
-    recommend_positive = len(filtered_df[filtered_df['Would_Recommend'].isin(['Yes', 'Definitely'])])
-    st.markdown(f"""
-    <div style='background: rgba(253, 121, 168, 0.1); border-left: 3px solid #FD79A8; 
-                padding: 0.8rem; border-radius: 8px; margin-top: -1rem;'>
-        <p style='color: #E8E9ED; font-size: 0.9rem; margin: 0;'>
-            <b>Insight:</b> {recommend_positive/len(filtered_df)*100:.1f}% would recommend their platform, 
-            indicating strong Net Promoter Score (NPS). High recommendation rates drive organic growth 
-            through word-of-mouth marketing and community trust.
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    rec_counts = selection.value_counts('Would_Recommend')
+    if len(rec_counts) == 0:
+        st.info(NO_ANSWERS)
+    else:
+        fig7 = px.pie(values=rec_counts.values, names=rec_counts.index,
+                      hole=0.4,
+                      color_discrete_sequence=['#00E676', '#FFD600', '#FF1744', '#6C5CE7'])
+        fig7.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='#E8E9ED', size=14)
+        )
+        st.plotly_chart(fig7, use_container_width=True)
+        seg = selection.seg
+        st.markdown(f"""
+        <div style='background: rgba(253, 121, 168, 0.1); border-left: 3px solid #FD79A8; 
+                    padding: 0.8rem; border-radius: 8px; margin-top: -1rem;'>
+            <p style='color: #E8E9ED; font-size: 0.9rem; margin: 0;'>
+                <b>Insight:</b> {seg['recommend_rate']:.1f}% would recommend their platform, 
+                with an NPS of {seg['nps']:+.0f} ({seg['shares']['Promoter']:.0f}% promoters vs 
+                {seg['shares']['Detractor']:.0f}% detractors). High recommendation rates drive organic growth 
+                through word-of-mouth marketing and community trust.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
 
 st.markdown("<br>", unsafe_allow_html=True)
 
@@ -401,3 +451,5 @@ st.markdown("""
 
 st.markdown("<hr style='border: 1px solid rgba(108, 92, 231, 0.2); margin: 2rem 0;'>", unsafe_allow_html=True)
 st.markdown("<p style='text-align: center; color: #A0A3BD; font-size: 0.9rem;'><b>Data Source:</b> User Perception of Digital Payment Platforms Survey | <b>Total Responses:</b> {} | <b>Powered by Plotly</b></p>".format(len(df)), unsafe_allow_html=True)
+
+profile_run.stop()
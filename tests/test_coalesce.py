@@ -0,0 +1,52 @@
+import fcntl
+import os
+import threading
+import time
+
+import pytest
+
+from coalesce import SharedResults
+
+
+@pytest.fixture
+def results(tmp_path):
+    return SharedResults(str(tmp_path), ttl=1)
+
+
+def stale(path):
+    open(path, 'a').close()
+    old = time.time() - 60
+    os.utime(path, (old, old))
+    return path
+
+
+def test_shared_results_are_computed_once(results):
+    calls = []
+    assert results.do('key', lambda: calls.append(1) or {'n': 1}) == {'n': 1}
+    assert results.do('key', lambda: calls.append(1) or {'n': 2}) == {'n': 1}
+    assert len(calls) == 1
+
+
+def test_prune_keeps_lock_files_a_worker_holds(results):
+    path = results.path('busy')
+    held, idle, result = stale(path + '.lock'), stale(results.path('idle') + '.lock'), stale(path)
+    with open(held) as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        results.prune()
+        assert os.path.exists(held)
+    assert not os.path.exists(idle) and not os.path.exists(result)
+
+
+def test_lockers_retry_when_prune_removed_their_lock_file(results):
+    path = stale(results.path('key') + '.lock')
+    got = []
+    with open(path) as pruning:
+        fcntl.flock(pruning, fcntl.LOCK_EX)
+        worker = threading.Thread(target=lambda: got.append(results.locked(path)))
+        worker.start()
+        # The worker waits on the file prune is about to remove
+        time.sleep(0.2)
+        os.remove(path)
+    worker.join(5)
+    with got[0] as lock:
+        assert os.fstat(lock.fileno()).st_ino == os.stat(path).st_ino
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+from dedup import MAX_LOAD, DedupIndex, FingerprintSet
+from schema import COLUMNS
+
+
+def colliding(fps, count):
+    """``count`` odd fingerprints sharing one home slot in ``fps``."""
+    found, fp = [], np.uint64(1)
+    target = None
+    while len(found) < count:
+        home = int(fps._home(fp))
+        if target is None:
+            target = home
+        if home == target:
+            found.append(int(fp))
+        fp += np.uint64(2)
+    return np.array(found, dtype=np.uint64)
+
+
+def test_add_many_places_keys_racing_for_one_slot():
+    fps = FingerprintSet(64)
+    keys = colliding(fps, 6)
+    assert fps.add_many(keys).all()
+    assert len(fps) == 6
+    assert fps.contains_many(keys).all()
+    assert all(int(key) in fps for key in keys)
+    # Keys with the same home that were never added probe past the chain and miss
+    absent = colliding(fps, 9)[6:]
+    assert not fps.contains_many(absent).any()
+    assert not any(int(key) in fps for key in absent)
+
+
+def test_add_and_add_many_agree_on_collisions():
+    scalar, vector = FingerprintSet(64), FingerprintSet(64)
+    keys = colliding(scalar, 5)
+    assert [scalar.add(key) for key in keys] == [True] * 5
+    vector.add_many(keys)
+    assert sorted(scalar.slots[scalar.slots != 0]) == sorted(vector.slots[vector.slots != 0])
+    assert not scalar.add(keys[2])
+    assert not vector.add_many(keys[[2]]).any()
+
+
+def test_repeats_within_a_batch_are_new_only_once():
+    fps = FingerprintSet()
+    new = fps.add_many(np.array([3, 5, 3, 7, 5, 3], dtype=np.uint64))
+    assert new.tolist() == [True, True, False, True, False, False]
+    assert len(fps) == 3
+    assert not fps.add_many(np.array([7, 3], dtype=np.uint64)).any()
+    assert fps.add_many(np.array([9, 9], dtype=np.uint64)).tolist() == [True, False]
+
+
+def test_growth_keeps_every_key_and_the_load_factor():
+    fps = FingerprintSet(4)
+    initial = len(fps.slots)
+    rng = np.random.default_rng(0)
+    keys = np.unique(rng.integers(1, 2 ** 63, size=5000, dtype=np.uint64) | np.uint64(1))
+    for batch in np.array_split(keys, 7):
+        fps.add_many(batch)
+        assert len(fps) <= MAX_LOAD * len(fps.slots)
+    assert len(fps.slots) > initial
+    assert len(fps) == len(keys) == np.count_nonzero(fps.slots)
+    assert fps.contains_many(keys).all()
+
+
+def test_single_adds_grow_the_table():
+    fps = FingerprintSet(2)
+    keys = [2 * i + 1 for i in range(100)]
+    assert all(fps.add(key) for key in keys)
+    assert len(fps) == 100
+    assert len(fps) <= MAX_LOAD * len(fps.slots)
+    assert all(key in fps for key in keys)
+
+
+def test_matches_a_python_set():
+    rng = np.random.default_rng(1)
+    fps, reference = FingerprintSet(8), set()
+    for _ in range(20):
+        # A small key space forces repeats within and across batches
+        batch = rng.integers(0, 300, size=80, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        new = fps.add_many(batch)
+        expected = []
+        for key in batch.tolist():
+            expected.append(key not in reference)
+            reference.add(key)
+        assert new.tolist() == expected
+    assert len(fps) == len(reference)
+    probe = np.arange(1, 1201, 2, dtype=np.uint64)
+    assert fps.contains_many(probe).tolist() == [int(key) in reference for key in probe]
+
+
+def response(**answers):
+    record = dict.fromkeys(COLUMNS, 'x')
+    record.update(answers)
+    return record
+
+
+def test_dedup_index_frame_and_record_paths_agree():
+    frame = pd.DataFrame([response(Username='a', Timestamp='t1'),
+                          response(Username='a', Timestamp='t1', Satisfaction='y'),
+                          response(Username=None, Timestamp='t2'),
+                          response(Username=None, Timestamp='t3')], columns=COLUMNS)
+    # An identity repeat, then a new anonymous row and a repeat of its answers
+    assert DedupIndex().admit_frame(frame).tolist() == [True, False, True, False]
+    index = DedupIndex()
+    assert [index.admit(row) for row in frame.to_dict('records')] == [True, False, True, False]
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from filters import FilterIndex, RowView, pack
+from schema import COLUMNS
+
+SIZES = [0, 1, 63, 64, 65, 127, 128, 130, 200]
+
+
+def unpack(words, n):
+    return np.unpackbits(words.view(np.uint8), count=n, bitorder='little').view(bool)
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_pack_round_trips_and_zeroes_the_padding(n):
+    mask = np.random.default_rng(n).random(n) < 0.5
+    words = pack(mask)
+    assert words.dtype == np.uint64
+    assert len(words) == -(-n // 64)
+    assert unpack(words, n).tolist() == mask.tolist()
+    # Bits past the last row are never set, so ANDs and counts stay exact
+    assert np.unpackbits(words.view(np.uint8), bitorder='little')[n:].sum() == 0
+
+
+def survey(n):
+    """``n`` synthetic responses cycling through a few answers per column."""
+    rng = np.random.default_rng(n)
+    df = pd.DataFrame({column: rng.choice(['a', 'b', 'c'], n) for column in COLUMNS})
+    df['Platforms_Used'] = rng.choice(['JazzCash', 'Easypaisa;JazzCash', 'NayaPay, Easypaisa'], n)
+    df['Primary_Wallet'] = rng.choice(['JazzCash', 'Easypaisa', 'NayaPay'], n)
+    df['PayPal_Features_to_Adopt'] = rng.choice(['x;y', 'y', 'z; x', ''], n)
+    df['Not_Switch_Reason'] = rng.choice(['cost;support', 'support', 'cost'], n)
+    df.loc[df.index % 7 == 0, 'Satisfaction'] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('n', [1, 63, 64, 65, 130])
+def test_specs_match_the_rows_a_scan_finds(n):
+    df = survey(n)
+    index = FilterIndex(df)
+    satisfied = df['Satisfaction'].isin(['a', 'b']).to_numpy()
+    jazzcash = df['Primary_Wallet'].eq('JazzCash').to_numpy()
+    cost = df['Not_Switch_Reason'].str.contains('cost').to_numpy()
+    feature_x = df['PayPal_Features_to_Adopt'].str.split(';').apply(lambda items: 'x' in map(str.strip, items))
+
+    assert index.mask({}).tolist() == [True] * n
+    assert index.mask({'Satisfaction': ['a', 'b']}).tolist() == satisfied.tolist()
+    assert index.mask({'Satisfaction': ['a', 'b'], 'Primary_Wallet': ['JazzCash']}).tolist() == \
+        (satisfied & jazzcash).tolist()
+    # Multi-select dimensions match any respondent naming the item
+    assert index.mask({'Not_Switch_Reason': ['cost']}).tolist() == cost.tolist()
+    assert index.mask({'PayPal_Features_to_Adopt': ['x']}).tolist() == feature_x.tolist()
+    # Answers that never occur match nobody
+    assert not index.mask({'Satisfaction': ['never given']}).any()
+    assert index.positions({'Primary_Wallet': ['JazzCash']}).tolist() == np.flatnonzero(jazzcash).tolist()
+
+
+@pytest.mark.parametrize('n', [63, 64, 65, 130])
+def test_words_cover_exactly_n_rows(n):
+    index = FilterIndex(survey(n))
+    words = index.words({})
+    assert len(words) == -(-n // 64)
+    assert int(np.unpackbits(words.view(np.uint8)).sum()) == n
+
+
+def test_unknown_dimension_is_an_error():
+    with pytest.raises(ValueError):
+        FilterIndex(survey(10)).mask({'Not_A_Column': ['a']})
+
+
+def test_row_view_reads_only_the_matching_rows():
+    df = survey(65)
+    index = FilterIndex(df)
+    view = index.view(df, {'Primary_Wallet': ['NayaPay']})
+    expected = df.loc[df['Primary_Wallet'] == 'NayaPay', 'Satisfaction']
+    assert len(view) == len(expected)
+    assert view.column('Satisfaction').tolist() == expected.tolist()
+    assert index.view(df, {}).column('Satisfaction') is df['Satisfaction']
+    assert len(RowView(df, np.array([], dtype=np.int64))) == 0
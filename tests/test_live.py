@@ -0,0 +1,48 @@
+import json
+from types import SimpleNamespace
+
+import pandas as pd
+
+from live import LiveFeed, update_event
+
+
+def dataset(rows, append_only):
+    return SimpleNamespace(name='responses', version=f'v{rows}', df=pd.DataFrame({'a': range(rows)}),
+                           backend=SimpleNamespace(append_only=append_only))
+
+
+def test_appends_name_the_new_rows():
+    event = update_event(dataset(68, True), dataset(70, True))
+    assert event == {'dataset': 'responses', 'version': 'v70', 'responses': 70, 'rows': [68, 70]}
+
+
+def test_rewritable_sources_mark_everything_stale():
+    assert update_event(dataset(68, False), dataset(70, False))['rows'] is None
+    # A store that shrank was not appended to
+    assert update_event(dataset(70, True), dataset(68, True))['rows'] is None
+
+
+def events(stream, count):
+    next(stream)  # retry hint
+    return [next(stream) for _ in range(count)]
+
+
+def test_reconnecting_clients_replay_what_they_missed():
+    feed = LiveFeed()
+    for rows in (1, 2, 3):
+        feed.publish({'responses': rows})
+    replayed = events(feed.stream(last_event_id='1'), 2)
+    assert replayed[0] == 'id: 2\nevent: update\ndata: {"responses":2}\n\n'
+    assert json.loads(replayed[1].split('data: ')[1]) == {'responses': 3}
+
+
+def test_stalled_clients_are_dropped():
+    feed = LiveFeed(history=0, backlog=1)
+    stream = feed.stream()
+    next(stream)
+    assert len(feed) == 1
+    feed.publish({'responses': 1})
+    feed.publish({'responses': 2})
+    assert len(feed) == 0
+    # The stream ends so the browser reconnects
+    assert list(stream) == []
@@ -0,0 +1,70 @@
+import gzip
+
+import pytest
+from flask import Flask, jsonify
+
+import serving
+
+BODY = b'{"output": "chart.figure", "inputs": [{"id": "platform-filter", "value": "ALL"}]}'
+
+
+@pytest.fixture
+def server():
+    app = Flask(__name__)
+    app.version = 'v1'
+    app.calls = 0
+
+    @app.route(serving.CALLBACK_PATH, methods=['POST'])
+    def update_component():
+        app.calls += 1
+        return jsonify(response={'calls': app.calls}, padding='x' * 1000)
+
+    @app.route('/_dash-layout')
+    def layout():
+        return jsonify(layout='page')
+
+    serving.install(app, lambda: app.version, compress=True)
+    return app
+
+
+def post(client, etag=None, query=''):
+    headers = {'If-None-Match': etag} if etag else {}
+    return client.post(serving.CALLBACK_PATH + query, data=BODY, content_type='application/json', headers=headers)
+
+
+def test_callbacks_revalidate_against_the_data_version(server):
+    client = server.test_client()
+    first = post(client)
+    assert first.status_code == 200 and first.headers['ETag'].startswith('W/')
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    # Answered before the callback runs
+    repeat = post(client, first.headers['ETag'])
+    assert repeat.status_code == 304 and server.calls == 1
+
+    server.version = 'v2'
+    changed = post(client, first.headers['ETag'])
+    assert changed.status_code == 200 and server.calls == 2
+    assert changed.headers['ETag'] != first.headers['ETag']
+
+
+def test_background_callback_polls_are_never_revalidated(server):
+    client = server.test_client()
+    etag = post(client).headers['ETag']
+    poll = post(client, etag, '?cacheKey=abc&job=1')
+    assert poll.status_code == 200 and server.calls == 2
+    assert 'ETag' not in poll.headers
+
+
+def test_get_responses_get_a_content_etag(server):
+    client = server.test_client()
+    first = client.get('/_dash-layout')
+    assert first.status_code == 200
+    assert client.get('/_dash-layout', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+
+def test_large_responses_are_compressed(server):
+    response = server.test_client().post(serving.CALLBACK_PATH, data=BODY, content_type='application/json',
+                                         headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert b'"calls":1' in gzip.decompress(response.get_data())
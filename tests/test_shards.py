@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from shards import encode_columns, merge_column
+
+
+def parts(*shards):
+    return [encode_columns(pd.DataFrame({'answer': values}))['answer'] for values in shards]
+
+
+def test_merge_remaps_each_shards_codes_onto_the_union():
+    shards = [['b', 'a', None, 'b'], ['c', 'a'], [None, None], ['a', 'd', 'c']]
+    merged = merge_column(parts(*shards), np.ones(11, dtype=bool))
+    expected = pd.Series([value for shard in shards for value in shard], dtype=object)
+    assert merged.isna().tolist() == expected.isna().tolist()
+    assert merged.dropna().tolist() == expected.dropna().tolist()
+
+
+def test_merge_keeps_only_the_selected_rows():
+    shards = [['a', 'b', 'c'], ['c', None, 'a']]
+    keep = np.array([True, False, True, False, True, True])
+    merged = merge_column(parts(*shards), keep)
+    assert merged.iloc[[0, 1, 3]].tolist() == ['a', 'c', 'a']
+    assert pd.isna(merged.iloc[2])
+
+
+def test_merge_restores_numeric_columns():
+    merged = merge_column(parts([1, 2], [2, 3]), np.ones(4, dtype=bool))
+    assert merged.tolist() == [1, 2, 2, 3]
+    assert merged.dtype.kind == 'i'
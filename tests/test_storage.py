@@ -0,0 +1,80 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from canonical import PLATFORM_IDS, TokenTable
+from schema import COLUMNS
+from storage import SQLiteBackend
+from validation import ANSWER_SETS
+
+
+def response(username, **answers):
+    """A valid response: the first allowed answer to every enumerated question."""
+    record = {column: allowed[0] for column, allowed in ANSWER_SETS.items()}
+    record.update(Timestamp='2025/12/16 12:21:39 PM GMT+5', Username=username, Platforms_Used='JazzCash',
+                  Primary_Wallet='JazzCash')
+    record.update(answers)
+    return {column: record.get(column) for column in COLUMNS}
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return SQLiteBackend(str(tmp_path / 'responses.db'))
+
+
+def test_empty_batch_into_an_empty_table(backend):
+    assert backend.import_frame(pd.DataFrame(columns=COLUMNS)) == 0
+    assert backend.append(response('a'))
+
+
+def test_repeats_are_skipped_across_backends(backend):
+    other = SQLiteBackend(backend.path)
+    assert backend.append(response('a'))
+    assert other.append(response('b'))
+    # Each backend sees what the other stored
+    assert not backend.append(response('b'))
+    assert other.import_frame(pd.DataFrame([response('a'), response('c'), response('c')])) == 1
+    assert len(backend.load()) == 3
+
+
+def test_failed_insert_can_be_retried(backend, monkeypatch):
+    assert backend.append(response('a'))
+    monkeypatch.setattr(backend, 'insert_sql', lambda: 'INSERT INTO missing VALUES (1)')
+    with pytest.raises(sqlite3.OperationalError):
+        backend.append(response('b'))
+    with pytest.raises(sqlite3.OperationalError):
+        backend.import_frame(pd.DataFrame([response('c')]))
+    monkeypatch.undo()
+    assert backend.append(response('b'))
+    assert backend.import_frame(pd.DataFrame([response('c')])) == 1
+    assert not backend.append(response('c'))
+    assert backend.load()['Username'].tolist() == ['a', 'b', 'c']
+
+
+@pytest.mark.parametrize('platform', ['ALL', 'JazzCash', 'NayaPay', 'Other'])
+@pytest.mark.parametrize('freq', ['ALL', 'Daily'])
+def test_pushdown_matches_pandas_on_the_loaded_rows(backend, platform, freq):
+    rng = np.random.default_rng(31)
+    wallets, frequencies = ['JazzCash', 'Easypaisa', 'NayaPay', 'SadaPay'], ANSWER_SETS['Usage_Frequency']
+    satisfaction = ANSWER_SETS['Satisfaction'] + [None]
+    backend.import_frame(pd.DataFrame([response(str(i), Primary_Wallet=rng.choice(wallets),
+                                                Usage_Frequency=rng.choice(frequencies),
+                                                Satisfaction=rng.choice(satisfaction)) for i in range(200)]))
+    df = backend.load()
+    # Responses stored after the frame was loaded stay out of its queries
+    for i in range(5):
+        backend.append(response(f'late{i}', Primary_Wallet='NayaPay', Usage_Frequency='Daily'))
+
+    selected = pd.Series(True, index=df.index)
+    if platform != 'ALL':
+        # Wallets match by canonical platform, so SadaPay counts as Other
+        bit = 1 << PLATFORM_IDS[platform]
+        selected &= df['Primary_Wallet'].map(lambda wallet: bool(TokenTable().answer_mask(wallet) & bit))
+    if freq != 'ALL':
+        selected &= df['Usage_Frequency'] == freq
+    assert backend.row_positions(len(df), platform, freq).tolist() == np.flatnonzero(selected).tolist()
+    counts = backend.grouped_counts('Satisfaction', len(df), platform, freq)
+    assert counts.to_dict() == df.loc[selected, 'Satisfaction'].value_counts().to_dict()
+    assert counts.is_monotonic_decreasing
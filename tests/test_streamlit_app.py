@@ -0,0 +1,38 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from analytics import filter_index, registry
+from filters import EXTRA_DIMENSIONS, dimension_label
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def app(monkeypatch):
+    # The default survey path is relative to the repository root
+    monkeypatch.chdir(ROOT)
+    at = AppTest.from_file(os.path.join(ROOT, 'streamlit_app.py'), default_timeout=30)
+    at.run()
+    assert not at.exception
+    return at
+
+
+def multiselect(at, label):
+    return next(widget for widget in at.multiselect if widget.label == label)
+
+
+def test_every_single_answer_extra_filter_renders(app):
+    # Single answers often leave a charted question unanswered; no chart may crash
+    options = filter_index(registry.get()).options
+    failures = []
+    for dim in EXTRA_DIMENSIONS:
+        label = dimension_label(dim)
+        for answer in options[dim]:
+            multiselect(app, label).set_value([answer])
+            app.run()
+            if app.exception:
+                failures.append((dim, answer, app.exception[0].value))
+        multiselect(app, label).set_value([])
+    assert not failures
@@ -0,0 +1,82 @@
+import csv
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from schema import COLUMNS, parse_timestamps
+from validation import ANSWER_SETS, SchemaError, check_export
+
+HEADER = ['Timestamp', 'Username'] + [f'{i}. {column}' for i, column in enumerate(COLUMNS[2:], start=1)]
+
+
+def row(username, **answers):
+    record = {column: allowed[0] for column, allowed in ANSWER_SETS.items()}
+    record.update(Timestamp='2025/12/16 12:21:39 PM GMT+5', Username=username, Platforms_Used='JazzCash',
+                  Primary_Wallet='JazzCash')
+    record.update(answers)
+    return [record.get(column) for column in COLUMNS]
+
+
+def export(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+    return str(path)
+
+
+def test_rejected_rows_are_quarantined_with_their_reasons(tmp_path):
+    path = export(tmp_path / 'responses.csv', [
+        row('ok'),
+        row('sat', Satisfaction='Ecstatic'),
+        row('wallet', Primary_Wallet=None),
+        row('time', Timestamp='yesterday'),
+        row('extra') + ['surplus field'],
+        row('ok2'),
+    ])
+    df, report = check_export(path)
+    assert df['Username'].tolist() == ['ok', 'ok2']
+    assert report.total == 6 and report.accepted == 2
+    assert report.reasons == {'bad Satisfaction': 1, 'missing Primary_Wallet': 1, 'bad Timestamp': 1,
+                              'malformed row': 1}
+
+    rejected = pd.read_csv(tmp_path / 'responses.rejected.csv')
+    assert dict(zip(rejected['Username'], rejected['Rejection_Reason'])) == {
+        'sat': 'bad Satisfaction', 'wallet': 'missing Primary_Wallet', 'time': 'bad Timestamp'}
+    malformed = (tmp_path / 'responses.malformed.txt').read_text(encoding='utf-8')
+    assert malformed.startswith('line 6: ') and 'surplus field' in malformed
+    assert sorted(report.quarantine_paths) == sorted([str(tmp_path / 'responses.rejected.csv'),
+                                                      str(tmp_path / 'responses.malformed.txt')])
+
+
+def test_clean_exports_write_no_side_files(tmp_path):
+    df, report = check_export(export(tmp_path / 'responses.csv', [row('a'), row('b')]))
+    assert len(df) == 2 and not report.rejected
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['responses.csv']
+
+
+def test_empty_export_is_a_schema_error(tmp_path):
+    path = tmp_path / 'empty.csv'
+    path.write_text('')
+    with pytest.raises(SchemaError):
+        check_export(str(path))
+
+
+def test_timestamps_parse_in_their_own_zone_whatever_the_row_order():
+    stamps = {
+        '2025/12/16 12:21:39 PM GMT+5': '2025-12-16 07:21:39',
+        '2025/12/16 12:21:39 PM GMT-3:30': '2025-12-16 15:51:39',
+        '2025/12/16 01:00:00 AM GMT+0530': '2025-12-15 19:30:00',
+        '2025/12/16 12:21:39 PM': '2025-12-16 12:21:39',
+        'not a time': None,
+        None: None,
+    }
+    expected = {stamp: pd.Timestamp(utc, tz='UTC') if utc else pd.NaT for stamp, utc in stamps.items()}
+    rng = np.random.default_rng(33)
+    values = list(stamps) * 3
+    for _ in range(20):
+        rng.shuffle(values)
+        parsed = parse_timestamps(values)
+        assert [None if pd.isna(t) else t for t in parsed] == \
+            [None if pd.isna(expected[v]) else expected[v] for v in values]
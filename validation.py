@@ -0,0 +1,178 @@
+"""Validation stage between the raw CSV parse and the dashboards.
+
+``read_export`` checks the header against the survey schema, parses the
+file with the C parser while capturing rows with the wrong number of
+fields, and ``validate_frame`` rejects rows whose enumerated answers or
+timestamps are invalid. All checks are column-wise (``isin`` over the
+answer sets, one vectorized timestamp parse), so the stage costs little
+next to the parse itself. Rejected rows are quarantined to side files next
+to the export and counted in a ``ValidationReport``; repeated
+submissions are then dropped by the dedup stage (see dedup.py).
+"""
+import csv
+import logging
+import os
+import re
+import warnings
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from dedup import dedupe
+from segmentation import ease_map, prot_map, recommend_map, sat_map
+from schema import COLUMNS, parse_timestamps
+
+logger = logging.getLogger(__name__)
+
+agree_scale = list(prot_map)
+
+# Allowed answers per enumerated column; None means the column may be empty
+ANSWER_SETS = {
+    'Usage_Frequency': ['Rarely', 'Occasionally', 'Several times a week', 'Daily'],
+    'Satisfaction': list(sat_map),
+    'Data_Protection_Confidence': agree_scale,
+    'Ease_of_Use': list(ease_map),
+    'Would_Recommend': list(recommend_map),
+    'Prefer_PayPal': ['Yes, definitely', 'Yes, probably', 'Not sure', 'Probably not', 'Definitely not', None],
+    'Should_Adopt_PayPal_Practices': agree_scale + [None],
+}
+
+REQUIRED = ['Timestamp', 'Platforms_Used', 'Primary_Wallet']
+
+BAD_LINE = re.compile(r'Skipping line (\d+): expected (\d+) fields, saw (\d+)')
+
+
+class SchemaError(ValueError):
+    pass
+
+
+class ValidationReport:
+    def __init__(self, source, total):
+        self.source = source
+        self.total = total
+        self.reasons = Counter()
+        self.quarantine_paths = []
+
+    @property
+    def rejected(self):
+        return sum(self.reasons.values())
+
+    @property
+    def accepted(self):
+        return self.total - self.rejected
+
+    def summary(self):
+        text = f"{self.source}: {self.accepted} of {self.total} rows accepted"
+        if self.reasons:
+            text += ' (' + ', '.join(f"{n} {reason}" for reason, n in self.reasons.most_common()) + ')'
+        return text
+
+
+def check_header(header):
+    if len(header) != len(COLUMNS):
+        raise SchemaError(f"expected {len(COLUMNS)} columns, found {len(header)}")
+    # Survey questions are numbered from the third column on
+    for i, title in enumerate(header[2:], start=1):
+        if not title.strip().startswith(f'{i}.'):
+            raise SchemaError(f"column {i + 2} should be question {i}, found {title.strip()!r}")
+
+
+def read_export(path):
+    """Parse a form export, returning (frame, {line number: raw line}) for malformed rows."""
+    with open(path, newline='', encoding='utf-8') as f:
+        header = next(csv.reader(f), None)
+    if header is None:
+        raise SchemaError("empty export")
+    check_header(header)
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always', pd.errors.ParserWarning)
+        df = pd.read_csv(path, on_bad_lines='warn')
+    df.columns = COLUMNS
+
+    bad_lines = sorted(int(m.group(1)) for w in caught for m in BAD_LINE.finditer(str(w.message)))
+    malformed = {}
+    if bad_lines:
+        wanted = set(bad_lines)
+        with open(path, encoding='utf-8') as f:
+            for number, line in enumerate(f, start=1):
+                if number in wanted:
+                    malformed[number] = line.rstrip('\n')
+    return df, malformed
+
+
+def rejection_reasons(df):
+    """Per-row rejection reason (None for valid rows), computed column-wise."""
+    reasons = np.full(len(df), None, dtype=object)
+
+    def reject(mask, reason):
+        # Keep the first reason found for each row
+        reasons[mask & pd.isna(reasons)] = reason
+
+    for column in REQUIRED:
+        reject(df[column].isna().to_numpy(), f'missing {column}')
+    reject(parse_timestamps(df['Timestamp']).isna().to_numpy() & df['Timestamp'].notna().to_numpy(),
+           'bad Timestamp')
+    for column, allowed in ANSWER_SETS.items():
+        values = df[column]
+        ok = values.isin([a for a in allowed if a is not None])
+        if None in allowed:
+            ok |= values.isna()
+        reject(~ok.to_numpy(), f'bad {column}')
+    return reasons
+
+
+def validate_frame(df, source='responses', quarantine_path=None, report=None):
+    """Split ``df`` into accepted rows and a report; rejected rows go to ``quarantine_path``."""
+    report = ValidationReport(source, len(df)) if report is None else report
+    reasons = rejection_reasons(df)
+    bad = pd.notna(reasons)
+    if not bad.any():
+        return df, report
+
+    report.reasons.update(reasons[bad])
+    if quarantine_path:
+        rejected = df[bad].assign(Rejection_Reason=reasons[bad])
+        rejected.to_csv(quarantine_path, index=False)
+        report.quarantine_paths.append(quarantine_path)
+    return df[~bad].reset_index(drop=True), report
+
+
+def quarantine_paths(path):
+    stem = os.path.splitext(path)[0]
+    return stem + '.rejected.csv', stem + '.malformed.txt'
+
+
+def check_export(path):
+    """Read, validate and quarantine one export, without deduplicating; returns (frame, report)."""
+    df, malformed = read_export(path)
+    rejected_path, malformed_path = quarantine_paths(path)
+    report = ValidationReport(path, len(df) + len(malformed))
+    if malformed:
+        report.reasons['malformed row'] = len(malformed)
+        with open(malformed_path, 'w', encoding='utf-8') as f:
+            f.writelines(f"line {n}: {line}\n" for n, line in malformed.items())
+        report.quarantine_paths.append(malformed_path)
+    return validate_frame(df, path, rejected_path, report)
+
+
+def finish_validation(df, report):
+    """Dedupe validated rows and log the report; returns (frame, report)."""
+    df, repeats = dedupe(df)
+    if repeats:
+        report.reasons['duplicate submission'] = repeats
+    log_report(report)
+    return df, report
+
+
+def log_report(report):
+    if report.quarantine_paths:
+        logger.warning("%s; quarantined to %s", report.summary(), ', '.join(report.quarantine_paths))
+    elif report.rejected:
+        logger.info(report.summary())
+
+
+def load_validated(path):
+    """Read, validate, quarantine and dedupe one export; returns (frame, report)."""
+    return finish_validation(*check_export(path))
@@ -0,0 +1,190 @@
+"""Bundle the dashboards' third-party CSS and fonts into ``assets/vendor``.
+
+By default the Dash app loads the SLATE Bootstrap theme, Font Awesome and
+the Inter font from public CDNs, and the Streamlit app imports Inter from
+Google Fonts. Run this once on a machine with network access (for example
+while building the deployment image):
+
+    python vendor_assets.py
+
+It downloads the theme and the Inter font, and cuts Font Awesome down to
+the icons the apps actually use: a stylesheet with only those icon rules
+and, when ``fontTools`` is installed, a font holding only those glyphs.
+Every file name carries a content hash, so the server can cache them for
+a year. With the files in place both apps serve everything locally (see
+``DASHBOARD_ASSETS`` in dashboard_enhanced.py), and no CDN is needed at
+page load.
+"""
+import argparse
+import base64
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+import urllib.request
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+VENDOR_DIR = os.path.join(ROOT, 'assets', 'vendor')
+MANIFEST = 'manifest.json'
+# Bundled files are named stem.<content hash>.ext
+HASHED_NAME = r'\.[0-9a-f]{10}\.[\w.]+$'
+
+FONT_AWESOME_VERSION = '6.0.0'
+FONT_AWESOME_CSS = f'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/{FONT_AWESOME_VERSION}/css/all.min.css'
+FONT_AWESOME_FONT = f'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/{FONT_AWESOME_VERSION}/webfonts/fa-solid-900.woff2'
+INTER_CSS = 'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap'
+
+# Google Fonts only serves woff2 to browsers it recognizes
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+
+ICON_CLASS = re.compile(r'\bfa-([a-z0-9]+(?:-[a-z0-9]+)*)')
+# Font Awesome classes that are styles or modifiers rather than icons
+NOT_ICONS = {'solid', 'regular', 'brands', 'fw', 'spin', 'pulse', 'lg', 'xs', 'sm', 'xl', '2x', '3x'}
+
+FONT_AWESOME_BASE = """\
+.fa,.fas,.fa-solid{-moz-osx-font-smoothing:grayscale;-webkit-font-smoothing:antialiased;\
+display:var(--fa-display,inline-block);font-style:normal;font-variant:normal;line-height:1;\
+text-rendering:auto;font-family:"Font Awesome 6 Free";font-weight:900}
+@font-face{font-family:"Font Awesome 6 Free";font-style:normal;font-weight:900;font-display:block;\
+src:url(%s) format("woff2")}
+"""
+
+
+def fetch(url):
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def write_hashed(name, data):
+    """Write ``data`` as ``stem.<hash>.ext`` in the vendor folder; returns the file name."""
+    stem, ext = name.split('.', 1)
+    filename = f'{stem}.{hashlib.sha1(data).hexdigest()[:10]}.{ext}'
+    with open(os.path.join(VENDOR_DIR, filename), 'wb') as f:
+        f.write(data)
+    return filename
+
+
+def used_icons(paths):
+    icons = set()
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            icons.update(ICON_CLASS.findall(f.read()))
+    return sorted(icons - NOT_ICONS)
+
+
+def icon_codepoints(css):
+    """Map of icon name -> codepoint from the Font Awesome stylesheet, aliases included."""
+    codepoints = {}
+    for selectors, content in re.findall(r'([^{}]+)\{content:\s*"\\([0-9a-f]+)"\}', css):
+        for name in re.findall(r'\.fa-([a-z0-9-]+):{1,2}before', selectors):
+            codepoints[name] = int(content, 16)
+    return codepoints
+
+
+def subset_font(data, codepoints):
+    try:
+        from fontTools import subset
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        print("fontTools is not installed; bundling the full Font Awesome solid font")
+        return data
+    font = TTFont(io.BytesIO(data))
+    subsetter = subset.Subsetter(subset.Options(flavor='woff2', layout_features=[]))
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    out = io.BytesIO()
+    font.flavor = 'woff2'
+    font.save(out)
+    return out.getvalue()
+
+
+def vendor_bootstrap():
+    import dash_bootstrap_components as dbc
+
+    css = fetch(dbc.themes.SLATE).decode('utf-8')
+    # Bootswatch themes may pull web fonts from a CDN themselves
+    css = re.sub(r'@import url\([^)]*\);?', '', css)
+    return write_hashed('bootstrap-slate.min.css', css.encode('utf-8'))
+
+
+def vendor_font_awesome(sources):
+    icons = used_icons(sources)
+    codepoints = icon_codepoints(fetch(FONT_AWESOME_CSS).decode('utf-8'))
+    missing = [name for name in icons if name not in codepoints]
+    if missing:
+        raise SystemExit(f"Unknown Font Awesome {FONT_AWESOME_VERSION} icons: {', '.join(missing)}")
+    font = write_hashed('fa-solid-900.woff2', subset_font(fetch(FONT_AWESOME_FONT), [codepoints[n] for n in icons]))
+    rules = ''.join(f'.fa-{name}::before{{content:"\\{codepoints[name]:x}"}}\n' for name in icons)
+    return write_hashed('fontawesome.min.css', (FONT_AWESOME_BASE % font + rules).encode('utf-8')), icons
+
+
+def vendor_inter():
+    css = fetch(INTER_CSS).decode('utf-8')
+    # Weights share one variable font file per unicode range
+    for url in sorted(set(re.findall(r'url\((https://[^)]+)\)', css))):
+        css = css.replace(url, write_hashed('inter.woff2', fetch(url)))
+    return write_hashed('inter.css', css.encode('utf-8'))
+
+
+def vendored():
+    """The manifest written by the last run, or None when nothing is bundled."""
+    try:
+        with open(os.path.join(VENDOR_DIR, MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def use_local_assets(mode=None):
+    """Whether to serve the bundled files, from ``DASHBOARD_ASSETS`` (auto, local or cdn).
+
+    ``auto`` uses the bundle when there is one.
+    """
+    mode = os.environ.get('DASHBOARD_ASSETS', 'auto') if mode is None else mode
+    if mode == 'local' and vendored() is None:
+        raise RuntimeError("DASHBOARD_ASSETS=local but assets/vendor is empty; run python vendor_assets.py")
+    return mode == 'local' or (mode == 'auto' and vendored() is not None)
+
+
+def inline_font_css(css_name, subsets=('latin',)):
+    """@font-face rules of a bundled font stylesheet with the fonts inlined as data URIs.
+
+    Only the given unicode-range subsets are kept, to keep the page small.
+    """
+    with open(os.path.join(VENDOR_DIR, css_name), encoding='utf-8') as f:
+        css = f.read()
+    rules = []
+    for subset, rule in re.findall(r'/\* ([\w-]+) \*/\s*(@font-face\s*\{[^}]*\})', css):
+        if subset in subsets:
+            for name in set(re.findall(r'url\(([^)]+)\)', rule)):
+                with open(os.path.join(VENDOR_DIR, name), 'rb') as f:
+                    uri = 'data:font/woff2;base64,' + base64.b64encode(f.read()).decode('ascii')
+                rule = rule.replace(f'url({name})', f'url({uri})')
+            rules.append(rule)
+    return '\n'.join(rules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download and subset the dashboards' CSS and fonts into assets/vendor.")
+    parser.add_argument('sources', nargs='*', help="files to scan for icons (default: the repo's .py files)")
+    args = parser.parse_args()
+    sources = args.sources or [p for p in glob.glob(os.path.join(ROOT, '*.py')) if p != os.path.abspath(__file__)]
+
+    os.makedirs(VENDOR_DIR, exist_ok=True)
+    for old in os.listdir(VENDOR_DIR):
+        os.remove(os.path.join(VENDOR_DIR, old))
+
+    fontawesome, icons = vendor_font_awesome(sources)
+    manifest = {'bootstrap': vendor_bootstrap(), 'fontawesome': fontawesome, 'icons': icons,
+                'inter': vendor_inter()}
+    with open(os.path.join(VENDOR_DIR, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    size = sum(os.path.getsize(os.path.join(VENDOR_DIR, n)) for n in os.listdir(VENDOR_DIR))
+    print(f"Bundled {len(os.listdir(VENDOR_DIR))} files ({size / 1024:.0f} KB, {len(icons)} icons) into {VENDOR_DIR}")
+
+
+if __name__ == '__main__':
+    main()